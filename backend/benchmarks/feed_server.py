@@ -0,0 +1,357 @@
+"""Local stand-in for every configured source, with record/replay and faults.
+
+Impersonates the hosts of every rss_sources and scraping_sources entry by
+serving a recording: a manifest.json of source URL, status, headers and
+body file, in the same layout as the fixture corpus (which is the default
+recording). The aggregator reaches it through SOURCE_URL_REWRITE, which
+turns https://host/path into http://127.0.0.1:PORT/host/path, so the whole
+fetch path runs unchanged: pooling, retries, timeouts, breakers and the
+cycle deadline.
+
+Faults are attached per source (or to every source with *) as
+NAME=KIND[:ARG][@PROBABILITY]; several can apply to one source:
+
+    latency:SECONDS     wait before answering
+    status:CODE         answer CODE with an empty body (e.g. 503)
+    429:SECONDS         answer 429 with Retry-After: SECONDS (default 60)
+    timeout:SECONDS     accept the request, never answer, close after SECONDS (default 120)
+    drip:BYTES          send the body at BYTES per second
+    malformed           cut the body short and leave it with an unclosed element
+    reset               drop the connection without answering
+
+Faults are drawn from a seeded generator (--seed), so a run is repeatable.
+
+    python benchmarks/feed_server.py record --out DIR
+        one live fetch of every source, saved as a recording
+    python benchmarks/feed_server.py serve [--recording DIR] [--port 8700] [--fault SPEC ...]
+        then: SOURCE_URL_REWRITE=http://127.0.0.1:8700 python financeNews.py
+    python benchmarks/feed_server.py run [--recording DIR] [--cycles N] [--fault SPEC ...]
+        fetch_all_news against an in-process server; prints a JSON report
+
+GET /_standin/stats on the server returns per-source request and fault counts.
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import struct
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault("BACKGROUND_REFRESH", "0")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import financeNews  # noqa: E402
+from fixture_corpus import FIXTURES_DIR, slugify  # noqa: E402
+
+FAULT_KINDS = ('latency', 'status', '429', 'timeout', 'drip', 'malformed', 'reset')
+FAULT_DEFAULTS = {'429': 60, 'timeout': 120, 'status': 503, 'latency': 1, 'drip': 1024}
+STATS_PATH = '/_standin/stats'
+
+
+class Fault:
+    """One configured misbehaviour for a source (or '*' for every source)"""
+
+    def __init__(self, source, kind, arg=None, probability=1.0):
+        if kind not in FAULT_KINDS:
+            raise ValueError(f"unknown fault {kind!r} (expected one of {', '.join(FAULT_KINDS)})")
+        self.source = source
+        self.kind = kind
+        self.arg = FAULT_DEFAULTS.get(kind) if arg is None else arg
+        self.probability = probability
+
+    @classmethod
+    def parse(cls, spec):
+        """Fault from NAME=KIND[:ARG][@PROBABILITY]"""
+        source, _, rest = spec.rpartition('=')
+        if not source:
+            raise ValueError(f"fault {spec!r} needs a source name (or *) before '='")
+        rest, _, probability = rest.partition('@')
+        kind, _, arg = rest.partition(':')
+        return cls(source, kind, float(arg) if arg else None, float(probability) if probability else 1.0)
+
+    def applies_to(self, source_name):
+        return self.source in ('*', source_name)
+
+    def __repr__(self):
+        return f"{self.source}={self.kind}:{self.arg}@{self.probability}"
+
+
+def load_recording(directory):
+    """Recording entries keyed by the path the stand-in is asked for"""
+    with open(os.path.join(directory, 'manifest.json'), encoding='utf-8') as f:
+        manifest = json.load(f)
+    routes = {}
+    for entry in manifest['sources']:
+        with open(os.path.join(directory, entry['file']), 'rb') as f:
+            entry['body'] = f.read()
+        # Rewritten against an empty base, the URL is '//host/path?query'
+        routes[financeNews.rewrite_source_url(entry['url'], base='/')[2:]] = entry
+    return routes
+
+
+def malformed(body):
+    """The body cut off mid-document, ending inside an element that never closes"""
+    return body[:len(body) * 3 // 5] + b'<item><title>Truncated & unescaped <b>markup'
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server.feed_server
+        if self.path == STATS_PATH:
+            self._send(200, {'Content-Type': 'application/json'}, json.dumps(server.stats()).encode('utf-8'))
+            return
+        entry = server.routes.get(self.path.lstrip('/'))
+        if entry is None:
+            self._send(404, {'Content-Type': 'text/plain'}, b'not in the recording\n')
+            return
+
+        faults = server.draw_faults(entry['name'])
+        server.count(entry['name'], 'requests')
+        body = entry['body']
+        drip = None
+        for fault in faults:
+            server.count(entry['name'], fault.kind)
+            if fault.kind == 'latency':
+                time.sleep(fault.arg)
+            elif fault.kind == 'reset':
+                # RST instead of FIN, as a dropped connection looks to the client
+                self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+                self.close_connection = True
+                return
+            elif fault.kind == 'timeout':
+                time.sleep(fault.arg)
+                self.close_connection = True
+                return
+            elif fault.kind == '429':
+                self._send(429, {'Retry-After': str(int(fault.arg)), 'Content-Type': 'text/plain'}, b'')
+                return
+            elif fault.kind == 'status':
+                self._send(int(fault.arg), {'Content-Type': 'text/plain'}, b'')
+                return
+            elif fault.kind == 'malformed':
+                body = malformed(body)
+            elif fault.kind == 'drip':
+                drip = fault.arg
+
+        headers = {'Content-Type': entry['content_type']}
+        headers.update(entry.get('headers', {}))
+        status = entry.get('status', 200)
+        # Replay the recording's validators the way the origin would
+        etag = headers.get('ETag')
+        modified = headers.get('Last-Modified')
+        if status == 200 and ((etag and self.headers.get('If-None-Match') == etag)
+                              or (modified and self.headers.get('If-Modified-Since') == modified)):
+            server.count(entry['name'], 'not_modified')
+            self._send(304, {k: v for k, v in headers.items() if k in ('ETag', 'Last-Modified')}, b'')
+            return
+        self._send(status, headers, body, drip)
+
+    def _send(self, status, headers, body, drip=None):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if drip is None:
+            self.wfile.write(body)
+            return
+        # Ten writes a second: every read makes progress, so only the
+        # client's fetch deadline (not the per-read timeout) stops it
+        chunk = max(1, int(drip / 10))
+        try:
+            for start in range(0, len(body), chunk):
+                self.wfile.write(body[start:start + chunk])
+                self.wfile.flush()
+                time.sleep(0.1)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up at its deadline
+            self.close_connection = True
+
+
+class FeedServer:
+    """The stand-in server: replays a recording, injecting the configured faults"""
+
+    def __init__(self, recording=FIXTURES_DIR, faults=(), host='127.0.0.1', port=0, seed=0):
+        self.routes = load_recording(recording)
+        self.faults = list(faults)
+        known = {entry['name'] for entry in self.routes.values()}
+        for fault in self.faults:
+            if fault.source != '*' and fault.source not in known:
+                raise ValueError(f"fault for {fault.source!r}, which is not in the recording")
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._httpd = ThreadingHTTPServer((host, port), _StandInHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.feed_server = self
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def draw_faults(self, source_name):
+        with self._lock:
+            return [fault for fault in self.faults
+                    if fault.applies_to(source_name) and self._rng.random() < fault.probability]
+
+    def count(self, source_name, outcome):
+        with self._lock:
+            counts = self._counts.setdefault(source_name, {})
+            counts[outcome] = counts.get(outcome, 0) + 1
+
+    def stats(self):
+        """Per-source counts of requests, faults injected and 304s"""
+        with self._lock:
+            return {name: dict(counts) for name, counts in self._counts.items()}
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="feed-server", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def record(out_dir):
+    """Fetch every configured source once, live, and save the responses as a recording"""
+    aggregator = financeNews.FinancialNewsAggregator()
+    transport = financeNews.HttpTransport(aggregator.headers, rewrite_to='')
+    targets = [(name, 'rss', url) for name, url in aggregator.rss_sources.items()]
+    targets += [(source['name'], 'scrape', source['url']) for source in aggregator.scraping_sources]
+    manifest = {'recorded_at': datetime.now(timezone.utc).isoformat(timespec='seconds'), 'sources': []}
+    os.makedirs(out_dir, exist_ok=True)
+    for name, kind, url in targets:
+        aggregator._wait_for_host(url)
+        try:
+            response = transport.get(url)
+        except Exception as e:
+            print(f"  ✗ {name}: {e} (not recorded)")
+            continue
+        path = f"{'rss' if kind == 'rss' else 'html'}/{slugify(name)}.{'xml' if kind == 'rss' else 'html'}"
+        os.makedirs(os.path.join(out_dir, os.path.dirname(path)), exist_ok=True)
+        with open(os.path.join(out_dir, path), 'wb') as f:
+            f.write(response.content)
+        manifest['sources'].append({
+            'name': name,
+            'kind': kind,
+            'url': url,
+            'file': path,
+            'status': response.status_code,
+            'content_type': response.headers.get('Content-Type', 'application/octet-stream'),
+            'headers': {header: response.headers[header] for header in ('ETag', 'Last-Modified', 'Retry-After')
+                        if header in response.headers},
+        })
+        print(f"  ✓ {name}: {response.status_code}, {len(response.content) / 1024:.0f} KB")
+    with open(os.path.join(out_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    print(f"Recorded {len(manifest['sources'])} of {len(targets)} sources to {out_dir}")
+
+
+def run_cycles(server, cycles, workers, per_host_delay, deadline, timeout,
+               fetch_deadline=financeNews.HTTP_FETCH_DEADLINE_SECONDS):
+    """fetch_all_news against server cycles times; per-cycle timings, outcomes and server counts"""
+    aggregator = financeNews.FinancialNewsAggregator(max_workers=workers, per_host_delay=per_host_delay,
+                                                     cycle_deadline=deadline)
+    aggregator.transport = financeNews.HttpTransport(aggregator.headers, pool_maxsize=aggregator.max_workers,
+                                                     timeout=timeout, rewrite_to=server.base_url,
+                                                     fetch_deadline=fetch_deadline)
+    report = []
+    for _ in range(cycles):
+        before = server.stats()
+        start = time.perf_counter()
+        headlines = aggregator.fetch_all_news()
+        elapsed = time.perf_counter() - start
+        after = server.stats()
+        report.append({
+            'seconds': elapsed,
+            'headlines': len(headlines),
+            'sources_with_headlines': sum(1 for result in aggregator.last_fetched.values() if result),
+            'missed_deadline': aggregator.missed_deadline,
+            'breakers': {name: health['state'] for name, health in aggregator.source_health().items()
+                         if health['state'] != financeNews.SourceBreaker.CLOSED},
+            'requests': {name: delta for name, delta in (
+                (name, {outcome: count - before.get(name, {}).get(outcome, 0) for outcome, count in counts.items()
+                        if count > before.get(name, {}).get(outcome, 0)})
+                for name, counts in after.items()) if delta},
+        })
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = commands.add_parser('record', help='save one live fetch of every source')
+    record_parser.add_argument('--out', required=True, help='recording directory to write')
+
+    for name, help_text in (('serve', 'serve a recording until interrupted'),
+                            ('run', 'run fetch cycles against an in-process server')):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('--recording', default=FIXTURES_DIR, help='recording directory (default: the fixture corpus)')
+        command.add_argument('--fault', action='append', default=[], type=Fault.parse, metavar='SPEC',
+                             help='NAME=KIND[:ARG][@PROBABILITY]; repeatable')
+        command.add_argument('--seed', type=int, default=0, help='seed for probabilistic faults')
+    commands.choices['serve'].add_argument('--host', default='127.0.0.1')
+    commands.choices['serve'].add_argument('--port', type=int, default=8700)
+    run_parser = commands.choices['run']
+    run_parser.add_argument('--cycles', type=int, default=1)
+    run_parser.add_argument('--workers', type=int, default=financeNews.FETCH_MAX_WORKERS)
+    run_parser.add_argument('--per-host-delay', type=float, default=0.0,
+                            help='politeness gap per source host (default 0: the stand-in is local)')
+    run_parser.add_argument('--deadline', type=float, default=financeNews.CYCLE_DEADLINE_SECONDS)
+    run_parser.add_argument('--timeout', type=float, default=financeNews.HTTP_TIMEOUT_SECONDS,
+                            help='per-request HTTP timeout')
+    run_parser.add_argument('--fetch-deadline', type=float, default=financeNews.HTTP_FETCH_DEADLINE_SECONDS,
+                            help='wall-clock limit on one fetch, body included')
+    run_parser.add_argument('--verbose', action='store_true', help="show the aggregator's own log on stderr")
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        record(args.out)
+        return
+
+    if args.command == 'serve':
+        server = FeedServer(args.recording, args.fault, host=args.host, port=args.port, seed=args.seed)
+        print(f"Serving {len(server.routes)} sources at {server.base_url} "
+              f"({len(server.faults)} faults); SOURCE_URL_REWRITE={server.base_url}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    # The aggregator logs to stdout, including from fetches that outlive a
+    # cycle's deadline, so for the rest of the run stdout is the report alone
+    report_out = sys.stdout
+    sys.stdout = sys.stderr if args.verbose else open(os.devnull, 'w')
+    server = FeedServer(args.recording, args.fault, seed=args.seed)
+    server.start()
+    try:
+        cycles = run_cycles(server, args.cycles, args.workers, args.per_host_delay, args.deadline, args.timeout,
+                            args.fetch_deadline)
+    finally:
+        server.stop()
+    print(json.dumps({'faults': [repr(fault) for fault in server.faults], 'cycles': cycles}, indent=2),
+          file=report_out)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,369 @@
+"""Build the offline fixture corpus used by pipeline_benchmark.py.
+
+Writes one representative document per configured source under
+benchmarks/fixtures/: an RSS 2.0 or Atom feed for every feed source and a
+homepage for every scraped source, plus manifest.json mapping each source
+name to its URL, file and Content-Type. Everything is generated
+deterministically (seeded by source name) from one shared pool of stories,
+so coverage overlaps the way it does live: the same story verbatim or
+reworded across outlets, and an outlet's homepage links to the articles in
+its own feed without the feed's tracking parameters.
+
+synthetic_headlines() draws from the same story pool; every benchmark that
+needs N headlines uses it, so their 1k/10k figures describe the same data.
+
+Rerun after adding or reconfiguring a source, from the backend directory:
+
+    python benchmarks/fixture_corpus.py
+"""
+import json
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from html import escape
+from urllib.parse import urlparse
+
+os.environ.setdefault("BACKGROUND_REFRESH", "0")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import financeNews  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+MANIFEST_PATH = os.path.join(FIXTURES_DIR, 'manifest.json')
+
+# Publication times count back from here, so the corpus never changes with the clock
+CORPUS_TIME = datetime(2026, 10, 5, 14, 0, tzinfo=timezone.utc)
+
+COMPANIES = (
+    'Apple', 'Microsoft', 'Nvidia', 'Tesla', 'Amazon', 'Alphabet', 'Meta', 'JPMorgan Chase',
+    'Goldman Sachs', 'Berkshire Hathaway', 'ExxonMobil', 'Chevron', 'Boeing', 'Intel', 'Netflix',
+    'Reliance Industries', 'Infosys', 'TCS', 'HDFC Bank', 'ICICI Bank', 'Tata Motors', 'Adani Ports',
+    'Bajaj Finance', 'Wipro', 'Société Générale', 'Nestlé', 'Toyota', 'Samsung', 'Coinbase', 'Shell',
+)
+INDICES = ('S&P 500', 'Nasdaq', 'Dow Jones', 'Sensex', 'Nifty 50', 'FTSE 100', 'Nikkei', 'DAX', 'Hang Seng')
+COUNTRIES = ('US', 'India', 'UK', 'Eurozone', 'Japan', 'China', 'Germany', 'Brazil')
+MONTHS = ('January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September')
+RISES = ('jump', 'rise', 'climb', 'rally', 'surge', 'gain')
+FALLS = ('fall', 'drop', 'slide', 'tumble', 'sink', 'slip')
+EVENTS = (
+    'quarterly earnings beat estimates', 'revenue forecast disappoints', 'analyst upgrade',
+    'CEO steps down', 'regulator opens probe', 'buyback plan announced', 'guidance raised',
+    'supply chain warning', 'record deliveries', 'margin squeeze', 'antitrust ruling',
+    'dividend increase', 'layoffs announced', 'new product launch', 'credit rating cut',
+)
+DRIVERS = (
+    'Treasury yields climb', 'investors await Fed minutes', 'tech stocks rebound', 'oil prices spike',
+    'inflation data cools', 'bank shares lead losses', 'foreign investors pull out',
+    'jobs report beats forecasts', 'dollar strengthens', 'earnings season kicks off',
+    'trade tensions escalate', 'bond market steadies', 'rate cut bets grow', 'China stimulus hopes fade',
+)
+COMMODITY_DRIVERS = (
+    'OPEC+ weighs output cut', 'inventories build unexpectedly', 'central banks keep buying',
+    'the dollar weakens', 'Middle East tensions flare', 'demand outlook dims', 'hurricane threatens Gulf output',
+)
+CRYPTO_DRIVERS = (
+    'ETF inflows accelerate', 'SEC delays decision', 'exchange outflows rise', 'miners sell reserves',
+    'stablecoin bill advances', 'options expiry looms', 'whales accumulate',
+)
+OFFICIALS = ('Powell', 'Waller', 'Williams', 'Bowman', 'Jefferson', 'Logan')
+POLICY_VIEWS = (
+    'more rate cuts are likely this year', 'inflation fight is not over', 'labor market is cooling gradually',
+    'policy is in a good place', 'tariffs cloud the outlook', 'no rush to ease further',
+)
+# Outlets rewrite each other's headlines; one swap keeps the story a near-duplicate
+REWORDINGS = {
+    'shares': 'stock', 'jump': 'soar', 'rise': 'advance', 'fall': 'decline', 'drop': 'retreat',
+    'after': 'following', 'as': 'while', 'amid': 'on', 'says': 'signals', 'to': 'set to',
+}
+
+
+def story_title(rng):
+    """One headline in the style of the wire services"""
+    move = rng.choice(RISES + FALLS)
+    pct = f'{rng.uniform(0.3, 14.0):.1f}%'
+    shape = rng.randrange(9)
+    if shape == 0:
+        return f'{rng.choice(COMPANIES)} shares {move} {pct} after {rng.choice(EVENTS)}'
+    if shape == 1:
+        return f'{rng.choice(INDICES)} {move}s {pct} as {rng.choice(DRIVERS)}'
+    if shape == 2:
+        return f"Fed's {rng.choice(OFFICIALS)} says {rng.choice(POLICY_VIEWS)}"
+    if shape == 3:
+        return f'Oil prices {move} to ${rng.uniform(55, 110):.2f} a barrel as {rng.choice(COMMODITY_DRIVERS)}'
+    if shape == 4:
+        return f'Gold {move}s to ${rng.randrange(1800, 4200):,} an ounce as {rng.choice(COMMODITY_DRIVERS)}'
+    if shape == 5:
+        return f'Bitcoin {move}s past ${rng.randrange(40, 160)},000 as {rng.choice(CRYPTO_DRIVERS)}'
+    if shape == 6:
+        return f'Rupee {move}s to {rng.uniform(80, 90):.2f} per dollar amid {rng.choice(DRIVERS).lower()}'
+    if shape == 7:
+        buyer, target = rng.sample(COMPANIES, 2)
+        return f'{buyer} to acquire {target} unit in ${rng.randrange(2, 80)} billion deal'
+    return (f'{rng.choice(COUNTRIES)} inflation {move}s to {rng.uniform(1.5, 9.0):.1f}% in '
+            f'{rng.choice(MONTHS)}, {rng.choice(("above", "below", "in line with"))} forecasts')
+
+
+def reword(title, rng):
+    """The same story as another outlet would headline it"""
+    words = title.split(' ')
+    candidates = [i for i, word in enumerate(words) if word in REWORDINGS]
+    if not candidates:
+        return 'Update: ' + title
+    i = rng.choice(candidates)
+    words[i] = REWORDINGS[words[i]]
+    return ' '.join(words)
+
+
+def slugify(text):
+    slug = ''.join(c if c.isalnum() else '-' for c in text.lower())
+    return '-'.join(part for part in slug.split('-') if part)
+
+
+def story_summary(title, rng):
+    sentences = (
+        f'{title}, according to people familiar with the matter.',
+        'Analysts said the move had been widely expected by the market.',
+        'Trading volumes were above their 30-day average through the session.',
+        'The company did not immediately respond to a request for comment.',
+        'Investors are watching for further guidance later this week.',
+        'Futures pointed to a muted open in the next session.',
+    )
+    return ' '.join(rng.sample(sentences, rng.randrange(2, 5)))
+
+
+STORY_POOL_SIZE = 600
+
+
+def story_pool(size=STORY_POOL_SIZE, seed=0):
+    """Stories shared across outlets: a canonical title and summary each"""
+    rng = random.Random(seed)
+    stories = []
+    seen = set()
+    while len(stories) < size:
+        title = story_title(rng)
+        if title in seen:
+            continue
+        seen.add(title)
+        stories.append({'title': title, 'summary': story_summary(title, rng)})
+    return stories
+
+
+def outlet_items(source_name, stories, count):
+    """count items for one outlet: wire copy, rewrites of it, and its own stories"""
+    rng = random.Random(source_name)
+    items = []
+    for story in rng.sample(stories, count):
+        roll = rng.random()
+        if roll < 0.45:
+            title = story['title']
+        elif roll < 0.7:
+            title = reword(story['title'], rng)
+        else:
+            title = story_title(rng)
+        items.append({'title': title, 'summary': story['summary']})
+    return items
+
+
+def article_path(base_url, title, index):
+    """An article URL on the outlet's own domain"""
+    parsed = urlparse(base_url)
+    host = parsed.netloc or 'www.example.com'
+    return f'https://{host}/markets/{slugify(title)[:80]}-{index:06d}'
+
+
+def rss_document(source_name, url, items):
+    """An RSS 2.0 feed with the extensions real publishers add"""
+    rng = random.Random('rss:' + source_name)
+    with_content = rng.random() < 0.3
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom" '
+        'xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:media="http://search.yahoo.com/mrss/" '
+        'xmlns:content="http://purl.org/rss/1.0/modules/content/">\n<channel>\n',
+        f'<title>{escape(source_name)} - Markets</title>\n<link>{escape(url)}</link>\n',
+        f'<description>Latest markets news from {escape(source_name)}</description>\n'
+        '<language>en-us</language>\n',
+        f'<lastBuildDate>{format_datetime(CORPUS_TIME)}</lastBuildDate>\n'
+        f'<atom:link href="{escape(url)}" rel="self" type="application/rss+xml"/>\n',
+    ]
+    published = CORPUS_TIME
+    for i, item in enumerate(items):
+        published -= timedelta(minutes=rng.randrange(3, 45))
+        link = article_path(url, item['title'], i)
+        tracked = f'{link}?utm_source=rss&amp;utm_medium=feed&amp;utm_campaign=markets'
+        title = (f'<![CDATA[{item["title"]}]]>' if rng.random() < 0.5 else escape(item['title']))
+        parts.append(
+            f'<item>\n<title>{title}</title>\n<link>{tracked}</link>\n'
+            f'<guid isPermaLink="false">{slugify(source_name)}-{i:06d}</guid>\n'
+            f'<pubDate>{format_datetime(published)}</pubDate>\n'
+            f'<dc:creator>{escape(rng.choice(("Staff", "Reuters", "Bloomberg News", "PTI", "AP")))}</dc:creator>\n'
+            f'<category>Markets</category><category>{escape(rng.choice(COMPANIES))}</category>\n'
+            f'<description><![CDATA[<p>{escape(item["summary"])}</p>'
+            f'<img src="{link}/thumb.jpg" width="300" height="200"/>]]></description>\n'
+            f'<media:content url="{link}/lead.jpg" medium="image" width="1200" height="800"/>\n'
+        )
+        if with_content:
+            body = ''.join(f'<p>{escape(item["summary"])} {escape(story_summary(item["title"], rng))}</p>'
+                           for _ in range(rng.randrange(2, 5)))
+            parts.append(f'<content:encoded><![CDATA[{body}]]></content:encoded>\n')
+        parts.append('</item>\n')
+    parts.append('</channel>\n</rss>\n')
+    return ''.join(parts)
+
+
+def atom_document(source_name, url, items):
+    """An Atom 1.0 feed with HTML summaries"""
+    rng = random.Random('atom:' + source_name)
+    parts = [
+        '<?xml version="1.0" encoding="utf-8"?>\n<feed xmlns="http://www.w3.org/2005/Atom">\n',
+        f'<title>{escape(source_name)}</title>\n<link href="{escape(url)}" rel="self"/>\n',
+        f'<id>{escape(url)}</id>\n<updated>{CORPUS_TIME.isoformat()}</updated>\n',
+    ]
+    published = CORPUS_TIME
+    for i, item in enumerate(items):
+        published -= timedelta(minutes=rng.randrange(3, 45))
+        link = article_path(url, item['title'], i)
+        parts.append(
+            f'<entry>\n<title type="html">{escape(item["title"])}</title>\n'
+            f'<link rel="alternate" type="text/html" href="{link}?ref=atom"/>\n'
+            f'<id>tag:{urlparse(url).netloc},2026:{i:06d}</id>\n'
+            f'<published>{published.isoformat()}</published>\n<updated>{published.isoformat()}</updated>\n'
+            f'<author><name>{escape(rng.choice(("Staff", "Markets Desk", "Research Team")))}</name></author>\n'
+            f'<summary type="html">{escape("<p>" + escape(item["summary"]) + "</p>")}</summary>\n'
+            '</entry>\n'
+        )
+    parts.append('</feed>\n')
+    return ''.join(parts)
+
+
+def homepage_document(source, items):
+    """A homepage as the source's extractor sees it: scripts, chrome, then headlines"""
+    rng = random.Random('html:' + source['name'])
+    prefix = (source.get('url_prefix') or 'https://www.' + source.get('domain', 'example.com')).rstrip('/')
+    path = source.get('path_contains', '/markets/')
+    articles = []
+    for i, item in enumerate(items):
+        # Homepages link to the same articles as the feed, minus the tracking
+        href = f'{path.rstrip("/")}/{slugify(item["title"])[:80]}-{i:06d}'
+        if source.get('select') != 'headings' or rng.random() < 0.5:
+            href = prefix + href
+        articles.append((href, item))
+
+    state = {'props': {'pageProps': {'articles': [
+        {'id': i, 'headline': item['title'], 'summary': item['summary'], 'url': href,
+         'tags': rng.sample(COMPANIES, 3)} for i, (href, item) in enumerate(articles)
+    ]}}}
+    parts = [
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">',
+        f'<title>Markets - {escape(source["name"])}</title>',
+        '<meta name="viewport" content="width=device-width, initial-scale=1">',
+        '<script>window.dataLayer=window.dataLayer||[];' + 'dataLayer.push({"event":"pageview"});' * 100 + '</script>',
+        '<style>' + ''.join(f'.c{i}{{margin:{i % 8}px;padding:{i % 5}px;color:#{i * 2654435761 % 0xffffff:06x}}}'
+                            for i in range(250)) + '</style>',
+        '<script id="__NEXT_DATA__" type="application/json">'
+        + json.dumps(state, ensure_ascii=False).replace('</', '<\\/') + '</script>',
+        '</head><body><header><nav class="primary">',
+    ]
+    for i in range(160):
+        parts.append(f'<a href="/section/{i}" class="nav-link">Section {i}</a>')
+    parts.append('</nav><div class="ticker">')
+    for index in INDICES:
+        parts.append(f'<span class="quote"><a href="/quote/{slugify(index)}">{escape(index)}</a> '
+                     f'<b>{rng.uniform(-2, 2):+.2f}%</b></span>')
+    parts.append('</div></header><main>')
+    for i, (href, item) in enumerate(articles):
+        title = escape(item['title'])
+        if source.get('select') == 'headings':
+            tag = source.get('tags', ['h2', 'h3'])[i % len(source.get('tags', ['h2', 'h3']))]
+            parts.append(f'<article class="story"><{tag} class="story-title"><a href="{href}">{title}</a></{tag}>'
+                         f'<p class="summary">{escape(item["summary"])}</p>'
+                         f'<time datetime="{CORPUS_TIME.isoformat()}">2h ago</time></article>')
+        else:
+            parts.append(f'<div class="card"><a href="{href}" class="card-link"><span class="headline">{title}</span>'
+                         f'</a><p class="summary">{escape(item["summary"])}</p>'
+                         f'<a href="/author/{i % 12}" class="byline">Staff</a></div>')
+        if i % 6 == 5:
+            parts.append('<aside class="promo"><a href="https://ads.example.net/click?id=1">'
+                         'Open a trading account in five minutes with zero brokerage fees</a></aside>')
+    parts.append('</main><footer>')
+    for label in ('About us', 'Contact', 'Careers', 'Privacy policy', 'Terms of use', 'Sitemap') * 20:
+        parts.append(f'<a href="/{slugify(label)}">{label}</a>')
+    parts.append('</footer></body></html>')
+    return ''.join(parts)
+
+
+def synthetic_headlines(count, seed=0):
+    """count headlines spread over every configured source, with the corpus's overlap"""
+    aggregator = financeNews.FinancialNewsAggregator()
+    sources = aggregator.source_names()
+    rng = random.Random(seed)
+    stories = story_pool(max(STORY_POOL_SIZE, count // 2), seed)
+    headlines = []
+    for i in range(count):
+        story = stories[rng.randrange(len(stories))]
+        roll = rng.random()
+        if roll < 0.2:
+            title = story['title']
+        elif roll < 0.3:
+            title = reword(story['title'], rng)
+        else:
+            title = story_title(rng)
+        published = CORPUS_TIME - timedelta(seconds=i * 7)
+        headlines.append({
+            'title': title,
+            'link': f'https://www.example.com/markets/{slugify(title)[:80]}-{i:06d}',
+            'source': sources[i % len(sources)],
+            'published': format_datetime(published),
+            'published_at': published.timestamp(),
+            'description': story['summary'][:200],
+        })
+    return headlines
+
+
+def build_corpus():
+    """Every configured source's fixture, as (manifest entry, document text)"""
+    aggregator = financeNews.FinancialNewsAggregator()
+    stories = story_pool()
+    corpus = []
+    for name, url in aggregator.rss_sources.items():
+        rng = random.Random('feed:' + name)
+        items = outlet_items(name, stories, rng.randrange(15, 41))
+        if rng.random() < 0.2:
+            document, content_type = atom_document(name, url, items), 'application/atom+xml; charset=utf-8'
+        else:
+            document, content_type = rss_document(name, url, items), 'application/rss+xml; charset=utf-8'
+        corpus.append(({'name': name, 'kind': 'rss', 'url': url, 'file': f'rss/{slugify(name)}.xml',
+                        'content_type': content_type}, document))
+    for source in aggregator.scraping_sources:
+        rng = random.Random('page:' + source['name'])
+        items = outlet_items(source['name'], stories, rng.randrange(30, 61))
+        # Some servers leave the charset to the page's <meta>
+        content_type = 'text/html; charset=utf-8' if rng.random() < 0.7 else 'text/html'
+        corpus.append(({'name': source['name'], 'kind': 'scrape', 'url': source['url'],
+                        'file': f'html/{slugify(source["name"])}.html', 'content_type': content_type},
+                       homepage_document(source, items)))
+    return corpus
+
+
+def main():
+    corpus = build_corpus()
+    manifest = {'corpus_time': CORPUS_TIME.isoformat(), 'sources': []}
+    total = 0
+    for entry, document in corpus:
+        path = os.path.join(FIXTURES_DIR, entry['file'])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = document.encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(data)
+        total += len(data)
+        manifest['sources'].append(entry)
+    with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    print(f"Wrote {len(corpus)} fixtures ({total / 1024:.0f} KB) to {FIXTURES_DIR}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Compare scraped-page parsing backends against the original full-tree parse.
+
+Builds a synthetic homepage for every configured scraping source (navigation
+chrome, inline scripts, then headline blocks) and times each backend on it:
+
+    bs4          BeautifulSoup(content, 'html.parser') + full find_all walk
+    html.parser  streaming stdlib parser with early exit
+    lxml         streaming lxml parser with early exit (if installed)
+
+Run from the backend directory:
+
+    python benchmarks/parser_compare.py [--repeat N]
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("BACKGROUND_REFRESH", "0")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import financeNews  # noqa: E402
+
+
+def synthetic_homepage(source, nav_links=400, articles=120):
+    """Return a homepage-like byte string whose headlines satisfy the source's spec"""
+    prefix = source.get('url_prefix') or 'https://www.' + source.get('domain', 'example.com')
+    path = source.get('path_contains', '/markets/')
+    parts = [
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>Markets</title>',
+        '<script>' + 'var tracking = {"k": "v"};' * 2000 + '</script>',
+        '<style>' + '.card{margin:0;padding:0}' * 1000 + '</style></head><body><nav>',
+    ]
+    for i in range(nav_links):
+        parts.append(f'<a href="/section/{i}">Menu {i}</a>')
+    parts.append('</nav><main>')
+    for i in range(articles):
+        title = f'Markets move as investors weigh outlook for story number {i}'
+        if source.get('select') == 'headings':
+            parts.append(f'<article><h3><a href="{path}story-{i}">{title}</a></h3>'
+                         f'<p>{"Summary text. " * 20}</p></article>')
+        else:
+            parts.append(f'<div class="card"><a href="{prefix}{path}story-{i}"><span>{title}</span></a>'
+                         f'<p>{"Summary text. " * 20}</p></div>')
+    parts.append('</main><footer>' + '<a href="/about">About</a>' * 200 + '</footer></body></html>')
+    return ''.join(parts).encode('utf-8')
+
+
+def time_backend(extractor, content, backend, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        headlines = extractor.extract_markup(content, 'utf-8', backend=backend)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, headlines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='runs per backend (best time is reported)')
+    args = parser.parse_args()
+
+    backends = ['bs4', 'html.parser']
+    if financeNews.lxml_etree is not None:
+        backends.append('lxml')
+
+    aggregator = financeNews.FinancialNewsAggregator()
+    print(f"{'source':<26}{'KB':>6}" + ''.join(f'{b:>14}' for b in backends) + '  same output')
+    totals = dict.fromkeys(backends, 0.0)
+    for source in aggregator.scraping_sources:
+        extractor = financeNews.HeadlineExtractor(source)
+        content = synthetic_homepage(source)
+        row = f"{source['name']:<26}{len(content) // 1024:>6}"
+        reference = None
+        same = True
+        for backend in backends:
+            elapsed, headlines = time_backend(extractor, content, backend, args.repeat)
+            totals[backend] += elapsed
+            row += f'{elapsed * 1000:>12.2f}ms'
+            if reference is None:
+                reference = headlines
+            elif headlines != reference:
+                same = False
+        print(row + ('  yes' if same else '  NO'))
+
+    print(f"{'total':<32}" + ''.join(f'{totals[b] * 1000:>12.2f}ms' for b in backends))
+    for backend in backends[1:]:
+        print(f"{backend}: {totals['bs4'] / totals[backend]:.1f}x faster than the full-tree parse")
+
+
+if __name__ == '__main__':
+    main()
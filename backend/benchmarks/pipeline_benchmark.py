@@ -0,0 +1,301 @@
+"""Offline benchmark of the scrape pipeline: parse, dedup, render, compress.
+
+Runs the real code paths (fetch_rss_feed, scrape_source, combine_results,
+generate_html, compress_page) against the checked-in corpus in
+benchmarks/fixtures/ (see fixture_corpus.py), answered by an in-process
+transport so nothing touches the network. The count-dependent stages are
+then repeated on synthetic scale-ups; parsing at scale cycles the corpus
+feeds until that many headlines have been parsed.
+
+Each stage reports its best time over --repeat runs (--scale-repeat for the
+scale-ups), items per second and peak traced memory (from one extra run
+under tracemalloc). --sizes 1000,10000,100000 adds a 100k run, which takes
+around half an hour on one core, most of it brotli at publish quality on an
+~80 MB page. The corpus run also reports per-source
+timings. The JSON report goes to stdout (or --out) and a table to stderr;
+pass an earlier report as --compare to see the change per stage between
+two commits.
+
+    python benchmarks/pipeline_benchmark.py [--sizes 1000,10000] [--repeat N]
+        [--scale-repeat N] [--no-memory] [--out FILE] [--compare BASELINE.json]
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+os.environ.setdefault("BACKGROUND_REFRESH", "0")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests  # noqa: E402
+from requests.structures import CaseInsensitiveDict  # noqa: E402
+
+import financeNews  # noqa: E402
+from fixture_corpus import CORPUS_TIME, FIXTURES_DIR, MANIFEST_PATH, synthetic_headlines  # noqa: E402
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+SCALE_SIZES = (1000, 10000)
+# Changes smaller than this are within run-to-run noise
+COMPARE_THRESHOLD = 0.1
+
+
+class FixtureTransport:
+    """Stands in for HttpTransport, answering each source URL from the corpus"""
+
+    def __init__(self, fixtures):
+        self.fixtures = fixtures
+        self.requests = 0
+
+    def get(self, url, **kwargs):
+        body, content_type = self.fixtures[url]
+        self.requests += 1
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers = CaseInsensitiveDict({'Content-Type': content_type})
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response._content = body
+        return response
+
+    def stats(self):
+        return {'requests': self.requests, 'new_connections': 0, 'reused_connections': 0}
+
+
+def load_corpus():
+    """The manifest's sources, each with its fixture bytes"""
+    with open(MANIFEST_PATH, encoding='utf-8') as f:
+        manifest = json.load(f)
+    for entry in manifest['sources']:
+        with open(os.path.join(FIXTURES_DIR, entry['file']), 'rb') as f:
+            entry['body'] = f.read()
+    return manifest['sources']
+
+
+def offline_aggregator(corpus):
+    aggregator = financeNews.FinancialNewsAggregator(per_host_delay=0)
+    aggregator.transport = FixtureTransport({entry['url']: (entry['body'], entry['content_type'])
+                                             for entry in corpus})
+    return aggregator
+
+
+def measure(run, repeat, memory):
+    """Time run() (best of repeat), then trace one more run for peak memory
+
+    run returns (items, fields, output): how many items the stage processed,
+    stage-specific report fields, and its output for the next stage.
+    """
+    best = None
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            items, fields, output = run()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        peak = None
+        if memory:
+            gc.collect()
+            tracemalloc.start()
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    stage = {'seconds': best, 'items': items, 'items_per_second': items / best if best else None}
+    stage.update(fields)
+    if 'bytes' in stage:
+        stage['bytes_per_second'] = stage['bytes'] / best if best else None
+    stage['peak_bytes'] = peak
+    return stage, output
+
+
+def parse_run(aggregator, entries, target=None):
+    """fetch_rss_feed/scrape_source over entries, cycled until target headlines if given"""
+    scraped = {source['name']: source for source in aggregator.scraping_sources}
+
+    def run():
+        results = {}
+        parsed = 0
+        consumed = 0
+        while True:
+            for entry in entries:
+                if entry['kind'] == 'rss':
+                    headlines = aggregator.fetch_rss_feed(entry['url'], entry['name'])
+                else:
+                    headlines = aggregator.scrape_source(scraped[entry['name']])
+                results[entry['name']] = headlines
+                parsed += len(headlines)
+                consumed += len(entry['body'])
+                if target is not None and parsed >= target:
+                    break
+            if target is None or parsed >= target:
+                return parsed, {'bytes': consumed}, results
+
+    return run
+
+
+def dedup_run(aggregator, results):
+    def run():
+        aggregator.source_results = results
+        # A whole cycle's dedup, not a re-dedup of titles already hashed
+        aggregator.reset_dedup_caches()
+        unique = aggregator.combine_results(verbose=False)
+        return sum(len(headlines) for headlines in results.values()), {'output_items': len(unique)}, unique
+    return run
+
+
+def render_run(headlines, generated_at):
+    def run():
+        page = financeNews.generate_html(headlines, generated_at).encode('utf-8')
+        return len(headlines), {'page_bytes': len(page)}, page
+    return run
+
+
+def compress_run(page_bytes):
+    """Every published encoding at publish-time settings; items are input bytes"""
+    def run():
+        sizes = {encoding: len(financeNews.compress_page(page_bytes, encoding))
+                 for encoding, _ in financeNews.PAGE_ENCODINGS}
+        return len(page_bytes) * len(sizes), {'compressed_bytes': sizes}, None
+    return run
+
+
+def run_corpus(corpus, repeat, memory):
+    """Every stage over the fixture corpus, plus per-source parse timings"""
+    aggregator = offline_aggregator(corpus)
+    stages = {}
+    per_source = {}
+    results = {}
+    for kind in ('rss', 'scrape'):
+        entries = [entry for entry in corpus if entry['kind'] == kind]
+        for entry in entries:
+            stage, _ = measure(parse_run(aggregator, [entry]), repeat, memory=False)
+            per_source[entry['name']] = {'kind': kind, 'bytes': stage['bytes'],
+                                         'headlines': stage['items'], 'seconds': stage['seconds']}
+        stages[f'{kind}_parse'], parsed = measure(parse_run(aggregator, entries), repeat, memory)
+        results.update(parsed)
+    stages['dedup'], unique = measure(dedup_run(aggregator, results), repeat, memory)
+    stages['render'], page = measure(render_run(unique, CORPUS_TIME.timestamp()), repeat, memory)
+    # zlib and brotli allocate outside tracemalloc's view, so there is no peak to trace
+    stages['compress'], _ = measure(compress_run(page), repeat, memory=False)
+    return {
+        'sources': len(corpus),
+        'bytes': sum(len(entry['body']) for entry in corpus),
+        'stages': stages,
+        'per_source': per_source,
+    }
+
+
+def run_scale(corpus, size, repeat, memory):
+    """The count-dependent stages at size headlines"""
+    aggregator = offline_aggregator(corpus)
+    feeds = [entry for entry in corpus if entry['kind'] == 'rss']
+    headlines = synthetic_headlines(size)
+    by_source = {}
+    for headline in headlines:
+        by_source.setdefault(headline['source'], []).append(headline)
+
+    stages = {}
+    stages['rss_parse'], _ = measure(parse_run(aggregator, feeds, target=size), repeat, memory)
+    stages['dedup'], _ = measure(dedup_run(aggregator, by_source), repeat, memory)
+    stages['render'], page = measure(render_run(headlines, CORPUS_TIME.timestamp()), repeat, memory)
+    stages['compress'], _ = measure(compress_run(page), repeat, memory=False)
+    return {'stages': stages}
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def stage_rows(report):
+    """(run, stage, stage report) for every stage in a report, in run order"""
+    rows = [('corpus', name, stage) for name, stage in report['corpus']['stages'].items()]
+    for size, run in report['scale'].items():
+        rows.extend((size, name, stage) for name, stage in run['stages'].items())
+    return rows
+
+
+def print_table(report, baseline=None):
+    previous = {}
+    if baseline is not None:
+        previous = {(run, name): stage['seconds'] for run, name, stage in stage_rows(baseline)}
+        print(f"Comparing against {baseline['meta'].get('commit') or 'baseline'}", file=sys.stderr)
+    print(f"{'run':<8}{'stage':<14}{'time':>12}{'items/s':>14}{'peak MB':>10}"
+          + (f"{'baseline':>12}{'change':>10}" if previous else ''), file=sys.stderr)
+    for run, name, stage in stage_rows(report):
+        peak = f"{stage['peak_bytes'] / 2 ** 20:.1f}" if stage['peak_bytes'] is not None else '-'
+        row = f"{run:<8}{name:<14}{stage['seconds'] * 1000:>10.1f}ms{stage['items_per_second']:>14,.0f}{peak:>10}"
+        before = previous.get((run, name))
+        if before:
+            change = stage['seconds'] / before - 1
+            verdict = ' slower' if change > COMPARE_THRESHOLD else ' faster' if change < -COMPARE_THRESHOLD else ''
+            row += f"{before * 1000:>10.1f}ms{change * 100:>+9.0f}%{verdict}"
+        print(row, file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default=','.join(str(size) for size in SCALE_SIZES),
+                        help='comma-separated synthetic headline counts (empty for the corpus only)')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per stage (best time is reported)')
+    parser.add_argument('--scale-repeat', type=int, default=1, help='timed runs per stage for the scale-ups')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc run per stage')
+    parser.add_argument('--out', help='write the JSON report here instead of stdout')
+    parser.add_argument('--compare', help='an earlier JSON report to compare stage times against')
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    memory = not args.no_memory
+
+    corpus = load_corpus()
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'started_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'html_parser_backend': financeNews.HTML_PARSER_BACKEND,
+            'page_encodings': [encoding for encoding, _ in financeNews.PAGE_ENCODINGS],
+            'repeat': args.repeat,
+            'scale_repeat': args.scale_repeat,
+            'memory': memory,
+        },
+        'corpus': run_corpus(corpus, args.repeat, memory),
+        'scale': {},
+    }
+    for size in sizes:
+        print(f"Running {size:,} headlines...", file=sys.stderr)
+        report['scale'][str(size)] = run_scale(corpus, size, args.scale_repeat, memory)
+    if resource is not None:
+        # ru_maxrss is KB on Linux, bytes on macOS
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        report['meta']['max_rss_bytes'] = maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_table(report, baseline)
+
+    encoded = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(encoded + '\n')
+    else:
+        print(encoded)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Time generate_html() and measure page weight at 1k and 10k headlines.
+
+Reports render time (best of --repeat runs), the HTML size, the size of the
+external content-hashed CSS/JS (downloaded once, then served from the
+browser cache) and gzip sizes of each, so first-visit and repeat-visit
+weights can be compared.
+
+    python benchmarks/render_benchmark.py [--repeat N]
+"""
+import argparse
+import gzip
+import os
+import sys
+import time
+
+os.environ.setdefault("BACKGROUND_REFRESH", "0")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import financeNews  # noqa: E402
+from fixture_corpus import synthetic_headlines  # noqa: E402
+
+HEADLINE_COUNTS = (1000, 10000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='renders per size (best time is reported)')
+    args = parser.parse_args()
+
+    assets = ''.join(content for _, content in financeNews.DASHBOARD_ASSETS.values()).encode('utf-8')
+    assets_gzip = len(gzip.compress(assets))
+    print(f"CSS + JS assets: {len(assets) / 1024:.1f} KB ({assets_gzip / 1024:.1f} KB gzipped), cached after first visit")
+    print(f"{'headlines':>10}{'render':>12}{'page KB':>10}{'gzip KB':>10}{'first visit KB':>16}{'repeat KB':>11}")
+    for count in HEADLINE_COUNTS:
+        headlines = synthetic_headlines(count)
+        best = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            page = financeNews.generate_html(headlines, time.time())
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        page_bytes = page.encode('utf-8')
+        page_gzip = len(gzip.compress(page_bytes))
+        print(f"{count:>10}{best * 1000:>10.1f}ms{len(page_bytes) / 1024:>10.1f}{page_gzip / 1024:>10.1f}"
+              f"{(page_gzip + assets_gzip) / 1024:>16.1f}{page_gzip / 1024:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
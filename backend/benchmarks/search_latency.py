@@ -0,0 +1,173 @@
+"""Measure dashboard search keystroke-to-paint latency at 500 and 5,000 cards.
+
+Renders the real dashboard with generate_html() for each card count and adds
+a small harness that types a query one character at a time. For every
+keystroke it records:
+
+    keystroke_to_paint_ms  input event -> first frame after results are applied
+                           (includes the search debounce)
+    search_to_paint_ms     debounced search start -> that frame
+    legacy_to_paint_ms     the previous DOM-walking search -> its next frame
+
+If Playwright and a Chromium build are installed (Playwright's own, or any
+Chromium/Chrome passed as --browser) the pages are run headless and a JSON
+summary is printed; otherwise the pages are written out to be opened by hand
+(results appear on the page and in the console).
+
+    python benchmarks/search_latency.py [--out DIR] [--query TEXT] [--browser PATH]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("BACKGROUND_REFRESH", "0")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import financeNews  # noqa: E402
+from fixture_corpus import synthetic_headlines  # noqa: E402
+
+CARD_COUNTS = (500, 5000)
+
+HARNESS = """
+<script>
+// The dashboard's search before the precomputed payload, for comparison
+function legacySearch(searchTerm) {
+    document.querySelectorAll('.source-section').forEach(section => {
+        const cards = section.querySelectorAll('.headline-card');
+        let hasVisibleCard = false;
+        cards.forEach(card => {
+            const title = card.querySelector('.headline-title').textContent.toLowerCase();
+            const description = card.querySelector('.headline-description');
+            const descText = description ? description.textContent.toLowerCase() : '';
+            const visible = title.includes(searchTerm) || descText.includes(searchTerm);
+            card.style.display = visible ? 'block' : 'none';
+            hasVisibleCard = hasVisibleCard || visible;
+        });
+        section.style.display = hasVisibleCard ? 'block' : 'none';
+    });
+}
+
+function nextPaint() {
+    return new Promise(resolve => requestAnimationFrame(() => setTimeout(resolve, 0)));
+}
+
+async function typeQuery(query) {
+    const box = document.getElementById('searchBox');
+    const samples = [];
+    for (let i = 1; i <= query.length; i++) {
+        const sample = {};
+        await new Promise(resolve => {
+            const original = window.runSearch;
+            window.runSearch = function () {
+                window.runSearch = original;
+                const searchStart = performance.now();
+                original();
+                nextPaint().then(() => {
+                    const painted = performance.now();
+                    sample.keystroke_to_paint_ms = painted - sample.keystroke;
+                    sample.search_to_paint_ms = painted - searchStart;
+                    resolve();
+                });
+            };
+            box.value = query.slice(0, i);
+            sample.keystroke = performance.now();
+            box.dispatchEvent(new Event('input'));
+        });
+        delete sample.keystroke;
+        samples.push(sample);
+    }
+    box.value = '';
+    runSearch();
+    await nextPaint();
+
+    for (let i = 1; i <= query.length; i++) {
+        const start = performance.now();
+        legacySearch(query.slice(0, i).toLowerCase());
+        await nextPaint();
+        samples[i - 1].legacy_to_paint_ms = performance.now() - start;
+    }
+    return samples;
+}
+
+window.benchmarkResults = new Promise(resolve => {
+    window.addEventListener('load', async () => {
+        await nextPaint();
+        const samples = await typeQuery(window.BENCH_QUERY);
+        const pre = document.createElement('pre');
+        pre.id = 'results';
+        pre.textContent = JSON.stringify(samples, null, 1);
+        document.body.prepend(pre);
+        console.log(JSON.stringify(samples));
+        resolve(samples);
+    });
+});
+</script>
+"""
+
+
+def write_page(out_dir, count, query):
+    page = financeNews.generate_html(synthetic_headlines(count), time.time())
+    harness = f'<script>window.BENCH_QUERY = {json.dumps(query)};</script>' + HARNESS
+    page = page.replace('</body>', harness + '</body>')
+    financeNews.write_dashboard_assets(out_dir)
+    path = os.path.join(out_dir, f'search_latency_{count}.html')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(page)
+    return path
+
+
+def summarize(samples):
+    summary = {}
+    for metric in ('keystroke_to_paint_ms', 'search_to_paint_ms', 'legacy_to_paint_ms'):
+        values = sorted(sample[metric] for sample in samples)
+        summary[metric] = {
+            'median': round(values[len(values) // 2], 2),
+            'max': round(values[-1], 2),
+        }
+    return summary
+
+
+def run_headless(paths, executable=None):
+    try:
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        return None
+    results = {}
+    with sync_playwright() as playwright:
+        try:
+            browser = playwright.chromium.launch(executable_path=executable)
+        except Exception as e:
+            print(f'Could not launch Chromium ({e}); open the pages by hand instead.')
+            return None
+        for count, path in paths.items():
+            page = browser.new_page()
+            page.goto('file://' + os.path.abspath(path))
+            samples = page.evaluate('window.benchmarkResults')
+            results[count] = summarize(samples)
+            page.close()
+        browser.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--out', default='bench_pages', help='directory for the generated pages')
+    parser.add_argument('--query', default='inflation earnings', help='query typed one character at a time')
+    parser.add_argument('--browser', help="a Chromium/Chrome executable to use instead of Playwright's own")
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    paths = {count: write_page(args.out, count, args.query) for count in CARD_COUNTS}
+    results = run_headless(paths, args.browser)
+    if results is None:
+        print('Playwright/Chromium not available. Open these pages in a browser:')
+        for path in paths.values():
+            print(f'  {os.path.abspath(path)}')
+        return
+    print(json.dumps({'query': args.query, 'cards': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,37 @@
 import feedparser
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import exceptions as urllib3_exceptions
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import time
-from flask import Flask, send_from_directory
+from flask import Flask, Response, request, send_from_directory
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse, urlsplit, urlunsplit, parse_qsl, urlencode
+from html.parser import HTMLParser
+from functools import lru_cache
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from operator import itemgetter
+import base64
+import calendar
+import gzip
+import html
+import hashlib
+import heapq
+import json
+import math
 import os
+import random
+import re
+import sqlite3
 import sys
 import threading
 import traceback
+import unicodedata
 
 # Console output includes emoji; on Windows the console's default codepage
 # (cp1252) can't encode them and print() would raise. Force UTF-8 so local
@@ -17,9 +41,849 @@ try:
 except Exception:
     pass
 
+# Fetch concurrency: how many sources are in flight at once, and the minimum
+# gap between two requests to the same host (replaces the old global sleeps).
+FETCH_MAX_WORKERS = int(os.environ.get("FETCH_MAX_WORKERS", 8))
+PER_HOST_DELAY_SECONDS = float(os.environ.get("PER_HOST_DELAY_SECONDS", 1.0))
+# Wall-clock budget for one cycle's fetches. Sources still outstanding when
+# it expires are left to finish in the background and folded into the next
+# cycle; the cycle publishes whatever it has.
+CYCLE_DEADLINE_SECONDS = float(os.environ.get("CYCLE_DEADLINE_SECONDS", 45))
+# While a cycle is running, results published so far are re-deduped and
+# published at most PUBLISH_INTERVAL_SECONDS after they arrive, or as soon
+# as PUBLISH_EVERY_ITEMS new headlines have come in.
+PUBLISH_INTERVAL_SECONDS = float(os.environ.get("PUBLISH_INTERVAL_SECONDS", 3))
+PUBLISH_EVERY_ITEMS = int(os.environ.get("PUBLISH_EVERY_ITEMS", 100))
+
+# Shared HTTP transport: per-request timeout and how many times a connection
+# error or 5xx response is retried (with exponential backoff) before giving up.
+HTTP_TIMEOUT_SECONDS = float(os.environ.get("HTTP_TIMEOUT_SECONDS", 10))
+HTTP_RETRIES = int(os.environ.get("HTTP_RETRIES", 2))
+# The timeout above applies to each socket read, so a server that keeps
+# dripping bytes never trips it; the whole body must also arrive within
+# HTTP_FETCH_DEADLINE_SECONDS of the request (overshooting by at most one read).
+HTTP_FETCH_DEADLINE_SECONDS = float(os.environ.get("HTTP_FETCH_DEADLINE_SECONDS", 30))
+HTTP_READ_CHUNK_BYTES = 64 * 1024
+# Base URL of a stand-in server (benchmarks/feed_server.py) that every source
+# request is sent to instead: https://host/path?q becomes <base>/host/path?q.
+# Only the transport sees the rewritten URL; per-host politeness, breakers
+# and feed caches still key on the source's real URL.
+SOURCE_URL_REWRITE = os.environ.get("SOURCE_URL_REWRITE", "").rstrip('/')
+
+def rewrite_source_url(url, base=SOURCE_URL_REWRITE):
+    """url as requested from the stand-in server at base (unchanged when base is empty)"""
+    if not base:
+        return url
+    parts = urlsplit(url)
+    target = parts.netloc.lower() + (parts.path or '/')
+    if parts.query:
+        target += '?' + parts.query
+    return f"{base}/{target}"
+
+class FetchDeadlineExceeded(requests.Timeout):
+    """A response body was still arriving when its fetch's wall-clock deadline passed"""
+
+class HttpTransport:
+    """Pooled, retrying HTTP client shared by every RSS fetch and scraper"""
+
+    def __init__(self, headers, pool_maxsize=FETCH_MAX_WORKERS, retries=HTTP_RETRIES,
+                 timeout=HTTP_TIMEOUT_SECONDS, backoff_factor=0.5, rewrite_to=SOURCE_URL_REWRITE,
+                 fetch_deadline=HTTP_FETCH_DEADLINE_SECONDS):
+        self.timeout = timeout
+        self.fetch_deadline = fetch_deadline
+        self.rewrite_to = rewrite_to.rstrip('/')
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False,
+            # A Retry-After on 503 would otherwise be slept out inside the
+            # fetch thread; SourceBreaker turns it into a cooldown instead
+            respect_retry_after_header=False,
+        )
+        # One keep-alive pool per host; pool_connections is sized so no
+        # configured host's pool is evicted (and its sockets closed) mid-cycle.
+        self._adapter = HTTPAdapter(pool_connections=64, pool_maxsize=pool_maxsize, max_retries=retry)
+        self.session.mount('http://', self._adapter)
+        self.session.mount('https://', self._adapter)
+
+    def get(self, url, **kwargs):
+        """GET url through the shared session, applying the default timeout and the fetch deadline
+
+        The body is read a socket read at a time and the response closed
+        with FetchDeadlineExceeded once fetch_deadline has passed.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        deadline = time.monotonic() + self.fetch_deadline
+        response = self.session.get(rewrite_source_url(url, self.rewrite_to), stream=True, **kwargs)
+        chunks = []
+        try:
+            while True:
+                if time.monotonic() > deadline:
+                    raise FetchDeadlineExceeded(
+                        f"{url}: body still arriving after {self.fetch_deadline:.0f}s", response=response)
+                # read1 (urllib3 >= 2.1) returns after one socket read
+                chunk = response.raw.read1(HTTP_READ_CHUNK_BYTES, decode_content=True)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        except Exception as e:
+            response.close()
+            # Reported as requests itself reports errors while reading a body
+            if isinstance(e, urllib3_exceptions.ReadTimeoutError):
+                raise requests.exceptions.ReadTimeout(e, response=response) from e
+            if isinstance(e, urllib3_exceptions.ProtocolError):
+                raise requests.exceptions.ChunkedEncodingError(e, response=response) from e
+            if isinstance(e, urllib3_exceptions.DecodeError):
+                raise requests.exceptions.ContentDecodingError(e, response=response) from e
+            raise
+        response._content = b''.join(chunks)
+        response._content_consumed = True
+        response.close()
+        return response
+
+    def stats(self):
+        """Return request and connection counts, per host and in total"""
+        pools = self._adapter.poolmanager.pools
+        hosts = {}
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = hosts.setdefault(pool.host, {'requests': 0, 'new_connections': 0})
+            host['requests'] += pool.num_requests
+            host['new_connections'] += pool.num_connections
+
+        total_requests = sum(h['requests'] for h in hosts.values())
+        new_connections = sum(h['new_connections'] for h in hosts.values())
+        return {
+            'requests': total_requests,
+            'new_connections': new_connections,
+            'reused_connections': max(0, total_requests - new_connections),
+            'hosts': hosts,
+        }
+
+# ---------------- Hub Offloading ----------------
+# Under gunicorn's gevent worker, threading is monkey-patched before this
+# module is imported: the scrape loop and its fetch "threads" are greenlets
+# on the hub that serves requests, and every lock, Condition and Event here
+# is a gevent primitive that only works between greenlets of that hub.
+# The loop therefore stays on the hub, and only CPU-bound steps that share
+# no such primitive (parsing, rendering, compression, the cycle's SQLite
+# writes) run on gevent's threadpool, so they stop blocking requests. The
+# little state those steps do share (metrics, the store's one-time setup) is
+# guarded by native_lock(). Without gevent both helpers make plain calls.
+try:
+    from gevent import monkey as gevent_monkey
+except ImportError:
+    gevent_monkey = None
+
+def _threading_patched():
+    return gevent_monkey is not None and gevent_monkey.is_module_patched('threading')
+
+def native_lock():
+    """An OS lock, even when threading is monkey-patched; never hold it across a greenlet switch"""
+    if _threading_patched():
+        return gevent_monkey.get_original('_thread', 'allocate_lock')()
+    return threading.Lock()
+
+def off_hub(function, *args, **kwargs):
+    """function(*args, **kwargs), run on gevent's threadpool while the calling greenlet yields"""
+    if _threading_patched():
+        import gevent
+        return gevent.get_hub().threadpool.apply(function, args, kwargs)
+    return function(*args, **kwargs)
+
+# ---------------- Metrics ----------------
+# A small in-process registry exposed in Prometheus text format on /metrics.
+# Recording is a dict lookup and an add under a per-metric lock, cheap
+# enough to sit on every fetch and publish. Pipeline metrics only move in the
+# worker that scrapes; it writes them next to each published generation and
+# the other workers serve that copy (see /metrics).
+METRICS = []
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+def _format_number(value):
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Metric:
+    """One metric family: a name, help text, label names and a value per label set"""
+
+    kind = 'untyped'
+
+    def __init__(self, name, help_text, labels=(), scope='pipeline'):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.scope = scope
+        self._values = {}
+        # Also updated from off_hub() work such as rendering
+        self._lock = native_lock()
+        METRICS.append(self)
+
+    def _key(self, labels):
+        return tuple(labels[name] for name in self.labels)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} {self.kind}']
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._sample_lines(key, value))
+        return lines
+
+    def _sample_lines(self, key, value):
+        return [f'{self.name}{_format_labels(self.labels, key)} {_format_number(value)}']
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, buckets, labels=(), scope='pipeline'):
+        super().__init__(name, help_text, labels, scope)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts (made cumulative when rendered), then sum
+                state = self._values[key] = [0] * len(self.buckets) + [0.0]
+            state[index] += 1
+            state[-1] += value
+
+    def _sample_lines(self, key, state):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, state):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{_format_labels(self.labels, key, [("le", _format_number(bound))])} {cumulative}')
+        lines.append(f'{self.name}_sum{_format_labels(self.labels, key)} {_format_number(state[-1])}')
+        lines.append(f'{self.name}_count{_format_labels(self.labels, key)} {cumulative}')
+        return lines
+
+def render_metrics(scope=None):
+    """Prometheus text exposition of every metric (or only those in scope)"""
+    lines = []
+    for metric in METRICS:
+        if scope is None or metric.scope == scope:
+            lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+_PARSE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+_BYTES_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+SOURCE_FETCH_SECONDS = Histogram('finance_news_source_fetch_seconds',
+                                 'Time to fetch a source (request sent to body read)', _LATENCY_BUCKETS, ('source', 'kind'))
+SOURCE_RESPONSE_BYTES = Histogram('finance_news_source_response_bytes',
+                                  'Response body size per fetch', _BYTES_BUCKETS, ('source',))
+SOURCE_PARSE_SECONDS = Histogram('finance_news_source_parse_seconds',
+                                 'Time to parse a fetched feed or page into headlines', _PARSE_BUCKETS, ('source', 'kind'))
+SOURCE_HEADLINES = Counter('finance_news_source_headlines_total', 'Headlines yielded per source', ('source',))
+SOURCE_FETCHES = Counter('finance_news_source_fetches_total',
+                         'Fetch attempts by outcome (ok, not_modified, failed, skipped)', ('source', 'outcome'))
+SOURCE_ERRORS = Counter('finance_news_source_errors_total',
+                        'Failed fetches by error class (timeout, connection, http_<status>, empty, ...)',
+                        ('source', 'error_class'))
+SOURCE_BREAKER_STATE = Gauge('finance_news_source_breaker_state',
+                             'Circuit breaker state per source: 0 closed, 1 half-open, 2 open', ('source',))
+CYCLE_SECONDS = Histogram('finance_news_cycle_duration_seconds', 'Wall-clock time of one fetch cycle',
+                          (1, 2.5, 5, 10, 20, 30, 45, 60, 120))
+CYCLE_DEADLINE_MISSES = Counter('finance_news_cycle_deadline_misses_total',
+                                'Sources still outstanding when a cycle hit its deadline', ('source',))
+DEDUP_SECONDS = Histogram('finance_news_dedup_seconds', 'Time to dedupe and merge the combined headlines',
+                          _PARSE_BUCKETS)
+DEDUP_INPUT = Gauge('finance_news_dedup_input_headlines', 'Headlines going into the last cycle\'s dedup')
+DEDUP_OUTPUT = Gauge('finance_news_dedup_output_headlines', 'Headlines left after the last cycle\'s dedup')
+DEDUP_RATIO = Gauge('finance_news_dedup_ratio', 'Fraction of the last cycle\'s headlines kept by dedup')
+RENDER_SECONDS = Histogram('finance_news_render_seconds', 'Time to render the dashboard page',
+                           (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5))
+PAGE_BYTES = Gauge('finance_news_page_bytes', 'Size of the last published page per encoding', ('encoding',))
+LAST_PUBLISH = Gauge('finance_news_last_publish_timestamp_seconds', 'When the last generation was published')
+SSE_SUBSCRIBERS = Gauge('finance_news_sse_subscribers', 'Open /events connections in this worker', scope='process')
+SSE_EVENTS = Counter('finance_news_sse_events_total', 'Live-update events broadcast by this worker', scope='process')
+
+# ---------------- Source Health ----------------
+# Each source has a circuit breaker. After BREAKER_FAILURE_THRESHOLD
+# consecutive failures (errors, timeouts, or pages with no headlines) it
+# opens and the source is skipped without a request, for a cooldown that
+# doubles with each further failure up to BREAKER_MAX_SECONDS. When the
+# cooldown expires one probe fetch is let through (half-open): success
+# closes the breaker, failure reopens it. A 429, or any response carrying
+# Retry-After, opens it straight away for at least that long.
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get("BREAKER_FAILURE_THRESHOLD", 3))
+BREAKER_BASE_SECONDS = float(os.environ.get("BREAKER_BASE_SECONDS", 5 * 60))
+BREAKER_MAX_SECONDS = float(os.environ.get("BREAKER_MAX_SECONDS", 6 * 60 * 60))
+
+def parse_retry_after(value, now=None):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    now = time.time() if now is None else now
+    return max(0.0, retry_at.timestamp() - now)
+
+def classify_fetch_error(error):
+    """Short, stable label for why a fetch failed (for logs and metrics)"""
+    if error is None:
+        return 'empty'
+    if isinstance(error, requests.Timeout):
+        return 'timeout'
+    if isinstance(error, requests.ConnectionError):
+        # Timeouts that exhausted their retries arrive wrapped in MaxRetryError
+        reason = getattr(error.args[0], 'reason', None) if error.args else None
+        return 'timeout' if isinstance(reason, urllib3_exceptions.TimeoutError) else 'connection'
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return f'http_{error.response.status_code}'
+    return type(error).__name__
+
+class SourceBreaker:
+    """Closed / open / half-open health state for one source"""
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, name, threshold=BREAKER_FAILURE_THRESHOLD,
+                 base_seconds=BREAKER_BASE_SECONDS, max_seconds=BREAKER_MAX_SECONDS):
+        self.name = name
+        self.threshold = max(1, threshold)
+        self.base_seconds = base_seconds
+        self.max_seconds = max_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.last_error = None
+        self.skipped = 0  # fetches avoided while open
+        self._lock = threading.Lock()
+        SOURCE_BREAKER_STATE.set(0, source=name)
+
+    _STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def _set_state(self, state):
+        self.state = state
+        SOURCE_BREAKER_STATE.set(self._STATE_VALUES[state], source=self.name)
+
+    def allow(self, now=None):
+        """True if the source may be fetched now; moves an expired open breaker to half-open"""
+        now = time.time() if now is None else now
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and now >= self.open_until:
+                self._set_state(self.HALF_OPEN)
+                print(f"  ◐ {self.name}: circuit half-open, probing")
+                return True
+            # Open, or half-open with its single probe already in flight
+            self.skipped += 1
+        SOURCE_FETCHES.inc(source=self.name, outcome='skipped')
+        return False
+
+    def record_success(self, not_modified=False):
+        SOURCE_FETCHES.inc(source=self.name, outcome='not_modified' if not_modified else 'ok')
+        with self._lock:
+            if self.state != self.CLOSED:
+                print(f"  ✓ {self.name}: circuit closed after {self.consecutive_failures} failures")
+            self._set_state(self.CLOSED)
+            self.consecutive_failures = 0
+            self.last_error = None
+
+    def record_failure(self, error=None, now=None):
+        """Count a failed fetch (error=None means it returned no headlines)"""
+        now = time.time() if now is None else now
+        retry_after = None
+        response = getattr(error, 'response', None)
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'), now)
+            if retry_after is None and response.status_code == 429:
+                retry_after = self.base_seconds
+
+        error_class = classify_fetch_error(error)
+        SOURCE_FETCHES.inc(source=self.name, outcome='failed')
+        SOURCE_ERRORS.inc(source=self.name, error_class=error_class)
+        with self._lock:
+            self.consecutive_failures += 1
+            self.last_error = error_class
+            if (self.state == self.CLOSED and self.consecutive_failures < self.threshold
+                    and retry_after is None):
+                return
+            doublings = max(0, self.consecutive_failures - self.threshold)
+            cooldown = min(self.base_seconds * 2 ** min(doublings, 32), self.max_seconds)
+            if retry_after is not None:
+                cooldown = min(max(cooldown, retry_after), max(self.max_seconds, retry_after))
+            self._set_state(self.OPEN)
+            self.open_until = now + cooldown
+        print(f"  ⚡ {self.name}: circuit open for {cooldown / 60:.0f}m after "
+              f"{self.consecutive_failures} consecutive failures ({self.last_error})")
+
+    def snapshot(self, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'retry_in': max(0.0, self.open_until - now) if self.state == self.OPEN else 0.0,
+                'last_error': self.last_error,
+                'skipped': self.skipped,
+            }
+
+# HTML parser used for scraped pages. 'lxml' and 'html.parser' stream the page
+# in chunks and stop as soon as a source's headline cap is reached; 'bs4'
+# builds a full BeautifulSoup tree first (the original behaviour).
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+HTML_PARSER_BACKEND = os.environ.get("HTML_PARSER_BACKEND") or ('lxml' if lxml_etree is not None else 'html.parser')
+MARKUP_CHUNK_BYTES = 16 * 1024
+
+class _StdlibEventParser(HTMLParser):
+    """Adapts html.parser callbacks to the start/data/end target interface lxml uses"""
+
+    def __init__(self, target):
+        super().__init__(convert_charrefs=True)
+        self.target = target
+
+    def handle_starttag(self, tag, attrs):
+        self.target.start(tag, dict(attrs))
+
+    def handle_startendtag(self, tag, attrs):
+        self.target.start(tag, dict(attrs))
+        self.target.end(tag)
+
+    def handle_endtag(self, tag):
+        self.target.end(tag)
+
+    def handle_data(self, data):
+        self.target.data(data)
+
+def stream_markup(content, target, backend=HTML_PARSER_BACKEND, encoding=None):
+    """Feed content to a streaming parser in chunks until target.done is set"""
+    if backend == 'lxml':
+        parser = lxml_etree.HTMLParser(target=target, encoding=encoding)
+        chunks = (content[i:i + MARKUP_CHUNK_BYTES] for i in range(0, len(content), MARKUP_CHUNK_BYTES))
+    else:
+        text = content.decode(encoding or 'utf-8', errors='replace')
+        parser = _StdlibEventParser(target)
+        chunks = (text[i:i + MARKUP_CHUNK_BYTES] for i in range(0, len(text), MARKUP_CHUNK_BYTES))
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        if target.done:
+            return
+    try:
+        parser.close()
+    except Exception:
+        # Truncated or empty documents only matter if nothing was collected
+        pass
+
+class _HeadlineCollector:
+    """Parser target that tracks only the tags one extractor needs"""
+
+    def __init__(self, extractor):
+        self.extractor = extractor
+        self.headlines = []
+        self.done = False
+        self._heading_depth = 0
+        self._heading_has_link = False
+        self._href = None
+        self._pieces = []
+        self._text_node = []
+
+    def _flush_text_node(self):
+        if self._text_node:
+            self._pieces.append(''.join(self._text_node).strip())
+            self._text_node = []
+
+    def start(self, tag, attrib):
+        if self.done:
+            return
+        if self._href is not None:
+            self._flush_text_node()
+            return
+
+        if self.extractor.headings:
+            if tag in self.extractor.tags:
+                if self._heading_depth == 0:
+                    self._heading_has_link = False
+                self._heading_depth += 1
+                return
+            # Like heading.find('a', href=True): only the first linked anchor counts
+            if self._heading_depth == 0 or self._heading_has_link:
+                return
+
+        if tag == 'a' and attrib.get('href') is not None:
+            self._href = attrib['href']
+            self._pieces = []
+            self._text_node = []
+            self._heading_has_link = True
+
+    def data(self, text):
+        if self._href is not None:
+            self._text_node.append(text)
+
+    def end(self, tag):
+        if self.done:
+            return
+        if self._href is not None:
+            self._flush_text_node()
+            if tag != 'a':
+                return
+            headline = self.extractor.build_headline(self._href, ''.join(self._pieces))
+            self._href = None
+            if headline:
+                self.headlines.append(headline)
+                if len(self.headlines) >= self.extractor.max_items:
+                    self.done = True
+        elif self.extractor.headings and tag in self.extractor.tags and self._heading_depth:
+            self._heading_depth -= 1
+
+    def close(self):
+        return self.headlines
+
+class HeadlineExtractor:
+    """Compiled form of one scraping_sources spec; pulls headlines out of a page"""
+
+    def __init__(self, spec):
+        self.source_name = spec['name']
+        self.headings = spec.get('select', 'anchors') == 'headings'
+        if self.headings:
+            self.tags = list(spec.get('tags', ['h2', 'h3', 'h4']))
+        else:
+            self.tags = ['a']
+        self.url_prefix = (spec.get('url_prefix') or '').rstrip('/')
+        self.domain = spec.get('domain')
+        self.path_contains = spec.get('path_contains')
+        self.min_title_length = spec.get('min_title_length', 20)
+        self.max_items = spec.get('max_items', 15)
+
+    def absolute_link(self, link):
+        """Join a root-relative href to the source's url_prefix"""
+        if link.startswith('//'):
+            return 'https:' + link
+        if link.startswith('/') and self.url_prefix:
+            return self.url_prefix + link
+        return link
+
+    def link_matches(self, link):
+        if not link.startswith(('http://', 'https://')):
+            return False
+        if self.domain and self.domain not in urlparse(link).netloc:
+            return False
+        if self.path_contains and self.path_contains not in link:
+            return False
+        return True
+
+    def build_headline(self, href, title):
+        """Return the headline for an anchor, or None if the spec filters it out"""
+        link = self.absolute_link(href.strip())
+        if not self.link_matches(link) or len(title) <= self.min_title_length:
+            return None
+        return {
+            'title': title,
+            'link': link,
+            'source': self.source_name,
+            'published': 'Recent',
+            'published_at': None,
+            'description': ''
+        }
+
+    def extract_markup(self, content, encoding=None, backend=HTML_PARSER_BACKEND):
+        """Parse raw page bytes with the given backend and return its headlines"""
+        if backend == 'bs4':
+            return self.extract(BeautifulSoup(content, 'html.parser', from_encoding=encoding))
+        collector = _HeadlineCollector(self)
+        stream_markup(content, collector, backend=backend, encoding=encoding)
+        return collector.headlines
+
+    def extract(self, soup):
+        """Walk an already-built BeautifulSoup tree, stopping at max_items headlines"""
+        headlines = []
+        for tag in soup.find_all(self.tags):
+            anchor = tag if tag.name == 'a' else tag.find('a', href=True)
+            if anchor is None:
+                continue
+
+            # Cheap href checks run first so get_text only runs on candidates
+            link = self.absolute_link(anchor.get('href', '').strip())
+            if not self.link_matches(link):
+                continue
+
+            headline = self.build_headline(link, anchor.get_text(strip=True))
+            if headline:
+                headlines.append(headline)
+                if len(headlines) >= self.max_items:
+                    break
+
+        return headlines
+
+# Near-duplicate titles (the same story worded slightly differently by two
+# outlets) are merged when the Jaccard similarity of their word sets is at
+# least this value.
+NEAR_DUPLICATE_THRESHOLD = float(os.environ.get("NEAR_DUPLICATE_THRESHOLD", 0.7))
+
+_TITLE_STOPWORDS = frozenset(
+    'a an and are as at be by for from has have in is it its of on or over says '
+    'than that the this to up was were will with after amid as new'.split()
+)
+_TITLE_TOKEN_RE = re.compile(r"[^\W_]+(?:['.][^\W_]+)*")
+
+def title_tokens(title):
+    """Lowercased content words of a title, used for near-duplicate matching"""
+    return frozenset(
+        token for token in _TITLE_TOKEN_RE.findall(title.lower())
+        if token not in _TITLE_STOPWORDS
+    )
+
+def _token_hash(token):
+    return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=4).digest(), 'big')
+
+class NearDuplicateIndex:
+    """MinHash LSH index over headline titles
+
+    Each title's word set gets a MinHash signature, split into bands; only
+    titles sharing a band bucket are compared, so a lookup costs roughly the
+    same at 100 or 100,000 indexed titles. Candidates are confirmed with the
+    exact Jaccard similarity against the threshold. A title is hashed and
+    bucketed once, however many times it is looked up, so one index serves
+    every re-dedup within a cycle.
+    """
+
+    _PRIME = (1 << 61) - 1
+
+    def __init__(self, threshold=NEAR_DUPLICATE_THRESHOLD, num_perm=64, seed=1):
+        self.threshold = threshold
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, self._PRIME), rng.randrange(0, self._PRIME)) for _ in range(num_perm)]
+        self.bands, self.rows = self._band_layout(threshold, num_perm)
+        self._buckets = [{} for _ in range(self.bands)]
+        self._token_sets = []
+        self._item_band_keys = []
+        self._ids = {}  # title -> item id (None for a title with no tokens)
+        self._token_signatures = {}
+
+    @staticmethod
+    def _band_layout(threshold, num_perm):
+        """Pick bands x rows whose LSH S-curve threshold (1/b)^(1/r) sits just under threshold"""
+        best = (num_perm, 1)
+        for rows in range(1, num_perm + 1):
+            if num_perm % rows:
+                continue
+            bands = num_perm // rows
+            if (1 / bands) ** (1 / rows) <= threshold:
+                best = (bands, rows)
+        return best
+
+    def _token_signature(self, token):
+        signature = self._token_signatures.get(token)
+        if signature is None:
+            h = _token_hash(token)
+            prime = self._PRIME
+            signature = array('Q', [(a * h + b) % prime for a, b in self._perms])
+            if len(self._token_signatures) < 50000:
+                self._token_signatures[token] = signature
+        return signature
+
+    def _signature(self, tokens):
+        # Element-wise min over per-token hash rows; cached rows make this a
+        # single C-level pass for vocabulary that recurs across headlines.
+        return list(map(min, zip(*[self._token_signature(token) for token in tokens])))
+
+    def _band_keys(self, signature):
+        rows = self.rows
+        return [tuple(signature[band * rows:(band + 1) * rows]) for band in range(self.bands)]
+
+    def __len__(self):
+        return len(self._token_sets)
+
+    def add(self, title):
+        """Index title if it is new and return its item id, or None if it has no tokens"""
+        if title in self._ids:
+            return self._ids[title]
+        tokens = title_tokens(title)
+        item_id = None
+        if tokens:
+            band_keys = self._band_keys(self._signature(tokens))
+            item_id = len(self._token_sets)
+            self._token_sets.append(tokens)
+            self._item_band_keys.append(band_keys)
+            for buckets, key in zip(self._buckets, band_keys):
+                buckets.setdefault(key, []).append(item_id)
+        self._ids[title] = item_id
+        return item_id
+
+    def best_match(self, item_id, among):
+        """(among[id], similarity) of the closest item whose id is a key of among, or None
+
+        Ties go to the smallest among[id].
+        """
+        if item_id in among:
+            return among[item_id], 1.0
+        tokens = self._token_sets[item_id]
+        best = None
+        seen = set()
+        for buckets, key in zip(self._buckets, self._item_band_keys[item_id]):
+            for other_id in buckets[key]:
+                if other_id in seen or other_id not in among:
+                    continue
+                seen.add(other_id)
+                other = self._token_sets[other_id]
+                similarity = len(tokens & other) / len(tokens | other)
+                if similarity >= self.threshold and (
+                        best is None or similarity > best[1] or (similarity == best[1] and among[other_id] < best[0])):
+                    best = (among[other_id], similarity)
+        return best
+
+# Query parameters that only track the click and never change the article,
+# on any site (as does every utm_* parameter). Generic names such as 'cid',
+# 'src' or 'ref' are left alone: some publishers use them as content ids.
+_TRACKING_PARAMS = frozenset([
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', '_ga', 'ref_src',
+    'guccounter', 'guce_referrer', 'guce_referrer_sig', 'amp',
+])
+# Parameters that are tracking only on these sites (and their subdomains)
+_SITE_TRACKING_PARAMS = {
+    'wsj.com': frozenset(['mod', 'tpcc', 'cmpid']),
+    'barrons.com': frozenset(['mod', 'tpcc', 'cmpid']),
+    'marketwatch.com': frozenset(['mod', 'tpcc', 'cmpid']),
+    'yahoo.com': frozenset(['ncid', 'yptr', 'taid']),
+    'ft.com': frozenset(['ftag']),
+    'nytimes.com': frozenset(['smid']),
+    'reuters.com': frozenset(['outputtype']),
+}
+
+def _site_tracking_params(host):
+    labels = host.split('.')
+    for start in range(len(labels) - 1):
+        params = _SITE_TRACKING_PARAMS.get('.'.join(labels[start:]))
+        if params is not None:
+            return params
+    return frozenset()
+_AMP_PATH_RE = re.compile(r'(/amp(?=/|$)|\.amp(?=$|\.html?$)|/amp\.html?$)', re.IGNORECASE)
+
+def canonical_url(link):
+    """Normalize an article link so RSS and scraped forms of it compare equal
+
+    Scheme is folded to https, 'www.'/'m.'/'amp.' host prefixes, default ports,
+    fragments, AMP path markers, tracking parameters and trailing slashes are
+    dropped, and remaining query parameters are sorted. Returns None for
+    anything that is not an absolute http(s) link.
+    """
+    try:
+        parts = urlsplit(link.strip())
+    except ValueError:
+        return None
+    if parts.scheme.lower() not in ('http', 'https') or not parts.hostname:
+        return None
+
+    host = parts.hostname
+    for prefix in ('www.', 'amp.', 'm.'):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+
+    site_params = _site_tracking_params(host)
+    try:
+        port = parts.port
+    except ValueError:
+        return None
+    if port and port not in (80, 443):
+        host = f'{host}:{port}'
+
+    path = re.sub(r'/{2,}', '/', parts.path)
+    path = _AMP_PATH_RE.sub('', path).rstrip('/') or '/'
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in _TRACKING_PARAMS and key.lower() not in site_params
+        and not key.lower().startswith('utm_')
+    ))
+    return urlunsplit(('https', host, path, query, ''))
+
+def canonical_link_hash(link):
+    """Compact hash of canonical_url(link) for the dedup index, or None"""
+    canonical = canonical_url(link)
+    if canonical is None:
+        return None
+    return hashlib.blake2b(canonical.encode('utf-8'), digest_size=8).digest()
+
 class FinancialNewsAggregator:
-    def __init__(self):
+    def __init__(self, max_workers=FETCH_MAX_WORKERS, per_host_delay=PER_HOST_DELAY_SECONDS,
+                 near_duplicate_threshold=NEAR_DUPLICATE_THRESHOLD, cycle_deadline=CYCLE_DEADLINE_SECONDS):
         """Initialize the financial news aggregator with multiple sources"""
+        self.max_workers = max(1, max_workers)
+        self.per_host_delay = per_host_delay
+        self.cycle_deadline = cycle_deadline
+        self.near_duplicate_threshold = near_duplicate_threshold
+        # Groups merged by the last cycle's near-duplicate stage; the first
+        # headline of each group is the one that was kept
+        self.near_duplicate_groups = []
+        self.reset_dedup_caches()
+        # (kept source, dropped source) -> entries collapsed by canonical link last cycle
+        self.url_collapses = {}
+        self._host_locks = {}
+        self._host_last_request = {}
+        self._host_locks_guard = threading.Lock()
+        # Per-feed validators and last parsed headlines, keyed by feed URL, so
+        # unchanged feeds answer 304 and are not re-downloaded or re-parsed
+        self._feed_cache = {}
+        # Last non-empty result per source, reused for sources that are not
+        # due this cycle (or that fail), and what this cycle actually fetched
+        self.source_results = {}
+        self.last_fetched = {}
+        # When each source's retained result was fetched. A result is dropped
+        # once RESULT_MAX_AGE_INTERVALS of the source's own refresh interval
+        # have passed without a new one (see set_refresh_interval), so a
+        # source that keeps failing, comes back empty or sits behind an open
+        # breaker leaves the page. Until the scheduler has given a source an
+        # interval, and at most, the limit is the longest a healthy source
+        # goes between fetches.
+        self.result_fetched_at = {}
+        self.result_max_age = REFRESH_MAX_SECONDS * (1 + REFRESH_JITTER) + REFRESH_BATCH_SECONDS + cycle_deadline
+        self.result_max_ages = {}
+        # Sources that missed the last cycle's deadline: name -> 'running'
+        # (its result will be folded in when it lands) or 'not started'
+        self.missed_deadline = {}
+        self._in_flight = set()
+        self._results_lock = threading.Lock()
+        # Per source: headline key -> when it was first fetched, for the
+        # headlines in its latest result (see _stamp_publish_times)
+        self._first_seen = {}
+        self.cycles_completed = 0
+
         self.rss_sources = {
             # Major Financial News - RSS
             'Bloomberg': 'https://feeds.bloomberg.com/markets/news.rss',
@@ -64,48 +928,89 @@ class FinancialNewsAggregator:
             'Investor\'s Business Daily': 'https://www.investors.com/feed/',
         }
 
+        # Scraped sites are described declaratively and run by HeadlineExtractor.
+        # 'select' is either 'anchors' (every <a href> on the page) or
+        # 'headings' (the first <a> inside each of 'tags'). Relative links are
+        # joined to 'url_prefix'; 'domain' and 'path_contains' filter links,
+        # titles must be longer than 'min_title_length', and extraction stops
+        # after 'max_items' headlines.
         self.scraping_sources = [
             {
                 'name': 'Bloomberg Markets',
                 'url': 'https://www.bloomberg.com/markets',
-                'method': self.scrape_bloomberg
+                'select': 'anchors',
+                'url_prefix': 'https://www.bloomberg.com',
+                'domain': 'bloomberg.com',
+                'path_contains': '/news/',
+                'min_title_length': 20,
+                'max_items': 15,
             },
             {
                 'name': 'Reuters Markets',
                 'url': 'https://www.reuters.com/markets/',
-                'method': self.scrape_reuters
+                'select': 'headings',
+                'tags': ['h2', 'h3', 'h4'],
+                'url_prefix': 'https://www.reuters.com',
+                'min_title_length': 20,
+                'max_items': 15,
             },
             {
                 'name': 'CNBC Markets',
                 'url': 'https://www.cnbc.com/world-markets/',
-                'method': self.scrape_cnbc
+                'select': 'anchors',
+                'url_prefix': 'https://www.cnbc.com',
+                'domain': 'cnbc.com',
+                'min_title_length': 20,
+                'max_items': 15,
             },
             {
                 'name': 'Financial Times Markets',
                 'url': 'https://www.ft.com/markets',
-                'method': self.scrape_ft
+                'select': 'headings',
+                'tags': ['h2', 'h3'],
+                'url_prefix': 'https://www.ft.com',
+                'min_title_length': 20,
+                'max_items': 15,
             },
             {
                 'name': 'Moneycontrol News',
                 'url': 'https://www.moneycontrol.com/news/business/markets/',
-                'method': self.scrape_moneycontrol
+                'select': 'anchors',
+                'domain': 'moneycontrol.com',
+                'min_title_length': 25,
+                'max_items': 15,
             },
             {
                 'name': 'NSE India News',
                 'url': 'https://www.nseindia.com/market-data/live-market-indices',
-                'method': self.scrape_nse
+                'select': 'headings',
+                'tags': ['h2', 'h3', 'h4'],
+                'url_prefix': 'https://www.nseindia.com',
+                'min_title_length': 15,
+                'max_items': 10,
             },
             {
                 'name': 'BSE India',
                 'url': 'https://www.bseindia.com/',
-                'method': self.scrape_bse
+                'select': 'anchors',
+                'url_prefix': 'https://www.bseindia.com',
+                'domain': 'bseindia.com',
+                'min_title_length': 20,
+                'max_items': 10,
             },
             {
                 'name': 'Zerodha Varsity',
                 'url': 'https://zerodha.com/varsity/',
-                'method': self.scrape_zerodha
+                'select': 'headings',
+                'tags': ['h2', 'h3'],
+                'url_prefix': 'https://zerodha.com',
+                'min_title_length': 15,
+                'max_items': 10,
             }
         ]
+        self._extractors = {source['name']: HeadlineExtractor(source) for source in self.scraping_sources}
+        # Most recent per-source timings from scrape_source, keyed by source name
+        self.scrape_timings = {}
 
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -114,12 +1019,81 @@ class FinancialNewsAggregator:
             'Connection': 'keep-alive',
         }
 
+        self.transport = HttpTransport(self.headers, pool_maxsize=self.max_workers)
+        self.breakers = {name: SourceBreaker(name) for name in self.source_names()}
+
+    def _wait_for_host(self, url):
+        """Block until at least per_host_delay has passed since the last request to url's host"""
+        host = urlparse(url).netloc.lower()
+        with self._host_locks_guard:
+            lock = self._host_locks.setdefault(host, threading.Lock())
+
+        # Holding the host's lock while sleeping spaces out requests to the
+        # same site; requests to other hosts are unaffected.
+        with lock:
+            last = self._host_last_request.get(host)
+            if last is not None:
+                remaining = self.per_host_delay - (time.monotonic() - last)
+                if remaining > 0:
+                    time.sleep(remaining)
+            self._host_last_request[host] = time.monotonic()
+
+    def _run_rss_source(self, source_name, url):
+        # An open circuit costs nothing: no host wait, no request
+        if not self.breakers[source_name].allow():
+            return []
+        self._wait_for_host(url)
+        return self._stamp_publish_times(source_name, self.fetch_rss_feed(url, source_name))
+
+    def _run_scrape_source(self, source):
+        breaker = self.breakers[source['name']]
+        if not breaker.allow():
+            return []
+        self._wait_for_host(source['url'])
+        try:
+            print(f"Attempting to scrape {source['name']}...")
+            scraped_headlines = self.scrape_source(source)
+            timing = self.scrape_timings[source['name']]
+            if scraped_headlines:
+                print(f"  ✓ Found {len(scraped_headlines)} headlines from {source['name']} "
+                      f"(parsed in {timing['parse_seconds'] * 1000:.0f}ms)")
+                breaker.record_success()
+            else:
+                print(f"  ✗ No headlines found from {source['name']}")
+                breaker.record_failure()
+            return self._stamp_publish_times(source['name'], scraped_headlines or [])
+        except Exception as e:
+            print(f"  ✗ Could not scrape {source['name']}: {str(e)}")
+            breaker.record_failure(e)
+            return []
+
     def fetch_rss_feed(self, url, source_name):
         """Fetch financial news from RSS feed"""
         headlines = []
         try:
             print(f"Fetching from {source_name}...")
-            feed = feedparser.parse(url)
+            cached = self._feed_cache.get(url)
+            conditional_headers = {}
+            if cached:
+                if cached['etag']:
+                    conditional_headers['If-None-Match'] = cached['etag']
+                if cached['modified']:
+                    conditional_headers['If-Modified-Since'] = cached['modified']
+
+            fetch_start = time.perf_counter()
+            response = self.transport.get(url, headers=conditional_headers)
+            SOURCE_FETCH_SECONDS.observe(time.perf_counter() - fetch_start, source=source_name, kind='rss')
+            SOURCE_RESPONSE_BYTES.observe(len(response.content), source=source_name)
+            if cached and response.status_code == 304:
+                print(f"  ✓ Not modified, reusing {len(cached['headlines'])} headlines from {source_name}")
+                self.breakers[source_name].record_success(not_modified=True)
+                return list(cached['headlines'])
+            response.raise_for_status()
+
+            parse_start = time.perf_counter()
+            # feedparser looks headers up by lower-case name
+            feed = off_hub(feedparser.parse, response.content,
+                           response_headers={k.lower(): v for k, v in response.headers.items()})
 
             if feed.bozo:
                 print(f"  Warning: Feed parsing issue for {source_name}")
@@ -128,6 +1102,8 @@ class FinancialNewsAggregator:
                 title = entry.get('title', 'No title')
                 link = entry.get('link', '#')
                 published = entry.get('published', entry.get('updated', 'Recent'))
+                # feedparser normalizes every date format it knows to a UTC struct_time
+                published_parsed = entry.get('published_parsed') or entry.get('updated_parsed')
                 description = entry.get('summary', '')[:200]
 
                 headlines.append({
@@ -135,349 +1111,1894 @@ class FinancialNewsAggregator:
                     'link': link,
                     'source': source_name,
                     'published': published,
+                    'published_at': calendar.timegm(published_parsed) if published_parsed else None,
                     'description': description
                 })
 
+            SOURCE_PARSE_SECONDS.observe(time.perf_counter() - parse_start, source=source_name, kind='rss')
+            SOURCE_HEADLINES.inc(len(headlines), source=source_name)
+
             print(f"  ✓ Found {len(headlines)} headlines from {source_name}")
+            if headlines:
+                self.breakers[source_name].record_success()
+            else:
+                self.breakers[source_name].record_failure()
+
+            etag = response.headers.get('ETag')
+            modified = response.headers.get('Last-Modified')
+            if headlines and (etag or modified):
+                self._feed_cache[url] = {'etag': etag, 'modified': modified, 'headlines': headlines}
+            else:
+                self._feed_cache.pop(url, None)
 
         except Exception as e:
             print(f"  ✗ Error fetching {source_name}: {str(e)}")
+            self.breakers[source_name].record_failure(e)
 
         return headlines
 
-    def scrape_bloomberg(self, url):
-        """Scrape Bloomberg"""
-        headlines = []
-        try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            articles = soup.find_all('a', href=True)
-            for article in articles:
-                title = article.get_text(strip=True)
-                link = article.get('href', '')
-
-                if link and not link.startswith('http'):
-                    link = 'https://www.bloomberg.com' + link
-
-                if (
-                    title and len(title) > 20 and
-                    'bloomberg.com' in link and
-                    '/news/' in link
-                ):
-                    headlines.append({
-                        'title': title,
-                        'link': link,
-                        'source': 'Bloomberg Markets',
-                        'published': 'Recent',
-                        'description': ''
-                    })
-
-                if len(headlines) >= 15:
-                    break
+    def scrape_source(self, source):
+        """Fetch a scraped source's page and run its extractor over it"""
+        extractor = self._extractors[source['name']]
+        fetch_start = time.perf_counter()
+        response = self.transport.get(source['url'])
+        response.raise_for_status()
+        # Only trust the declared charset; otherwise let the parser sniff it
+        content_type = response.headers.get('Content-Type', '').lower()
+        encoding = response.encoding if 'charset=' in content_type else None
+
+        parse_start = time.perf_counter()
+        headlines = off_hub(extractor.extract_markup, response.content, encoding)
+        parse_end = time.perf_counter()
+
+        self.scrape_timings[source['name']] = {
+            'fetch_seconds': parse_start - fetch_start,
+            'parse_seconds': parse_end - parse_start,
+            'bytes': len(response.content),
+            'headlines': len(headlines),
+        }
+        SOURCE_FETCH_SECONDS.observe(parse_start - fetch_start, source=source['name'], kind='scrape')
+        SOURCE_PARSE_SECONDS.observe(parse_end - parse_start, source=source['name'], kind='scrape')
+        SOURCE_RESPONSE_BYTES.observe(len(response.content), source=source['name'])
+        SOURCE_HEADLINES.inc(len(headlines), source=source['name'])
+        return headlines
 
-        except Exception as e:
-            print(f"    Error: {str(e)}")
+    def _stamp_publish_times(self, source_name, headlines):
+        """Set each headline's published_at (UTC epoch) and return headlines
 
+        Headlines without a parsed feed date get the time their key was first
+        fetched, remembered for as long as it stays in the source's results;
+        parsed dates are capped at that time, since feeds with a bad clock or
+        time zone would otherwise float their items above everything else.
+        """
+        if not headlines:
+            return headlines
+        now = time.time()
+        previous = self._first_seen.get(source_name, {})
+        first_seen = {}
+        for headline in headlines:
+            key = HeadlineStore.headline_key(headline)
+            seen_at = first_seen.get(key) or previous.get(key) or now
+            first_seen[key] = seen_at
+            published_at = headline.get('published_at')
+            headline['published_at'] = seen_at if published_at is None else min(published_at, seen_at)
+        self._first_seen[source_name] = first_seen
         return headlines
 
-    def scrape_reuters(self, url):
-        """Scrape Reuters"""
-        headlines = []
-        try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            articles = soup.find_all(['h2', 'h3', 'h4'])
-            for article in articles:
-                link_tag = article.find('a')
-                if link_tag:
-                    title = link_tag.get_text(strip=True)
-                    link = link_tag.get('href', '')
-
-                    if link and not link.startswith('http'):
-                        link = 'https://www.reuters.com' + link
-
-                    if title and len(title) > 20:
-                        headlines.append({
-                            'title': title,
-                            'link': link,
-                            'source': 'Reuters Markets',
-                            'published': 'Recent',
-                            'description': ''
-                        })
-
-                if len(headlines) >= 15:
-                    break
+    def set_refresh_interval(self, source_name, interval):
+        """Expire source_name's retained result RESULT_MAX_AGE_INTERVALS refreshes after it was fetched"""
+        max_age = (RESULT_MAX_AGE_INTERVALS * interval * (1 + REFRESH_JITTER)
+                   + REFRESH_BATCH_SECONDS + self.cycle_deadline)
+        with self._results_lock:
+            self.result_max_ages[source_name] = min(max_age, self.result_max_age)
 
-        except Exception as e:
-            print(f"    Error: {str(e)}")
+    def reset_dedup_caches(self):
+        """Forget the titles and links hashed so far; done as each cycle starts
 
-        return headlines
+        Within a cycle, progressive publishes then only hash results that are new.
+        """
+        self.near_duplicate_index = NearDuplicateIndex(self.near_duplicate_threshold)
+        self._link_hashes = {}
+
+    def source_names(self):
+        """Every source name in config order: RSS feeds, then scraped sites"""
+        return list(self.rss_sources) + [source['name'] for source in self.scraping_sources]
+
+    def _fold_in_late(self, source_name, future):
+        """Keep a fetch that finished after its cycle's deadline for the next cycle"""
+        headlines = [] if future.cancelled() or future.exception() else future.result()
+        with self._results_lock:
+            self._in_flight.discard(source_name)
+            if headlines:
+                self.source_results[source_name] = headlines
+                self.result_fetched_at[source_name] = time.time()
+        if headlines:
+            print(f"  ↻ Late result from {source_name} ({len(headlines)} headlines) kept for the next cycle")
+
+    def result_times(self):
+        """When each retained result was fetched, by source name (for the snapshot)"""
+        with self._results_lock:
+            return dict(self.result_fetched_at)
+
+    def source_health(self):
+        """Breaker state per source name, for logs and metrics"""
+        return {name: breaker.snapshot() for name, breaker in self.breakers.items()}
+
+    def seed_results(self, headlines, fetched_at=None):
+        """Use saved headlines (e.g. the warm-start snapshot) for sources with no result yet
+
+        fetched_at maps a source to when its saved headlines were fetched
+        (default now); they expire on the same clock as fresh results.
+        """
+        fetched_at = fetched_at or {}
+        now = time.time()
+        by_source = {}
+        for headline in headlines:
+            by_source.setdefault(headline['source'], []).append(headline)
+        with self._results_lock:
+            for source_name, source_headlines in by_source.items():
+                if source_name in self.breakers and source_name not in self.source_results:
+                    self.source_results[source_name] = source_headlines
+                    self.result_fetched_at[source_name] = fetched_at.get(source_name, now)
+                    # Saved headlines keep their times when the source is refetched
+                    self._first_seen[source_name] = {
+                        HeadlineStore.headline_key(headline): headline['published_at']
+                        for headline in source_headlines if headline.get('published_at')
+                    }
 
-    def scrape_cnbc(self, url):
-        """Scrape CNBC"""
-        headlines = []
-        try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            articles = soup.find_all('a', href=True)
-            for article in articles:
-                title = article.get_text(strip=True)
-                link = article.get('href', '')
-
-                if not link.startswith('http') and link.startswith('/'):
-                    link = 'https://www.cnbc.com' + link
-
-                if (
-                    title and len(title) > 20 and
-                    'cnbc.com' in link
-                ):
-                    headlines.append({
-                        'title': title,
-                        'link': link,
-                        'source': 'CNBC Markets',
-                        'published': 'Recent',
-                        'description': ''
-                    })
-
-                if len(headlines) >= 15:
-                    break
+    def fetch_all_news(self, sources=None, on_progress=None):
+        """Fetch financial news from all available sources
 
-        except Exception as e:
-            print(f"    Error: {str(e)}")
+        With sources (a collection of names), only those are fetched; every
+        other source contributes its last successful result. on_progress, if
+        given, is called with the deduped headlines so far while fetches are
+        still outstanding (see PUBLISH_INTERVAL_SECONDS).
+        """
+        print("=" * 70)
+        print(" " * 15 + "FINANCIAL NEWS AGGREGATION")
+        print("=" * 70)
+        print()
 
-        return headlines
+        # Every RSS feed and scraper runs on a bounded worker pool; per-host
+        # politeness is enforced in _wait_for_host. Results are stored by
+        # name and combined in config order, so which duplicate wins in
+        # dedup below follows config order, not completion order.
+        rss_due = {name: url for name, url in self.rss_sources.items() if sources is None or name in sources}
+        scrape_due = [source for source in self.scraping_sources if sources is None or source['name'] in sources]
+        print(f"💰 Fetching {len(rss_due)} RSS feeds and scraping {len(scrape_due)} sites "
+              f"({self.max_workers} concurrent)...")
+        print("-" * 70)
+        cycle_start = time.monotonic()
+        self.last_fetched = {}
+        self.reset_dedup_caches()
+        # Not a with-block: leaving one waits for every fetch, which is what
+        # the deadline is there to avoid
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="fetch")
+        futures = {}
+        with self._results_lock:
+            still_running = set(self._in_flight)
+        for source_name, url in rss_due.items():
+            if source_name not in still_running:
+                futures[pool.submit(self._run_rss_source, source_name, url)] = source_name
+        for source in scrape_due:
+            if source['name'] not in still_running:
+                futures[pool.submit(self._run_scrape_source, source)] = source['name']
+        skipped = still_running.intersection(rss_due, (source['name'] for source in scrape_due))
+        if skipped:
+            print(f"Still running from the last cycle, not refetched: {', '.join(sorted(skipped))}")
+
+        # Each result joins the live dataset as it lands; wake up either for
+        # the next completion or when unpublished results are due out
+        deadline = cycle_start + self.cycle_deadline
+        outstanding = set(futures)
+        unpublished = 0
+        last_publish = time.monotonic()
+        while outstanding:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            timeout = deadline - now
+            if on_progress is not None and unpublished:
+                timeout = min(timeout, max(0.0, last_publish + PUBLISH_INTERVAL_SECONDS - now))
+            done, outstanding = wait(outstanding, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                source_name = futures[future]
+                headlines = future.result()
+                self.last_fetched[source_name] = headlines
+                if headlines:
+                    unpublished += len(headlines)
+                    with self._results_lock:
+                        self.source_results[source_name] = headlines
+                        self.result_fetched_at[source_name] = time.time()
+
+            # The final publish after the cycle covers the last batch
+            if on_progress is not None and outstanding and unpublished and (
+                    unpublished >= PUBLISH_EVERY_ITEMS
+                    or time.monotonic() - last_publish >= PUBLISH_INTERVAL_SECONDS):
+                try:
+                    on_progress(self.combine_results(verbose=False))
+                except Exception:
+                    print("✗ Publishing partial results failed:", file=sys.stderr)
+                    traceback.print_exc()
+                unpublished = 0
+                last_publish = time.monotonic()
+
+        # Queued fetches are dropped; running ones cannot be interrupted but
+        # end within HTTP_FETCH_DEADLINE_SECONDS (see HttpTransport.get), and
+        # _fold_in_late keeps their result
+        pool.shutdown(wait=False, cancel_futures=True)
+
+        self.missed_deadline = {}
+        for future in outstanding:
+            source_name = futures[future]
+            if future.cancelled():
+                self.missed_deadline[source_name] = 'not started'
+                CYCLE_DEADLINE_MISSES.inc(source=source_name)
+                continue
+            self.missed_deadline[source_name] = 'running'
+            CYCLE_DEADLINE_MISSES.inc(source=source_name)
+            with self._results_lock:
+                self._in_flight.add(source_name)
+            future.add_done_callback(lambda f, name=source_name: self._fold_in_late(name, f))
 
-    def scrape_ft(self, url):
-        """Scrape Financial Times"""
-        headlines = []
-        try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            articles = soup.find_all(['h2', 'h3'])
-            for article in articles:
-                link_tag = article.find('a')
-                if link_tag:
-                    title = link_tag.get_text(strip=True)
-                    link = link_tag.get('href', '')
-
-                    if link and not link.startswith('http'):
-                        link = 'https://www.ft.com' + link
-
-                    if title and len(title) > 20:
-                        headlines.append({
-                            'title': title,
-                            'link': link,
-                            'source': 'Financial Times Markets',
-                            'published': 'Recent',
-                            'description': ''
-                        })
-
-                if len(headlines) >= 15:
-                    break
+        print()
+        if self.missed_deadline:
+            print(f"⏱ Cycle deadline ({self.cycle_deadline:.0f}s) reached; "
+                  f"{len(self.missed_deadline)} sources missed it:")
+            for source_name, status in sorted(self.missed_deadline.items()):
+                print(f"  ✗ {source_name} ({status})")
+        cycle_seconds = time.monotonic() - cycle_start
+        CYCLE_SECONDS.observe(cycle_seconds)
+        print(f"Fetched all sources in {cycle_seconds:.1f}s")
+        transport_stats = self.transport.stats()
+        print(f"HTTP: {transport_stats['requests']} requests, "
+              f"{transport_stats['new_connections']} new connections, "
+              f"{transport_stats['reused_connections']} reused")
+        health = self.source_health()
+        unhealthy = {name: h for name, h in health.items() if h['state'] != SourceBreaker.CLOSED}
+        print(f"Source health: {len(health) - len(unhealthy)} closed, {len(unhealthy)} open or probing")
+        for name, h in sorted(unhealthy.items(), key=lambda item: item[1]['retry_in']):
+            print(f"  ⚡ {name}: {h['state']}, {h['consecutive_failures']} failures ({h['last_error']}), "
+                  f"retry in {h['retry_in'] / 60:.0f}m")
+        print()
 
-        except Exception as e:
-            print(f"    Error: {str(e)}")
+        self.cycles_completed += 1
+        return self.combine_results()
 
-        return headlines
+    def combine_results(self, verbose=True):
+        """Every source's latest result in config order, deduplicated
 
-    def scrape_moneycontrol(self, url):
-        """Scrape Moneycontrol"""
-        headlines = []
-        try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            articles = soup.find_all('a', href=True)
-            for article in articles:
-                title = article.get_text(strip=True)
-                link = article.get('href', '')
-
-                if (
-                    title and len(title) > 25 and
-                    link.startswith('http') and
-                    'moneycontrol.com' in link
-                ):
-                    headlines.append({
-                        'title': title,
-                        'link': link,
-                        'source': 'Moneycontrol News',
-                        'published': 'Recent',
-                        'description': ''
-                    })
-
-                if len(headlines) >= 15:
-                    break
+        Cheap enough (a few thousand titles) to rerun on every publish, so the
+        duplicate that wins is always the one from the earliest source in
+        config order, however the fetches finished.
+        """
+        all_headlines = []
+        expired = {}
+        now = time.time()
+        with self._results_lock:
+            for source_name in self.source_names():
+                headlines = self.source_results.get(source_name)
+                if not headlines:
+                    continue
+                age = now - self.result_fetched_at.get(source_name, now)
+                if age > self.result_max_ages.get(source_name, self.result_max_age):
+                    del self.source_results[source_name]
+                    self.result_fetched_at.pop(source_name, None)
+                    expired[source_name] = (len(headlines), age)
+                    continue
+                all_headlines.extend(headlines)
+        for source_name, (count, age) in expired.items():
+            print(f"  ⌛ Dropped {count} headlines from {source_name}: last fetched {age / 3600:.1f}h ago")
+        if verbose:
+            print("=" * 70)
+            print(f"Total headlines collected: {len(all_headlines)}")
+            print("=" * 70)
+
+        # Remove duplicates: by exact title and, alongside it, by canonical
+        # link so the RSS and scraped forms of the same article collapse
+        dedup_start = time.perf_counter()
+        seen_titles = set()
+        seen_links = {}
+        url_collapses = {}
+        unique_headlines = []
+        for headline in all_headlines:
+            title_lower = headline['title'].lower().strip()
+            if title_lower in seen_titles or len(title_lower) <= 10:
+                continue
+
+            link = headline.get('link', '')
+            if link in self._link_hashes:
+                link_hash = self._link_hashes[link]
+            else:
+                link_hash = self._link_hashes[link] = canonical_link_hash(link)
+            if link_hash is not None:
+                kept_source = seen_links.get(link_hash)
+                if kept_source is not None:
+                    pair = (kept_source, headline['source'])
+                    url_collapses[pair] = url_collapses.get(pair, 0) + 1
+                    continue
+                seen_links[link_hash] = headline['source']
+
+            seen_titles.add(title_lower)
+            unique_headlines.append(headline)
+
+        self.url_collapses = url_collapses
+        if verbose:
+            print(f"Unique headlines after deduplication: {len(unique_headlines)}")
+        if verbose and url_collapses:
+            print(f"Same article under different links: {sum(url_collapses.values())}")
+            for (kept_source, dropped_source), count in sorted(url_collapses.items(), key=lambda x: x[1], reverse=True):
+                print(f"  {dropped_source} → {kept_source}: {count}")
+
+        unique_headlines = self.merge_near_duplicates(unique_headlines, verbose)
+        DEDUP_SECONDS.observe(time.perf_counter() - dedup_start)
+        if verbose:
+            # Partial publishes dedupe too; the gauges describe whole cycles
+            DEDUP_INPUT.set(len(all_headlines))
+            DEDUP_OUTPUT.set(len(unique_headlines))
+            DEDUP_RATIO.set(len(unique_headlines) / len(all_headlines) if all_headlines else 1.0)
+            print()
 
-        except Exception as e:
-            print(f"    Error: {str(e)}")
+        return unique_headlines
 
-        return headlines
+    def merge_near_duplicates(self, headlines, verbose=True):
+        """Drop headlines that are near-duplicates of an earlier one, keeping the first"""
+        index = self.near_duplicate_index
+        kept = []
+        kept_positions = {}  # index item id -> position in kept
+        groups = {}
+        for headline in headlines:
+            item_id = index.add(headline['title'])
+            match = None if item_id is None else index.best_match(item_id, kept_positions)
+            if match is None:
+                if item_id is not None:
+                    kept_positions[item_id] = len(kept)
+                kept.append(headline)
+                continue
+            representative = kept[match[0]]
+            groups.setdefault(id(representative), [representative]).append(headline)
+
+        self.near_duplicate_groups = list(groups.values())
+        merged = len(headlines) - len(kept)
+        if not verbose:
+            return kept
+        print(f"Near-duplicates merged: {merged} (in {len(groups)} groups, "
+              f"threshold {self.near_duplicate_threshold:.2f})")
+        for group in self.near_duplicate_groups:
+            print(f"  ≈ [{group[0]['source']}] {group[0]['title'][:70]}")
+            for duplicate in group[1:]:
+                print(f"      merged [{duplicate['source']}] {duplicate['title'][:70]}")
+        print(f"Headlines after near-duplicate merge: {len(kept)}")
+        return kept
+
+# ---------------- Headline Store ----------------
+# Every cycle's deduped headlines are upserted into a local SQLite database so
+# the page (and any other reader) works from one durable, indexed source that
+# survives restarts and is shared between processes.
+HEADLINE_DB_PATH = os.environ.get(
+    "HEADLINE_DB_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'headlines.db'),
+)
+
+HEADLINE_COLUMNS = ('title', 'link', 'source', 'published', 'published_at', 'description', 'first_seen', 'fetched_at')
+
+class HeadlineStore:
+    """SQLite-backed (WAL mode) store of every headline seen, keyed by link"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS cycles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            finished_at REAL NOT NULL,
+            headline_count INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS headlines (
+            key TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            link TEXT NOT NULL,
+            source TEXT NOT NULL,
+            published TEXT,
+            published_at REAL,
+            description TEXT,
+            first_seen REAL NOT NULL,
+            fetched_at REAL NOT NULL,
+            cycle INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            changed_cycle INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS idx_headlines_link ON headlines(link);
+        CREATE INDEX IF NOT EXISTS idx_headlines_source ON headlines(source);
+        CREATE INDEX IF NOT EXISTS idx_headlines_fetched_at ON headlines(fetched_at);
+        CREATE INDEX IF NOT EXISTS idx_headlines_cycle ON headlines(cycle, position);
+    """
+    # Columns added since the first schema, with what existing rows get
+    MIGRATIONS = (
+        ('published_at', 'REAL', 'UPDATE headlines SET published_at = first_seen'),
+        ('changed_cycle', 'INTEGER', 'UPDATE headlines SET changed_cycle = cycle'),
+    )
+    INDEXES = """
+        CREATE INDEX IF NOT EXISTS idx_headlines_published_at ON headlines(published_at);
+    """
 
-    def scrape_nse(self, url):
-        """Scrape NSE India"""
-        headlines = []
+    def __init__(self, path=HEADLINE_DB_PATH):
+        self.path = path
+        self._initialized = False
+        # The first connection may be opened from off_hub() (see main)
+        self._init_lock = native_lock()
+
+    def _connect(self):
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                    conn = sqlite3.connect(self.path, timeout=30)
+                    try:
+                        conn.execute('PRAGMA journal_mode=WAL')
+                        conn.executescript(self.SCHEMA)
+                        self._migrate(conn)
+                        conn.executescript(self.INDEXES)
+                    finally:
+                        conn.close()
+                    self._initialized = True
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _migrate(self, conn):
+        """Add any MIGRATIONS column a database from an older version is missing"""
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(headlines)')}
+        for column, column_type, backfill in self.MIGRATIONS:
+            if column not in columns:
+                with conn:
+                    conn.execute(f'ALTER TABLE headlines ADD COLUMN {column} {column_type}')
+                    conn.execute(backfill)
+                print(f"  ✓ Headline store: added {column}")
+
+    @staticmethod
+    def headline_key(headline):
+        """Canonical link for real URLs; titles stand in for placeholder links like '#'"""
+        canonical = canonical_url(headline.get('link', ''))
+        if canonical is not None:
+            return canonical
+        return 'title:' + headline['title'].lower().strip()
+
+    def record_cycle(self, headlines, fetched_at=None):
+        """Upsert one cycle's headlines in order and return the new cycle id"""
+        fetched_at = fetched_at or time.time()
+        conn = self._connect()
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            # NSE often requires specific handling
-            articles = soup.find_all(['h2', 'h3', 'h4'])
-            for article in articles:
-                link_tag = article.find('a')
-                if link_tag:
-                    title = link_tag.get_text(strip=True)
-                    link = link_tag.get('href', '')
-
-                    if link and not link.startswith('http'):
-                        link = 'https://www.nseindia.com' + link
-
-                    if title and len(title) > 15:
-                        headlines.append({
-                            'title': title,
-                            'link': link,
-                            'source': 'NSE India News',
-                            'published': 'Recent',
-                            'description': ''
-                        })
-
-                if len(headlines) >= 10:
-                    break
-
-        except Exception as e:
-            print(f"    Error: {str(e)}")
-
-        return headlines
+            with conn:
+                cycle = conn.execute(
+                    'INSERT INTO cycles (finished_at, headline_count) VALUES (?, ?)',
+                    (fetched_at, len(headlines)),
+                ).lastrowid
+                # first_seen is kept on conflict; if two headlines in the same
+                # cycle share a key, the first one (in dedup order) wins.
+                # published_at never runs past first_seen, so a headline that
+                # only has a first-fetch time keeps the earliest one recorded.
+                # changed_cycle only moves when the searchable text changes.
+                conn.executemany(
+                    """
+                    INSERT INTO headlines
+                        (key, title, link, source, published, published_at, description,
+                         first_seen, fetched_at, cycle, position, changed_cycle)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(key) DO UPDATE SET
+                        changed_cycle = CASE
+                            WHEN headlines.title IS excluded.title
+                                AND headlines.description IS excluded.description
+                            THEN headlines.changed_cycle ELSE excluded.cycle END,
+                        title = excluded.title,
+                        link = excluded.link,
+                        source = excluded.source,
+                        published = excluded.published,
+                        published_at = MIN(excluded.published_at, headlines.first_seen),
+                        description = excluded.description,
+                        fetched_at = excluded.fetched_at,
+                        cycle = excluded.cycle,
+                        position = excluded.position
+                    WHERE headlines.cycle != excluded.cycle
+                    """,
+                    [
+                        (
+                            self.headline_key(h), h['title'], h.get('link', '#'), h['source'],
+                            h.get('published', 'Recent'), min(h.get('published_at') or fetched_at, fetched_at),
+                            h.get('description', ''), fetched_at, fetched_at, cycle, position, cycle,
+                        )
+                        for position, h in enumerate(headlines)
+                    ],
+                )
+            return cycle
+        finally:
+            conn.close()
+
+    def _rows(self, sql, params=()):
+        conn = self._connect()
+        try:
+            return [
+                {column: row[column] for column in HEADLINE_COLUMNS}
+                for row in conn.execute(sql, params)
+            ]
+        finally:
+            conn.close()
+
+    def current_headlines(self):
+        """Headlines from the most recent cycle, in dedup order"""
+        return self._rows(
+            f"""
+            SELECT {', '.join(HEADLINE_COLUMNS)} FROM headlines
+            WHERE cycle = (SELECT MAX(id) FROM cycles)
+            ORDER BY position
+            """
+        )
+
+    def history(self, source=None, since=None, limit=100, published_since=None):
+        """Most recently fetched headlines, optionally for one source, fetched or published after a timestamp"""
+        clauses, params = [], []
+        if source is not None:
+            clauses.append('source = ?')
+            params.append(source)
+        if since is not None:
+            clauses.append('fetched_at >= ?')
+            params.append(since)
+        if published_since is not None:
+            clauses.append('published_at >= ?')
+            params.append(published_since)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        params.append(limit)
+        return self._rows(
+            f"""
+            SELECT {', '.join(HEADLINE_COLUMNS)} FROM headlines {where}
+            ORDER BY fetched_at DESC, position LIMIT ?
+            """,
+            params,
+        )
+
+    def headlines_since(self, cycle):
+        """(cycle, changed_cycle, key, headline) for every row last written after the given cycle id
+
+        changed_cycle is the cycle that last changed the row's title or description.
+        """
+        conn = self._connect()
+        try:
+            return [
+                (row['cycle'], row['changed_cycle'], row['key'],
+                 {column: row[column] for column in HEADLINE_COLUMNS})
+                for row in conn.execute(
+                    f"SELECT cycle, changed_cycle, key, {', '.join(HEADLINE_COLUMNS)} FROM headlines "
+                    "WHERE cycle > ? ORDER BY cycle, position",
+                    (cycle,),
+                )
+            ]
+        finally:
+            conn.close()
+
+headline_store = HeadlineStore()
+
+# ---------------- Warm-start Snapshot ----------------
+# After each successful cycle the deduped headlines are written to a small
+# gzipped JSON snapshot. On boot it is rendered straight away (marked stale)
+# so the first request after a spin-down gets real headlines instead of the
+# loading page while the background refresh runs.
+SNAPSHOT_PATH = os.environ.get(
+    "SNAPSHOT_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'snapshot.json.gz'),
+)
+SNAPSHOT_VERSION = 1
+
+def write_snapshot(headlines, generated_at, path=SNAPSHOT_PATH, fetched_at=None):
+    """Atomically write headlines to a versioned, gzipped JSON snapshot
+
+    fetched_at maps a source to when its headlines were fetched, so a
+    source's saved result does not look fresh again after every restart.
+    """
+    payload = json.dumps(
+        {'version': SNAPSHOT_VERSION, 'generated_at': generated_at, 'headlines': headlines,
+         'fetched_at': fetched_at or {}},
+        ensure_ascii=False,
+        separators=(',', ':'),
+    ).encode('utf-8')
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(gzip.compress(payload, compresslevel=6))
+    os.replace(tmp_path, path)
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    """Return (headlines, generated_at, fetched_at) from the snapshot, or None if missing or unusable
+
+    fetched_at maps each source in it to when its headlines were fetched
+    (generated_at for snapshots written before that was recorded).
+    """
+    try:
+        with open(path, 'rb') as f:
+            snapshot = json.loads(gzip.decompress(f.read()))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"  ✗ Ignoring unreadable snapshot {path}: {str(e)}")
+        return None
+
+    if snapshot.get('version') != SNAPSHOT_VERSION or not snapshot.get('headlines'):
+        return None
+    generated_at = snapshot['generated_at']
+    saved_times = snapshot.get('fetched_at') or {}
+    fetched_at = {headline['source']: saved_times.get(headline['source'], generated_at)
+                  for headline in snapshot['headlines']}
+    return snapshot['headlines'], generated_at, fetched_at
+
+# ---------------- Categories & Headline Index ----------------
+# Sources are grouped into categories by name: a source belongs to every
+# category with an entry that is a substring of its name.
+CATEGORIES = {
+    'International Markets': ['Bloomberg', 'Reuters', 'Financial Times', 'Wall Street Journal', 'MarketWatch', 'CNBC', 'CNN Business', 'Fox Business', 'Yahoo Finance', 'Seeking Alpha', 'Investing.com', 'Forbes Money', 'The Motley Fool', 'Barrons', "Investor's Business Daily"],
+    'Indian Markets': ['Economic Times', 'Business Standard', 'Mint', 'Moneycontrol', 'Business Today', 'Financial Express', 'NSE India News', 'BSE India', 'Zerodha Varsity'],
+    'Crypto & Fintech': ['CoinDesk', 'TechCrunch Fintech'],
+    'Commodities': ['Kitco Gold News', 'Oil Price']
+}
+
+CATEGORY_ICONS = {
+    'International Markets': '🌍',
+    'Indian Markets': '🇮🇳',
+    'Crypto & Fintech': '₿',
+    'Banking & Finance': '🏦',
+    'Commodities': '📦'
+}
+
+@lru_cache(maxsize=256)
+def source_categories(source):
+    """Categories a source belongs to, in CATEGORIES order"""
+    return tuple(
+        category for category, sources_in_category in CATEGORIES.items()
+        if any(s in source for s in sources_in_category)
+    )
+
+API_DEFAULT_LIMIT = 50
+API_MAX_LIMIT = 200
+
+def generation_id(generated_at):
+    """Identifier shared by a cycle's page, API index and live-update events"""
+    return str(int(generated_at * 1000))
+
+class HeadlineIndex:
+    """One cycle's headlines with per-category/per-source position lists and cached JSON
+
+    Built once per published generation. Each headline is serialized to JSON
+    once at build time; API responses are assembled by joining those strings
+    and are themselves cached for the lifetime of the generation. Positions
+    are also kept sorted by publish time, newest first, so "since T" is a
+    bisect and a slice. Cursors name the last headline they returned, so one
+    from an earlier generation resumes after that headline in this one.
+    """
 
-    def scrape_bse(self, url):
-        """Scrape BSE India"""
-        headlines = []
+    RESPONSE_CACHE_SIZE = 512
+
+    def __init__(self, headlines, generated_at, stale=False):
+        self.headlines = headlines
+        self.generated_at = generated_at
+        self.generation = generation_id(generated_at)
+        self.stale = stale
+        self.by_category = {category: [] for category in CATEGORIES}
+        self.by_source = {}
+        self.position_of = {}
+        self._item_json = []
+        # Headlines saved before publish times were recorded count as this generation's
+        published_at = [headline.get('published_at') or generated_at for headline in headlines]
+        self.published_at = published_at
+        for position, headline in enumerate(headlines):
+            # Links are unique on a page apart from placeholders like '#',
+            # which resolve to their first card
+            self.position_of.setdefault(headline.get('link', '#'), position)
+            self.by_source.setdefault(headline['source'], []).append(position)
+            for category in source_categories(headline['source']):
+                self.by_category[category].append(position)
+            item = {key: headline.get(key) for key in HEADLINE_COLUMNS if key in headline}
+            item['published_at'] = published_at[position]
+            item['categories'] = list(source_categories(headline['source']))
+            self._item_json.append(json.dumps(item, ensure_ascii=False, separators=(',', ':')))
+        # Newest first (page order among equal times), with the negated times
+        # alongside in ascending order for bisect
+        self.by_time = sorted(range(len(headlines)), key=lambda p: -published_at[p])
+        self._by_time_keys = array('d', (-published_at[p] for p in self.by_time))
+        self._responses = {}
+        self._responses_lock = threading.Lock()
+
+    def positions(self, category=None, source=None, since=None, order='page'):
+        """Positions matching the filters and published at or after since, in page or 'newest' order"""
+        if since is None and order == 'page':
+            return self._filtered(category, source)
+        matching = self.by_time
+        if since is not None:
+            matching = matching[:bisect_right(self._by_time_keys, -since)]
+        if category is not None or source is not None:
+            allowed = set(self._filtered(category, source))
+            matching = [p for p in matching if p in allowed]
+        return sorted(matching) if order == 'page' else matching
+
+    def _filtered(self, category, source):
+        if category is None and source is None:
+            return range(len(self.headlines))
+        if category is not None and source is not None:
+            in_source = set(self.by_source.get(source, ()))
+            return [p for p in self.by_category.get(category, ()) if p in in_source]
+        if category is not None:
+            return self.by_category.get(category, [])
+        return self.by_source.get(source, [])
+
+    def encode_cursor(self, offset, since, last_position):
+        # A time window travels with the cursor, so ?minutes= pages do not
+        # shift as the window slides between requests. The last headline's
+        # publish time and link (which may contain ':') come last.
+        last_link = self.headlines[last_position].get('link', '#')
+        token = ':'.join((self.generation, str(offset), '' if since is None else repr(since),
+                          repr(self.published_at[last_position]), last_link))
+        return base64.urlsafe_b64encode(token.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        """(generation, offset, since, last published_at, last link) in cursor; ValueError if malformed"""
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            articles = soup.find_all('a', href=True)
-            for article in articles:
-                title = article.get_text(strip=True)
-                link = article.get('href', '')
-
-                if link and not link.startswith('http'):
-                    link = 'https://www.bseindia.com' + link
-
-                if (
-                    title and len(title) > 20 and
-                    'bseindia.com' in link
-                ):
-                    headlines.append({
-                        'title': title,
-                        'link': link,
-                        'source': 'BSE India',
-                        'published': 'Recent',
-                        'description': ''
-                    })
-
-                if len(headlines) >= 10:
-                    break
+            padded = cursor + '=' * (-len(cursor) % 4)
+            generation, offset, since, last_published_at, last_link = \
+                base64.urlsafe_b64decode(padded).decode().split(':', 4)
+            offset = int(offset)
+            since = float(since) if since else None
+            last_published_at = float(last_published_at)
+        except Exception:
+            raise ValueError('malformed cursor')
+        if offset < 0:
+            raise ValueError('malformed cursor')
+        return generation, offset, since, last_published_at, last_link
+
+    def resume_offset(self, positions, order, cursor):
+        """Offset into positions just after the headline a cursor from any generation ended on"""
+        generation, offset, _, last_published_at, last_link = cursor
+        if generation == self.generation:
+            return offset
+        last_position = self.position_of.get(last_link)
+        if order == 'newest':
+            # Sorted by (-published_at, position); a headline no longer here
+            # resumes at the first one published at or before it
+            if last_position is None:
+                return bisect_left(positions, -last_published_at, key=lambda p: -self.published_at[p])
+            return bisect_right(positions, (-self.published_at[last_position], last_position),
+                                key=lambda p: (-self.published_at[p], p))
+        if last_position is None:
+            # Page order has no place for a headline that is gone; keep the count
+            return min(offset, len(positions))
+        return bisect_right(positions, last_position)
+
+    def page_json(self, category=None, source=None, limit=API_DEFAULT_LIMIT, cursor=None,
+                  since=None, order='page'):
+        """(serialized response body, whether it has a next_cursor) for one page; ValueError on a bad cursor
+
+        A cursor's own time window replaces since. Time-windowed pages are
+        not cached: a ?minutes= window is different on every request.
+        """
+        key = (category, source, limit, cursor, order)
+        cacheable = since is None
+        if cacheable:
+            response = self._responses.get(key)
+            if response is not None:
+                return response
+
+        decoded = None
+        if cursor:
+            decoded = self.decode_cursor(cursor)
+            if decoded[2] is not None:
+                since = decoded[2]
+                cacheable = False
+        positions = self.positions(category, source, since, order)
+        offset = self.resume_offset(positions, order, decoded) if decoded else 0
+        page = positions[offset:offset + limit]
+        next_offset = offset + len(page)
+        next_cursor = None
+        if page and next_offset < len(positions):
+            next_cursor = self.encode_cursor(next_offset, since, page[-1])
+        body = (
+            '{"generation":' + json.dumps(self.generation)
+            + ',"generated_at":' + json.dumps(self.generated_at)
+            + ',"stale":' + json.dumps(self.stale)
+            + ',"since":' + json.dumps(since)
+            + ',"total":' + str(len(positions))
+            + ',"next_cursor":' + json.dumps(next_cursor)
+            + ',"items":[' + ','.join(self._item_json[p] for p in page) + ']}'
+        ).encode('utf-8')
+        response = (body, next_cursor is not None)
+
+        if cacheable:
+            with self._responses_lock:
+                if len(self._responses) >= self.RESPONSE_CACHE_SIZE:
+                    self._responses.clear()
+                self._responses[key] = response
+        return response
+
+# The index for the generation currently being served; replaced wholesale
+# (a single reference swap) whenever a new page is published.
+current_headline_index = None
+
+def publish_headline_index(headlines, generated_at, stale=False):
+    global current_headline_index
+    previous = current_headline_index
+    current_headline_index = HeadlineIndex(headlines, generated_at, stale)
+    # Open dashboards are sent whatever this generation added (see Live Updates)
+    announce_new_headlines(previous, current_headline_index)
+    return current_headline_index
+
+# ---------------- Search ----------------
+SEARCH_TITLE_WEIGHT = 2
+
+# Words, plus ticker-style tokens such as $AAPL, BRK.B, S&P and M&M
+_SEARCH_TOKEN_RE = re.compile(r"\$?[^\W_]+(?:[.&][^\W_]+)*")
+
+def fold_accents(text):
+    """Lowercase text and strip combining accents (é -> e)"""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+def search_tokens(text):
+    """Tokens for the search index: folded words, with tickers kept whole and also split"""
+    tokens = []
+    for token in _SEARCH_TOKEN_RE.findall(fold_accents(text)):
+        tokens.append(token)
+        bare = token.lstrip('$')
+        if bare != token:
+            tokens.append(bare)
+        if '.' in bare or '&' in bare:
+            tokens.extend(part for part in re.split(r'[.&]', bare) if len(part) > 1)
+    return tokens
+
+class SearchIndex:
+    """Inverted index over every stored headline, ranked with BM25
+
+    Titles count SEARCH_TITLE_WEIGHT times as much as descriptions. Postings
+    hold each document's precomputed BM25 term weight, so a query only sums
+    idf * weight. sync() reads rows written since the last synced cycle and
+    re-tokenizes only those whose title or description changed, so refreshing
+    the index costs the number of new or edited headlines, not the page or
+    corpus size (plus a reweighting pass if the average length drifts).
+    Unchanged rows keep their place in the postings, which therefore stay in
+    the order headlines first appeared (or were last edited).
+    """
 
-        except Exception as e:
-            print(f"    Error: {str(e)}")
+    K1 = 1.2
+    B = 0.75
+    REWEIGHT_DRIFT = 0.05
 
-        return headlines
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings = {}
+        self._docs = {}
+        self._total_length = 0
+        self._weight_average_length = None
+        self.last_cycle = 0
+
+    def __len__(self):
+        return len(self._docs)
+
+    def _weight(self, frequency, length):
+        norm = self.K1 * (1 - self.B + self.B * length / self._weight_average_length)
+        return frequency * (self.K1 + 1) / (frequency + norm)
+
+    def _remove(self, key):
+        doc = self._docs.pop(key, None)
+        if doc is None:
+            return
+        for term in doc['terms']:
+            postings = self._postings[term]
+            del postings[key]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= doc['length']
+
+    def _reweight_if_drifted(self):
+        if not self._docs:
+            return
+        average_length = self._total_length / len(self._docs)
+        if abs(average_length - self._weight_average_length) <= self.REWEIGHT_DRIFT * self._weight_average_length:
+            return
+        self._weight_average_length = average_length
+        for key, doc in self._docs.items():
+            for term, frequency in doc['terms'].items():
+                self._postings[term][key] = self._weight(frequency, doc['length'])
+
+    def add(self, key, headline):
+        """Index (or re-index) one headline under its store key"""
+        terms = {}
+        for token in search_tokens(headline['title']):
+            terms[token] = terms.get(token, 0) + SEARCH_TITLE_WEIGHT
+        for token in search_tokens(headline.get('description') or ''):
+            terms[token] = terms.get(token, 0) + 1
+        length = sum(terms.values())
+
+        with self._lock:
+            self._remove(key)
+            if self._weight_average_length is None:
+                self._weight_average_length = max(length, 1)
+            self._docs[key] = {'headline': headline, 'terms': terms, 'length': length}
+            self._total_length += length
+            # Re-added keys land at the end of each postings dict, so postings
+            # stay ordered oldest to newest
+            for term, frequency in terms.items():
+                self._postings.setdefault(term, {})[key] = self._weight(frequency, length)
+
+    def sync(self, store):
+        """Index headlines the store has added or edited since the last sync; return the count"""
+        rows = store.headlines_since(self.last_cycle)
+        indexed = 0
+        with self._lock:
+            for cycle, changed_cycle, key, headline in rows:
+                doc = self._docs.get(key)
+                if doc is None or changed_cycle > self.last_cycle:
+                    self.add(key, headline)
+                    indexed += 1
+                else:
+                    # Same text: only the fields returned with results move on
+                    doc['headline'] = headline
+            self.last_cycle = max([self.last_cycle] + [row[0] for row in rows])
+            self._reweight_if_drifted()
+        return indexed
+
+    def search(self, query, limit=20, offset=0):
+        """Return (total matches, ranked page of (score, headline)) for a free-text query"""
+        terms = list(dict.fromkeys(search_tokens(query)))
+        with self._lock:
+            doc_count = len(self._docs)
+            matched = [self._postings[term] for term in terms if term in self._postings]
+            if not matched:
+                return 0, []
+
+            def idf(postings):
+                return math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+
+            # Iterating newest-first makes equal scores rank the newer headline
+            # higher (nlargest is stable)
+            if len(matched) == 1:
+                weight = idf(matched[0])
+                candidates = reversed(matched[0].items())
+                total = len(matched[0])
+            else:
+                scores = {}
+                for postings in matched:
+                    term_idf = idf(postings)
+                    for key, term_weight in reversed(postings.items()):
+                        scores[key] = scores.get(key, 0.0) + term_idf * term_weight
+                weight = 1.0
+                candidates = scores.items()
+                total = len(scores)
+
+            top = heapq.nlargest(offset + limit, candidates, key=itemgetter(1))
+            page = [(score * weight, self._docs[key]['headline']) for key, score in top[offset:]]
+        return total, page
+
+search_index = SearchIndex()
+
+# ---------------- Dashboard Assets ----------------
+# The dashboard's stylesheet and script are written once as separate files
+# named by a hash of their content, so browsers cache them indefinitely and
+# only the (much smaller) page itself is refetched after each refresh.
+DASHBOARD_CSS = """
+* {
+    margin: 0;
+    padding: 0;
+    box-sizing: border-box;
+}
+
+body {
+    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+    background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
+    min-height: 100vh;
+    padding: 20px;
+    padding-bottom: 40px;
+}
+
+.container {
+    max-width: 1400px;
+    margin: 0 auto;
+    background: white;
+    border-radius: 15px;
+    box-shadow: 0 20px 60px rgba(0,0,0,0.3);
+    overflow: hidden;
+    margin-bottom: 20px;
+}
+
+.header {
+    background: linear-gradient(135deg, #0f2027 0%, #203a43 50%, #2c5364 100%);
+    color: white;
+    padding: 35px 30px;
+    text-align: center;
+    position: relative;
+    overflow: hidden;
+}
+
+.header::before {
+    content: '💹';
+    position: absolute;
+    font-size: 200px;
+    opacity: 0.1;
+    right: -50px;
+    top: -50px;
+}
+
+.header h1 {
+    font-size: 2.5em;
+    margin-bottom: 10px;
+    text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
+    position: relative;
+    line-height: 1.3;
+}
+
+.header p {
+    font-size: 1.3em;
+    opacity: 0.95;
+    position: relative;
+}
+
+.market-ticker {
+    background: #000;
+    color: #0f0;
+    padding: 15px;
+    font-family: 'Courier New', monospace;
+    overflow: hidden;
+    border-bottom: 2px solid #0f0;
+}
+
+.ticker-content {
+    display: inline-block;
+    white-space: nowrap;
+    animation: scroll 30s linear infinite;
+}
+
+@keyframes scroll {
+    0% { transform: translateX(100%); }
+    100% { transform: translateX(-100%); }
+}
+
+.stats {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+    gap: 20px;
+    background: #f8f9fa;
+    padding: 30px;
+    border-bottom: 2px solid #e9ecef;
+}
+
+.stat-item {
+    text-align: center;
+    padding: 20px;
+    background: white;
+    border-radius: 10px;
+    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+    transition: transform 0.3s ease;
+}
+
+.stat-item:hover {
+    transform: translateY(-5px);
+}
+
+.stat-number {
+    font-size: 2.5em;
+    font-weight: bold;
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    -webkit-background-clip: text;
+    -webkit-text-fill-color: transparent;
+    background-clip: text;
+}
+
+.stat-label {
+    font-size: 0.95em;
+    color: #666;
+    margin-top: 8px;
+    text-transform: uppercase;
+    letter-spacing: 1px;
+}
+
+.timestamp {
+    background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
+    padding: 15px;
+    text-align: center;
+    color: white;
+    font-size: 1em;
+    font-weight: 600;
+    border-bottom: 2px solid #f5576c;
+}
+
+.filters {
+    padding: 25px 30px;
+    background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%);
+    border-bottom: 1px solid #dee2e6;
+}
+
+.filter-search {
+    margin-bottom: 20px;
+}
+
+.filter-search input {
+    width: 100%;
+    padding: 15px 25px;
+    border: 3px solid #2c5364;
+    border-radius: 30px;
+    font-size: 1.05em;
+    outline: none;
+    transition: all 0.3s ease;
+    background: white;
+}
+
+.filter-search input:focus {
+    box-shadow: 0 0 20px rgba(44, 83, 100, 0.4);
+    border-color: #1e3c72;
+}
+
+.category-filters,
+.time-filters {
+    margin-bottom: 15px;
+}
+
+.category-btn,
+.time-btn {
+    padding: 10px 20px;
+    margin: 5px;
+    border: 2px solid #2c5364;
+    background: white;
+    color: #2c5364;
+    border-radius: 25px;
+    cursor: pointer;
+    transition: all 0.3s ease;
+    font-weight: 600;
+    font-size: 0.9em;
+}
+
+.category-btn:hover,
+.time-btn:hover {
+    background: #2c5364;
+    color: white;
+    transform: scale(1.05);
+}
+
+.category-btn.active,
+.time-btn.active {
+    background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
+    color: white;
+    border-color: #1e3c72;
+}
+
+.filter-buttons {
+    display: flex;
+    flex-wrap: wrap;
+    gap: 10px;
+    max-height: 250px;
+    overflow-y: auto;
+    padding: 10px;
+    background: white;
+    border-radius: 10px;
+}
+
+.filter-btn {
+    padding: 8px 18px;
+    border: 2px solid #667eea;
+    background: white;
+    color: #667eea;
+    border-radius: 20px;
+    cursor: pointer;
+    transition: all 0.3s ease;
+    font-size: 0.85em;
+    white-space: nowrap;
+    font-weight: 500;
+}
+
+.filter-btn:hover {
+    background: #667eea;
+    color: white;
+    transform: scale(1.05);
+}
+
+.filter-btn.active {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    border-color: #667eea;
+}
+
+.content {
+    padding: 30px;
+    background: #f8f9fa;
+    min-height: 400px;
+    margin-bottom: 0;
+}
+
+.category-section {
+    margin-bottom: 50px;
+    page-break-inside: avoid;
+}
+
+.category-header {
+    background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
+    color: white;
+    padding: 20px 30px;
+    border-radius: 10px;
+    margin-bottom: 25px;
+    box-shadow: 0 5px 15px rgba(0,0,0,0.2);
+}
+
+.category-title {
+    font-size: 1.8em;
+    font-weight: bold;
+    display: flex;
+    align-items: center;
+    gap: 15px;
+}
+
+.source-section {
+    margin-bottom: 40px;
+    background: white;
+    padding: 25px;
+    border-radius: 10px;
+    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+    page-break-inside: avoid;
+}
+
+.source-header {
+    display: flex;
+    align-items: center;
+    margin-bottom: 20px;
+    padding-bottom: 15px;
+    border-bottom: 3px solid #2c5364;
+}
+
+.source-icon {
+    width: 50px;
+    height: 50px;
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    border-radius: 50%;
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    color: white;
+    font-weight: bold;
+    margin-right: 15px;
+    font-size: 1.3em;
+    box-shadow: 0 3px 10px rgba(0,0,0,0.2);
+}
+
+.source-name {
+    font-size: 1.5em;
+    font-weight: bold;
+    color: #2c3e50;
+}
+
+.source-count {
+    margin-left: auto;
+    background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
+    color: white;
+    padding: 8px 20px;
+    border-radius: 25px;
+    font-size: 0.9em;
+    font-weight: 600;
+    box-shadow: 0 2px 8px rgba(0,0,0,0.2);
+}
+
+.headlines-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fill, minmax(350px, 1fr));
+    gap: 20px;
+}
+
+.headline-card {
+    background: white;
+    border: 2px solid #e9ecef;
+    border-radius: 12px;
+    padding: 25px;
+    transition: all 0.3s ease;
+    position: relative;
+    overflow: hidden;
+    box-shadow: 0 2px 8px rgba(0,0,0,0.05);
+}
+
+.headline-card::before {
+    content: '';
+    position: absolute;
+    left: 0;
+    top: 0;
+    height: 100%;
+    width: 5px;
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    transform: scaleY(0);
+    transition: transform 0.3s ease;
+}
+
+.headline-card:hover {
+    border-color: #667eea;
+    box-shadow: 0 8px 25px rgba(102, 126, 234, 0.3);
+    transform: translateY(-5px);
+}
+
+.headline-card:hover::before {
+    transform: scaleY(1);
+}
+
+.headline-card.headline-new {
+    animation: headline-new 4s ease-out;
+}
+
+@keyframes headline-new {
+    from { background: #fff8d6; border-color: #f5c542; }
+    to { background: white; border-color: #e9ecef; }
+}
+
+.headline-card a {
+    text-decoration: none;
+    color: #2c3e50;
+    display: block;
+}
+
+.headline-title {
+    font-size: 1.15em;
+    line-height: 1.6;
+    margin-bottom: 12px;
+    font-weight: 600;
+    color: #1a1a1a;
+}
+
+.headline-card:hover .headline-title {
+    color: #667eea;
+}
+
+.headline-description {
+    font-size: 0.9em;
+    color: #666;
+    line-height: 1.5;
+    margin-bottom: 12px;
+}
+
+.headline-meta {
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    font-size: 0.85em;
+    color: #6c757d;
+    margin-top: 15px;
+    padding-top: 12px;
+    border-top: 1px solid #e9ecef;
+}
+
+.published-date {
+    font-style: italic;
+    display: flex;
+    align-items: center;
+    gap: 5px;
+}
+
+.read-more {
+    color: #667eea;
+    font-weight: 700;
+    text-transform: uppercase;
+    font-size: 0.8em;
+    letter-spacing: 1px;
+}
+
+.no-headlines {
+    text-align: center;
+    padding: 80px 20px;
+    color: #666;
+}
+
+.no-headlines-icon {
+    font-size: 5em;
+    margin-bottom: 20px;
+}
+
+.footer {
+    background: linear-gradient(135deg, #0f2027 0%, #203a43 50%, #2c5364 100%);
+    color: white;
+    padding: 40px 30px;
+    text-align: center;
+    position: relative;
+    z-index: 1;
+}
+
+.footer h3 {
+    font-size: 1.5em;
+    margin-bottom: 20px;
+}
+
+.source-list {
+    margin: 25px 0;
+    font-size: 0.9em;
+    opacity: 0.9;
+    line-height: 2;
+}
+
+.footer-links {
+    margin-top: 20px;
+    padding-top: 20px;
+    border-top: 1px solid rgba(255,255,255,0.2);
+}
+
+.footer-link {
+    color: #667eea;
+    text-decoration: none;
+    margin: 0 15px;
+    font-weight: 600;
+}
+
+.footer-link:hover {
+    text-decoration: underline;
+    color: #764ba2;
+}
+
+@media (max-width: 768px) {
+    .headlines-grid {
+        grid-template-columns: 1fr;
+    }
 
-    def scrape_zerodha(self, url):
-        """Scrape Zerodha Varsity"""
-        headlines = []
-        try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            articles = soup.find_all(['h2', 'h3'])
-            for article in articles:
-                link_tag = article.find('a')
-                if link_tag:
-                    title = link_tag.get_text(strip=True)
-                    link = link_tag.get('href', '')
-
-                    if link and not link.startswith('http'):
-                        link = 'https://zerodha.com' + link
-
-                    if title and len(title) > 15:
-                        headlines.append({
-                            'title': title,
-                            'link': link,
-                            'source': 'Zerodha Varsity',
-                            'published': 'Recent',
-                            'description': ''
-                        })
-
-                if len(headlines) >= 10:
-                    break
+    .stats {
+        grid-template-columns: 1fr;
+    }
 
-        except Exception as e:
-            print(f"    Error: {str(e)}")
+    .header h1 {
+        font-size: 1.5em;
+        line-height: 1.4;
+    }
 
-        return headlines
+    .header p {
+        font-size: 1em;
+    }
 
-    def fetch_all_news(self):
-        """Fetch financial news from all available sources"""
-        all_headlines = []
+    .filter-buttons {
+        max-height: 150px;
+    }
+}
+"""
 
-        print("=" * 70)
-        print(" " * 15 + "FINANCIAL NEWS AGGREGATION")
-        print("=" * 70)
-        print()
+DASHBOARD_JS = """
+let currentCategory = 'all';
+let currentSource = 'all';
+
+function filterCategory(category) {
+    currentCategory = category;
+    const sections = document.querySelectorAll('.category-section');
+    const buttons = document.querySelectorAll('.category-btn');
+
+    buttons.forEach(btn => btn.classList.remove('active'));
+    event.target.classList.add('active');
+
+    // Clear search and source filter
+    document.getElementById('searchBox').value = '';
+    clearSearch();
+    resetSourceFilters();
+    syncSourceSections();
+
+    if (category === 'all') {
+        sections.forEach(section => section.style.display = 'block');
+    } else {
+        sections.forEach(section => {
+            if (section.dataset.category === category) {
+                section.style.display = 'block';
+            } else {
+                section.style.display = 'none';
+            }
+        });
+    }
+}
+
+function filterSource(source) {
+    currentSource = source;
+    const buttons = document.querySelectorAll('.filter-btn');
+
+    buttons.forEach(btn => btn.classList.remove('active'));
+    event.target.classList.add('active');
+
+    // Clear search
+    document.getElementById('searchBox').value = '';
+    clearSearch();
+    syncSourceSections();
+}
+
+function resetSourceFilters() {
+    currentSource = 'all';
+    const buttons = document.querySelectorAll('.filter-btn');
+    buttons.forEach(btn => btn.classList.remove('active'));
+    document.querySelector('.filter-btn').classList.add('active');
+}
+
+// Search runs against the precomputed #searchData payload
+// (normalized title and description per card plus the card's
+// source-section index) instead of reading the DOM per keystroke,
+// and only cards whose visibility actually changes are touched.
+const searchData = JSON.parse(document.getElementById('searchData').textContent);
+const searchCards = searchData.t.map((_, i) => document.getElementById('c' + i));
+const searchSections = Array.from(document.querySelectorAll('.source-section'));
+const cardVisible = searchData.t.map(() => true);
+const sectionVisibleCards = searchSections.map(() => 0);
+searchData.s.forEach(section => sectionVisibleCards[section]++);
+const SEARCH_DEBOUNCE_MS = 120;
+let searchTimer = null;
+
+// Publish times: searchData.p holds each card's epoch seconds. Labels show
+// the time relative to now, refreshed every minute (the rendered UTC time
+// moves to the tooltip), and the time filter hides cards published before
+// its window, which slides along on the same tick.
+const publishedLabels = searchCards.map(card => card.querySelector('.published-date'));
+const RELATIVE_TIME_LIMIT = 7 * 86400;
+let timeWindowHours = 0;
+let publishedSince = 0;
+
+function inTimeWindow(i) {
+    return searchData.p[i] >= publishedSince;
+}
+
+function relativeTime(seconds) {
+    if (seconds < 60) return 'just now';
+    if (seconds < 3600) return Math.floor(seconds / 60) + 'm ago';
+    if (seconds < 86400) return Math.floor(seconds / 3600) + 'h ago';
+    return Math.floor(seconds / 86400) + 'd ago';
+}
+
+function updatePublishedLabel(i, now) {
+    const label = publishedLabels[i];
+    if (!label.title) label.title = label.textContent.replace('🕒 ', '');
+    const age = now - searchData.p[i];
+    const text = '🕒 ' + (age < RELATIVE_TIME_LIMIT ? relativeTime(age) : label.title);
+    if (label.textContent !== text) label.textContent = text;
+}
+
+function refreshPublishedTimes() {
+    const now = Date.now() / 1000;
+    for (let i = 0; i < publishedLabels.length; i++) {
+        updatePublishedLabel(i, now);
+    }
+    if (timeWindowHours) applyTimeWindow();
+}
+
+function applyTimeWindow() {
+    publishedSince = timeWindowHours ? Date.now() / 1000 - timeWindowHours * 3600 : 0;
+    if (document.getElementById('searchBox').value) {
+        runSearch();
+    } else {
+        clearSearch();
+        syncSourceSections();
+    }
+}
+
+function filterTime(hours) {
+    timeWindowHours = hours;
+    document.querySelectorAll('.time-btn').forEach(btn => btn.classList.remove('active'));
+    event.target.classList.add('active');
+    applyTimeWindow();
+}
+
+function normalizeSearchText(text) {
+    return text.toLowerCase().normalize('NFKD').replace(/[\\u0300-\\u036f]/g, '');
+}
+
+function setCardVisible(i, visible) {
+    if (cardVisible[i] === visible) return;
+    cardVisible[i] = visible;
+    searchCards[i].style.display = visible ? 'block' : 'none';
+    sectionVisibleCards[searchData.s[i]] += visible ? 1 : -1;
+}
+
+function clearSearch() {
+    clearTimeout(searchTimer);
+    for (let i = 0; i < cardVisible.length; i++) {
+        setCardVisible(i, inTimeWindow(i));
+    }
+}
+
+// A source section shows while it has a visible card and passes the source filter
+function syncSourceSections() {
+    searchSections.forEach((section, i) => {
+        const shown = sectionVisibleCards[i] > 0 && (currentSource === 'all' || section.dataset.source === currentSource);
+        const display = shown ? 'block' : 'none';
+        if (section.style.display !== display) section.style.display = display;
+    });
+}
+
+function searchHeadlines() {
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(runSearch, SEARCH_DEBOUNCE_MS);
+}
+
+function runSearch() {
+    const searchTerm = normalizeSearchText(document.getElementById('searchBox').value);
+    const categoryButtons = document.querySelectorAll('.category-btn');
+    const sourceButtons = document.querySelectorAll('.filter-btn');
+
+    // Reset filters (the time window stays)
+    categoryButtons.forEach(btn => btn.classList.remove('active'));
+    sourceButtons.forEach(btn => btn.classList.remove('active'));
+    currentSource = 'all';
+
+    if (searchTerm === '') {
+        clearSearch();
+        syncSourceSections();
+        document.querySelector('.category-btn').classList.add('active');
+        document.querySelector('.filter-btn').classList.add('active');
+        return;
+    }
 
-        # Fetch from RSS feeds
-        print("💰 Fetching from RSS Feeds...")
-        print("-" * 70)
-        for source_name, url in self.rss_sources.items():
-            headlines = self.fetch_rss_feed(url, source_name)
-            all_headlines.extend(headlines)
-            time.sleep(0.5)
+    const texts = searchData.t;
+    for (let i = 0; i < texts.length; i++) {
+        setCardVisible(i, texts[i].includes(searchTerm) && inTimeWindow(i));
+    }
+    syncSourceSections();
+}
+
+// Scroll to top button
+window.onscroll = function() {
+    if (document.body.scrollTop > 400 || document.documentElement.scrollTop > 400) {
+        if (!document.getElementById('scrollTopBtn')) {
+            const btn = document.createElement('button');
+            btn.id = 'scrollTopBtn';
+            btn.innerHTML = '↑';
+            btn.style.cssText = `
+                position: fixed;
+                bottom: 30px;
+                right: 30px;
+                background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
+                color: white;
+                border: none;
+                border-radius: 50%;
+                width: 55px;
+                height: 55px;
+                font-size: 26px;
+                cursor: pointer;
+                box-shadow: 0 5px 20px rgba(0,0,0,0.4);
+                z-index: 1000;
+                transition: all 0.3s ease;
+            `;
+            btn.onclick = function() {
+                window.scrollTo({ top: 0, behavior: 'smooth' });
+            };
+            btn.onmouseover = function() {
+                this.style.transform = 'scale(1.15)';
+            };
+            btn.onmouseout = function() {
+                this.style.transform = 'scale(1)';
+            };
+            document.body.appendChild(btn);
+        }
+    } else {
+        const btn = document.getElementById('scrollTopBtn');
+        if (btn) btn.remove();
+    }
+};
+
+// Live updates: new headlines arrive over /events (Server-Sent Events)
+// and are inserted into their category and source sections in place,
+// keeping the search arrays above in step. Cards already on the page
+// (same link and title) are skipped, so replays after a reconnect are safe.
+function cardKey(card) {
+    return card.querySelector('a').getAttribute('href') + ' ' + card.querySelector('.headline-title').textContent;
+}
+
+const knownCards = new Set(Array.from(document.querySelectorAll('.headline-card'), cardKey));
+
+function elementFrom(markup) {
+    const template = document.createElement('template');
+    template.innerHTML = markup.trim();
+    return template.content.firstElementChild;
+}
+
+function adjustCount(element, pattern, delta) {
+    if (!element) return;
+    element.textContent = element.textContent.replace(pattern, (_, n) => _.replace(n, parseInt(n, 10) + delta));
+}
+
+function categorySection(category, update) {
+    const existing = document.querySelector(`.category-section[data-category="${CSS.escape(category)}"]`);
+    if (existing) return existing;
+
+    // Categories keep their fixed order
+    const section = elementFrom(update.categories[category]);
+    const rank = update.order.indexOf(category);
+    const content = document.getElementById('newsContent');
+    const empty = content.querySelector('.no-headlines');
+    if (empty) empty.remove();
+    const later = Array.from(content.querySelectorAll('.category-section'))
+        .find(other => update.order.indexOf(other.dataset.category) > rank);
+    content.insertBefore(section, later || document.getElementById('searchData'));
+    if (currentCategory !== 'all' && currentCategory !== category) section.style.display = 'none';
+    return section;
+}
+
+function sourceSection(category, source, update) {
+    const parent = categorySection(category, update);
+    const existing = parent.querySelector(`.source-section[data-source="${CSS.escape(source)}"]`);
+    if (existing) return existing;
+
+    // Sources are sorted by name within a category
+    const section = elementFrom(update.sections[source]);
+    const later = Array.from(parent.querySelectorAll('.source-section')).find(other => other.dataset.source > source);
+    parent.insertBefore(section, later || null);
+    searchSections.push(section);
+    sectionVisibleCards.push(0);
+    if (currentSource !== 'all' && currentSource !== source) section.style.display = 'none';
+
+    if (!document.querySelector(`.filter-btn[data-source="${CSS.escape(source)}"]`)) {
+        const button = document.createElement('button');
+        button.className = 'filter-btn';
+        button.dataset.source = source;
+        button.textContent = `${source} (0)`;
+        button.onclick = () => filterSource(source);
+        document.getElementById('sourceFilters').appendChild(button);
+    }
+    return section;
+}
+
+function insertHeadlines(update) {
+    // Newest first: each batch goes above the cards already in a section
+    const anchors = new Map();
+    let added = 0;
+    update.headlines.forEach(item => {
+        const probe = elementFrom(item.card);
+        const key = cardKey(probe);
+        if (knownCards.has(key)) return;
+        knownCards.add(key);
+        added++;
+
+        item.categories.forEach(category => {
+            const section = sourceSection(category, item.source, update);
+            const grid = section.querySelector('.headlines-grid');
+            if (!anchors.has(grid)) anchors.set(grid, grid.firstChild);
+
+            const card = elementFrom(item.card);
+            const i = searchData.t.length;
+            card.id = 'c' + i;
+            card.classList.add('headline-new');
+            grid.insertBefore(card, anchors.get(grid));
+            searchData.t.push(item.text);
+            searchData.s.push(searchSections.indexOf(section));
+            searchData.p.push(item.published_at);
+            searchCards.push(card);
+            publishedLabels.push(card.querySelector('.published-date'));
+            updatePublishedLabel(i, Date.now() / 1000);
+            cardVisible.push(true);
+            sectionVisibleCards[searchData.s[i]]++;
+            adjustCount(section.querySelector('.source-count'), /(\\d+) articles/, 1);
+        });
+        adjustCount(document.querySelector(`.filter-btn[data-source="${CSS.escape(item.source)}"]`), /\\((\\d+)\\)$/, 1);
+    });
+    if (!added) return;
+
+    adjustCount(document.querySelector('.stat-number'), /^(\\d+)$/, added);
+    adjustCount(document.querySelector('.filter-btn'), /\\((\\d+)\\)$/, added);
+    if (document.getElementById('searchBox').value || timeWindowHours) applyTimeWindow();
+}
+
+function connectLiveUpdates() {
+    if (!window.EventSource || location.protocol === 'file:') return;
+    const stream = new EventSource('events?since=' + encodeURIComponent(searchData.g));
+    stream.addEventListener('headlines', event => insertHeadlines(JSON.parse(event.data)));
+    stream.addEventListener('reload', () => {
+        // The server could not replay what this page missed. Spread the
+        // reloads out so a restart does not refetch every open page at once.
+        stream.close();
+        setTimeout(() => location.reload(), Math.random() * 30000);
+    });
+}
+
+connectLiveUpdates();
+refreshPublishedTimes();
+setInterval(refreshPublishedTimes, 60000);
+"""
 
-        print()
-        print("🌐 Attempting to scrape additional sources...")
-        print("-" * 70)
+def _asset_name(stem, content, extension):
+    digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:12]
+    return f'{stem}.{digest}.{extension}'
+
+DASHBOARD_ASSETS = {
+    'css': ('static/' + _asset_name('dashboard', DASHBOARD_CSS, 'css'), DASHBOARD_CSS),
+    'js': ('static/' + _asset_name('dashboard', DASHBOARD_JS, 'js'), DASHBOARD_JS),
+}
+# Relative so the page also works when opened from disk next to its assets
+DASHBOARD_ASSET_URLS = {kind: path for kind, (path, _) in DASHBOARD_ASSETS.items()}
+STATIC_ASSET_MAX_AGE = 365 * 24 * 60 * 60
+
+def write_dashboard_assets(output_dir):
+    """Write the content-hashed CSS/JS files under output_dir if they are not there yet"""
+    for path, content in DASHBOARD_ASSETS.values():
+        asset_path = os.path.join(output_dir, *path.split('/'))
+        if os.path.exists(asset_path):
+            continue
+        os.makedirs(os.path.dirname(asset_path), exist_ok=True)
+        tmp_path = f"{asset_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, asset_path)
+
+def _compact_markup(template):
+    """Drop the newlines and indentation between tags of a source-formatted template"""
+    return re.sub(r'\n\s*', '', template)
+
+# Fragments repeated for every source and headline are kept readable here and
+# compacted once at import, which keeps the page (mostly cards) small.
+SOURCE_SECTION_TEMPLATE = _compact_markup("""
+    <div class="source-section" data-source="{source}">
+        <div class="source-header">
+            <div class="source-icon">{initial}</div>
+            <div class="source-name">{source}</div>
+            <div class="source-count">{count} articles</div>
+        </div>
+        <div class="headlines-grid">
+""") + '\n'
+
+HEADLINE_CARD_TEMPLATE = _compact_markup("""
+    <div class="headline-card" id="c{card_id}">
+        <a href="{link}" target="_blank" rel="noopener noreferrer">
+            <div class="headline-title">{title}</div>
+            {description_html}
+            <div class="headline-meta">
+                <span class="published-date">🕒 {published}</span>
+                <span class="read-more">Read More →</span>
+            </div>
+        </a>
+    </div>
+""") + '\n'
+
+SOURCE_SECTION_END = '</div></div>\n'
+
+CATEGORY_SECTION_TEMPLATE = _compact_markup("""
+    <div class="category-section" data-category="{category}">
+        <div class="category-header">
+            <div class="category-title">
+                <span>{icon}</span>
+                <span>{category}</span>
+            </div>
+        </div>
+""") + '\n'
 
-        # Try scraping sources
-        for source in self.scraping_sources:
-            try:
-                print(f"Attempting to scrape {source['name']}...")
-                scraped_headlines = source['method'](source['url'])
-                if scraped_headlines:
-                    all_headlines.extend(scraped_headlines)
-                    print(f"  ✓ Found {len(scraped_headlines)} headlines from {source['name']}")
-                else:
-                    print(f"  ✗ No headlines found from {source['name']}")
-            except Exception as e:
-                print(f"  ✗ Could not scrape {source['name']}: {str(e)}")
+CATEGORY_SECTION_END = '</div>\n'
 
-            time.sleep(1)
+def client_search_text(title, description):
+    """Normalized text the dashboard's search box matches against for one card"""
+    description_text = html.unescape(re.sub(r'<[^>]*>', ' ', description or ''))
+    return fold_accents(html.unescape(title)) + '\n' + fold_accents(description_text)
 
-        print()
-        print("=" * 70)
-        print(f"Total headlines collected: {len(all_headlines)}")
-        print("=" * 70)
+def render_headline_card(headline, card_id):
+    """One headline's card markup and the text the dashboard's search matches against"""
+    # The dashboard script replaces this with a relative time ("5m ago")
+    published_at = headline.get('published_at')
+    if published_at is not None:
+        published = datetime.fromtimestamp(published_at, timezone.utc).strftime('%b %d, %H:%M UTC')
+    else:
+        published = headline.get('published') or 'Recent'
+        if len(published) > 50:
+            published = published[:50] + '...'
+
+    description = headline.get('description', '')
+    if description:
+        if len(description) > 150:
+            description = description[:150] + '...'
+        description_html = f'<div class="headline-description">{description}</div>'
+    else:
+        description_html = ''
 
-        # Remove duplicates
-        seen_titles = set()
-        unique_headlines = []
-        for headline in all_headlines:
-            title_lower = headline['title'].lower().strip()
-            if title_lower not in seen_titles and len(title_lower) > 10:
-                seen_titles.add(title_lower)
-                unique_headlines.append(headline)
+    card_html = HEADLINE_CARD_TEMPLATE.format(
+        card_id=card_id, link=headline['link'], title=headline['title'],
+        description_html=description_html, published=published,
+    )
+    return card_html, client_search_text(headline['title'], description)
 
-        print(f"Unique headlines after deduplication: {len(unique_headlines)}")
-        print()
+def generate_html(headlines, generated_at=None, stale=False):
+    """Generate beautiful HTML page with financial news
 
-        return unique_headlines
+    generated_at is the epoch time the headlines were fetched (defaults to
+    now); stale pages show a refreshing banner and reload themselves.
+    """
+    render_start = time.perf_counter()
+    generated_at = generated_at or time.time()
+    updated_at = datetime.fromtimestamp(generated_at)
+    if stale:
+        stale_meta = '<meta http-equiv="refresh" content="60">'
+        status_html = '🟡 STALE'
+        stale_banner = ' | ⏳ Showing saved headlines while the latest news loads…'
+    else:
+        stale_meta = ''
+        status_html = '🔴 LIVE'
+        stale_banner = ''
 
-def generate_html(headlines):
-    """Generate beautiful HTML page with financial news"""
+    asset_urls = DASHBOARD_ASSET_URLS
+    # The page is assembled as a list of fragments and joined once at the end
+    parts = []
 
     # Group headlines by source
     grouped_headlines = {}
@@ -487,479 +3008,15 @@ def generate_html(headlines):
             grouped_headlines[source] = []
         grouped_headlines[source].append(headline)
 
-    # Categorize sources
-    categories = {
-        'International Markets': ['Bloomberg', 'Reuters', 'Financial Times', 'Wall Street Journal', 'MarketWatch', 'CNBC', 'CNN Business', 'Fox Business', 'Yahoo Finance', 'Seeking Alpha', 'Investing.com', 'Forbes Money', 'The Motley Fool', 'Barrons', "Investor's Business Daily"],
-        'Indian Markets': ['Economic Times', 'Business Standard', 'Mint', 'Moneycontrol', 'Business Today', 'Financial Express', 'NSE India News', 'BSE India', 'Zerodha Varsity'],
-        'Crypto & Fintech': ['CoinDesk', 'TechCrunch Fintech'],
-        'Commodities': ['Kitco Gold News', 'Oil Price']
-    }
-
-    html_content = f"""
+    parts.append(f"""
     <!DOCTYPE html>
     <html lang="en">
     <head>
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <title>Financial News - Showcased by Mr Bukkan</title>
-        <style>
-            * {{
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-            }}
-
-            body {{
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-                min-height: 100vh;
-                padding: 20px;
-                padding-bottom: 40px;
-            }}
-
-            .container {{
-                max-width: 1400px;
-                margin: 0 auto;
-                background: white;
-                border-radius: 15px;
-                box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-                overflow: hidden;
-                margin-bottom: 20px;
-            }}
-
-            .header {{
-                background: linear-gradient(135deg, #0f2027 0%, #203a43 50%, #2c5364 100%);
-                color: white;
-                padding: 35px 30px;
-                text-align: center;
-                position: relative;
-                overflow: hidden;
-            }}
-
-            .header::before {{
-                content: '💹';
-                position: absolute;
-                font-size: 200px;
-                opacity: 0.1;
-                right: -50px;
-                top: -50px;
-            }}
-
-            .header h1 {{
-                font-size: 2.5em;
-                margin-bottom: 10px;
-                text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
-                position: relative;
-                line-height: 1.3;
-            }}
-
-            .header p {{
-                font-size: 1.3em;
-                opacity: 0.95;
-                position: relative;
-            }}
-
-            .market-ticker {{
-                background: #000;
-                color: #0f0;
-                padding: 15px;
-                font-family: 'Courier New', monospace;
-                overflow: hidden;
-                border-bottom: 2px solid #0f0;
-            }}
-
-            .ticker-content {{
-                display: inline-block;
-                white-space: nowrap;
-                animation: scroll 30s linear infinite;
-            }}
-
-            @keyframes scroll {{
-                0% {{ transform: translateX(100%); }}
-                100% {{ transform: translateX(-100%); }}
-            }}
-
-            .stats {{
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                gap: 20px;
-                background: #f8f9fa;
-                padding: 30px;
-                border-bottom: 2px solid #e9ecef;
-            }}
-
-            .stat-item {{
-                text-align: center;
-                padding: 20px;
-                background: white;
-                border-radius: 10px;
-                box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                transition: transform 0.3s ease;
-            }}
-
-            .stat-item:hover {{
-                transform: translateY(-5px);
-            }}
-
-            .stat-number {{
-                font-size: 2.5em;
-                font-weight: bold;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                -webkit-background-clip: text;
-                -webkit-text-fill-color: transparent;
-                background-clip: text;
-            }}
-
-            .stat-label {{
-                font-size: 0.95em;
-                color: #666;
-                margin-top: 8px;
-                text-transform: uppercase;
-                letter-spacing: 1px;
-            }}
-
-            .timestamp {{
-                background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-                padding: 15px;
-                text-align: center;
-                color: white;
-                font-size: 1em;
-                font-weight: 600;
-                border-bottom: 2px solid #f5576c;
-            }}
-
-            .filters {{
-                padding: 25px 30px;
-                background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%);
-                border-bottom: 1px solid #dee2e6;
-            }}
-
-            .filter-search {{
-                margin-bottom: 20px;
-            }}
-
-            .filter-search input {{
-                width: 100%;
-                padding: 15px 25px;
-                border: 3px solid #2c5364;
-                border-radius: 30px;
-                font-size: 1.05em;
-                outline: none;
-                transition: all 0.3s ease;
-                background: white;
-            }}
-
-            .filter-search input:focus {{
-                box-shadow: 0 0 20px rgba(44, 83, 100, 0.4);
-                border-color: #1e3c72;
-            }}
-
-            .category-filters {{
-                margin-bottom: 15px;
-            }}
-
-            .category-btn {{
-                padding: 10px 20px;
-                margin: 5px;
-                border: 2px solid #2c5364;
-                background: white;
-                color: #2c5364;
-                border-radius: 25px;
-                cursor: pointer;
-                transition: all 0.3s ease;
-                font-weight: 600;
-                font-size: 0.9em;
-            }}
-
-            .category-btn:hover {{
-                background: #2c5364;
-                color: white;
-                transform: scale(1.05);
-            }}
-
-            .category-btn.active {{
-                background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-                color: white;
-                border-color: #1e3c72;
-            }}
-
-            .filter-buttons {{
-                display: flex;
-                flex-wrap: wrap;
-                gap: 10px;
-                max-height: 250px;
-                overflow-y: auto;
-                padding: 10px;
-                background: white;
-                border-radius: 10px;
-            }}
-
-            .filter-btn {{
-                padding: 8px 18px;
-                border: 2px solid #667eea;
-                background: white;
-                color: #667eea;
-                border-radius: 20px;
-                cursor: pointer;
-                transition: all 0.3s ease;
-                font-size: 0.85em;
-                white-space: nowrap;
-                font-weight: 500;
-            }}
-
-            .filter-btn:hover {{
-                background: #667eea;
-                color: white;
-                transform: scale(1.05);
-            }}
-
-            .filter-btn.active {{
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                border-color: #667eea;
-            }}
-
-            .content {{
-                padding: 30px;
-                background: #f8f9fa;
-                min-height: 400px;
-                margin-bottom: 0;
-            }}
-
-            .category-section {{
-                margin-bottom: 50px;
-                page-break-inside: avoid;
-            }}
-
-            .category-header {{
-                background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-                color: white;
-                padding: 20px 30px;
-                border-radius: 10px;
-                margin-bottom: 25px;
-                box-shadow: 0 5px 15px rgba(0,0,0,0.2);
-            }}
-
-            .category-title {{
-                font-size: 1.8em;
-                font-weight: bold;
-                display: flex;
-                align-items: center;
-                gap: 15px;
-            }}
-
-            .source-section {{
-                margin-bottom: 40px;
-                background: white;
-                padding: 25px;
-                border-radius: 10px;
-                box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                page-break-inside: avoid;
-            }}
-
-            .source-header {{
-                display: flex;
-                align-items: center;
-                margin-bottom: 20px;
-                padding-bottom: 15px;
-                border-bottom: 3px solid #2c5364;
-            }}
-
-            .source-icon {{
-                width: 50px;
-                height: 50px;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                border-radius: 50%;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                color: white;
-                font-weight: bold;
-                margin-right: 15px;
-                font-size: 1.3em;
-                box-shadow: 0 3px 10px rgba(0,0,0,0.2);
-            }}
-
-            .source-name {{
-                font-size: 1.5em;
-                font-weight: bold;
-                color: #2c3e50;
-            }}
-
-            .source-count {{
-                margin-left: auto;
-                background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-                color: white;
-                padding: 8px 20px;
-                border-radius: 25px;
-                font-size: 0.9em;
-                font-weight: 600;
-                box-shadow: 0 2px 8px rgba(0,0,0,0.2);
-            }}
-
-            .headlines-grid {{
-                display: grid;
-                grid-template-columns: repeat(auto-fill, minmax(350px, 1fr));
-                gap: 20px;
-            }}
-
-            .headline-card {{
-                background: white;
-                border: 2px solid #e9ecef;
-                border-radius: 12px;
-                padding: 25px;
-                transition: all 0.3s ease;
-                position: relative;
-                overflow: hidden;
-                box-shadow: 0 2px 8px rgba(0,0,0,0.05);
-            }}
-
-            .headline-card::before {{
-                content: '';
-                position: absolute;
-                left: 0;
-                top: 0;
-                height: 100%;
-                width: 5px;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                transform: scaleY(0);
-                transition: transform 0.3s ease;
-            }}
-
-            .headline-card:hover {{
-                border-color: #667eea;
-                box-shadow: 0 8px 25px rgba(102, 126, 234, 0.3);
-                transform: translateY(-5px);
-            }}
-
-            .headline-card:hover::before {{
-                transform: scaleY(1);
-            }}
-
-            .headline-card a {{
-                text-decoration: none;
-                color: #2c3e50;
-                display: block;
-            }}
-
-            .headline-title {{
-                font-size: 1.15em;
-                line-height: 1.6;
-                margin-bottom: 12px;
-                font-weight: 600;
-                color: #1a1a1a;
-            }}
-
-            .headline-card:hover .headline-title {{
-                color: #667eea;
-            }}
-
-            .headline-description {{
-                font-size: 0.9em;
-                color: #666;
-                line-height: 1.5;
-                margin-bottom: 12px;
-            }}
-
-            .headline-meta {{
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                font-size: 0.85em;
-                color: #6c757d;
-                margin-top: 15px;
-                padding-top: 12px;
-                border-top: 1px solid #e9ecef;
-            }}
-
-            .published-date {{
-                font-style: italic;
-                display: flex;
-                align-items: center;
-                gap: 5px;
-            }}
-
-            .read-more {{
-                color: #667eea;
-                font-weight: 700;
-                text-transform: uppercase;
-                font-size: 0.8em;
-                letter-spacing: 1px;
-            }}
-
-            .no-headlines {{
-                text-align: center;
-                padding: 80px 20px;
-                color: #666;
-            }}
-
-            .no-headlines-icon {{
-                font-size: 5em;
-                margin-bottom: 20px;
-            }}
-
-            .footer {{
-                background: linear-gradient(135deg, #0f2027 0%, #203a43 50%, #2c5364 100%);
-                color: white;
-                padding: 40px 30px;
-                text-align: center;
-                position: relative;
-                z-index: 1;
-            }}
-
-            .footer h3 {{
-                font-size: 1.5em;
-                margin-bottom: 20px;
-            }}
-
-            .source-list {{
-                margin: 25px 0;
-                font-size: 0.9em;
-                opacity: 0.9;
-                line-height: 2;
-            }}
-
-            .footer-links {{
-                margin-top: 20px;
-                padding-top: 20px;
-                border-top: 1px solid rgba(255,255,255,0.2);
-            }}
-
-            .footer-link {{
-                color: #667eea;
-                text-decoration: none;
-                margin: 0 15px;
-                font-weight: 600;
-            }}
-
-            .footer-link:hover {{
-                text-decoration: underline;
-                color: #764ba2;
-            }}
-
-            @media (max-width: 768px) {{
-                .headlines-grid {{
-                    grid-template-columns: 1fr;
-                }}
-
-                .stats {{
-                    grid-template-columns: 1fr;
-                }}
-
-                .header h1 {{
-                    font-size: 1.5em;
-                    line-height: 1.4;
-                }}
-
-                .header p {{
-                    font-size: 1em;
-                }}
-
-                .filter-buttons {{
-                    max-height: 150px;
-                }}
-            }}
-        </style>
+        {stale_meta}
+        <link rel="stylesheet" href="{asset_urls['css']}">
     </head>
     <body>
         <div class="container">
@@ -990,18 +3047,18 @@ def generate_html(headlines):
                     <div class="stat-label">Categories</div>
                 </div>
                 <div class="stat-item">
-                    <div class="stat-number">🔴 LIVE</div>
+                    <div class="stat-number">{status_html}</div>
                     <div class="stat-label">Status</div>
                 </div>
             </div>
 
             <div class="timestamp">
-                🕐 Last Updated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')} | Market Hours: NYSE, NASDAQ, NSE, BSE
+                🕐 Last Updated: {updated_at.strftime('%B %d, %Y at %I:%M %p')} | Market Hours: NYSE, NASDAQ, NSE, BSE{stale_banner}
             </div>
 
             <div class="filters">
                 <div class="filter-search">
-                    <input type="text" id="searchBox" placeholder="🔍 Search financial news, stocks, companies..." onkeyup="searchHeadlines()">
+                    <input type="text" id="searchBox" placeholder="🔍 Search financial news, stocks, companies..." oninput="searchHeadlines()">
                 </div>
 
                 <div class="category-filters">
@@ -1012,102 +3069,78 @@ def generate_html(headlines):
                     <button class="category-btn" onclick="filterCategory('Commodities')">📦 Commodities</button>
                 </div>
 
+                <div class="time-filters">
+                    <button class="time-btn active" onclick="filterTime(0)">Any Time</button>
+                    <button class="time-btn" onclick="filterTime(1)">🕒 Last Hour</button>
+                    <button class="time-btn" onclick="filterTime(6)">Last 6 Hours</button>
+                    <button class="time-btn" onclick="filterTime(24)">Last 24 Hours</button>
+                </div>
+
                 <div class="filter-buttons" id="sourceFilters">
                     <button class="filter-btn active" onclick="filterSource('all')">All Sources ({len(headlines)})</button>
-    """
+    """)
 
     for source in sorted(grouped_headlines.keys()):
-        html_content += f"""
-                    <button class="filter-btn" onclick="filterSource('{source}')">{source} ({len(grouped_headlines[source])})</button>
-        """
+        parts.append(f"""
+                    <button class="filter-btn" data-source="{source}" onclick="filterSource('{source}')">{source} ({len(grouped_headlines[source])})</button>
+        """)
 
-    html_content += """
+    parts.append("""
                 </div>
             </div>
 
             <div class="content" id="newsContent">
-    """
+    """)
+
+    # Client-side search payload: one normalized text, source-section index
+    # and publish time (whole epoch seconds) per rendered card, in card order
+    # (card ids are c0, c1, ...), plus the generation the live-update stream
+    # resumes from
+    search_payload = {'t': [], 's': [], 'p': [], 'g': generation_id(generated_at)}
+    section_count = 0
 
     if headlines:
-        for category, sources_in_category in categories.items():
-            category_headlines = {k: v for k, v in grouped_headlines.items() if any(s in k for s in sources_in_category)}
+        for category, sources_in_category in CATEGORIES.items():
+            category_headlines = {k: v for k, v in grouped_headlines.items() if category in source_categories(k)}
 
             if category_headlines:
-                category_icons = {
-                    'International Markets': '🌍',
-                    'Indian Markets': '🇮🇳',
-                    'Crypto & Fintech': '₿',
-                    'Banking & Finance': '🏦',
-                    'Commodities': '📦'
-                }
-
-                html_content += f"""
-                <div class="category-section" data-category="{category}">
-                    <div class="category-header">
-                        <div class="category-title">
-                            <span>{category_icons.get(category, '📊')}</span>
-                            <span>{category}</span>
-                        </div>
-                    </div>
-                """
+                parts.append(CATEGORY_SECTION_TEMPLATE.format(
+                    category=category, icon=CATEGORY_ICONS.get(category, '📊'),
+                ))
 
                 for source in sorted(category_headlines.keys()):
                     source_headlines = category_headlines[source]
-                    html_content += f"""
-                    <div class="source-section" data-source="{source}">
-                        <div class="source-header">
-                            <div class="source-icon">{source[0]}</div>
-                            <div class="source-name">{source}</div>
-                            <div class="source-count">{len(source_headlines)} articles</div>
-                        </div>
-
-                        <div class="headlines-grid">
-                    """
+                    section_index = section_count
+                    section_count += 1
+                    parts.append(SOURCE_SECTION_TEMPLATE.format(
+                        source=source, initial=source[0], count=len(source_headlines),
+                    ))
 
                     for headline in source_headlines:
-                        published = headline.get('published', 'Recent')
-                        if len(published) > 50:
-                            published = published[:50] + '...'
-
-                        description = headline.get('description', '')
-                        if description:
-                            if len(description) > 150:
-                                description = description[:150] + '...'
-                            description_html = f'<div class="headline-description">{description}</div>'
-                        else:
-                            description_html = ''
-
-                        html_content += f"""
-                            <div class="headline-card">
-                                <a href="{headline['link']}" target="_blank" rel="noopener noreferrer">
-                                    <div class="headline-title">{headline['title']}</div>
-                                    {description_html}
-                                    <div class="headline-meta">
-                                        <span class="published-date">🕒 {published}</span>
-                                        <span class="read-more">Read More →</span>
-                                    </div>
-                                </a>
-                            </div>
-                        """
-
-                    html_content += """
-                        </div>
-                    </div>
-                    """
+                        card_html, search_text = render_headline_card(headline, len(search_payload['t']))
+                        search_payload['t'].append(search_text)
+                        search_payload['s'].append(section_index)
+                        search_payload['p'].append(int(headline.get('published_at') or generated_at))
+                        parts.append(card_html)
 
-                html_content += """
-                </div>
-                """
+                    parts.append(SOURCE_SECTION_END)
+
+                parts.append(CATEGORY_SECTION_END)
     else:
-        html_content += """
+        parts.append("""
                 <div class="no-headlines">
                     <div class="no-headlines-icon">📭</div>
                     <h2>No Financial News Available</h2>
                     <p>Please check your connection and try again.</p>
                 </div>
-        """
+        """)
+
+    packed_search = json.dumps(search_payload, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+    parts.append(f"""
+                <script id="searchData" type="application/json">{packed_search}</script>
+    """)
 
-    html_content += """
+    parts.append("""
             </div>
 
             <div class="footer">
@@ -1147,198 +3180,370 @@ def generate_html(headlines):
             © 2026 Mr Bukkan
         </div>
 
-        <script>
-            let currentCategory = 'all';
-            let currentSource = 'all';
-
-            function filterCategory(category) {
-                currentCategory = category;
-                const sections = document.querySelectorAll('.category-section');
-                const buttons = document.querySelectorAll('.category-btn');
-
-                buttons.forEach(btn => btn.classList.remove('active'));
-                event.target.classList.add('active');
-
-                // Clear search and source filter
-                document.getElementById('searchBox').value = '';
-                resetSourceFilters();
-
-                if (category === 'all') {
-                    sections.forEach(section => section.style.display = 'block');
-                } else {
-                    sections.forEach(section => {
-                        if (section.dataset.category === category) {
-                            section.style.display = 'block';
-                        } else {
-                            section.style.display = 'none';
-                        }
-                    });
-                }
-            }
-
-            function filterSource(source) {
-                currentSource = source;
-                const sections = document.querySelectorAll('.source-section');
-                const buttons = document.querySelectorAll('.filter-btn');
-
-                buttons.forEach(btn => btn.classList.remove('active'));
-                event.target.classList.add('active');
-
-                // Clear search
-                document.getElementById('searchBox').value = '';
-
-                if (source === 'all') {
-                    sections.forEach(section => {
-                        section.style.display = 'block';
-                        const cards = section.querySelectorAll('.headline-card');
-                        cards.forEach(card => card.style.display = 'block');
-                    });
-                } else {
-                    sections.forEach(section => {
-                        if (section.dataset.source === source) {
-                            section.style.display = 'block';
-                        } else {
-                            section.style.display = 'none';
-                        }
-                    });
-                }
-            }
-
-            function resetSourceFilters() {
-                currentSource = 'all';
-                const buttons = document.querySelectorAll('.filter-btn');
-                buttons.forEach(btn => btn.classList.remove('active'));
-                document.querySelector('.filter-btn').classList.add('active');
-            }
-
-            function searchHeadlines() {
-                const searchTerm = document.getElementById('searchBox').value.toLowerCase();
-                const sections = document.querySelectorAll('.source-section');
-                const categoryButtons = document.querySelectorAll('.category-btn');
-                const sourceButtons = document.querySelectorAll('.filter-btn');
-
-                // Reset filters
-                categoryButtons.forEach(btn => btn.classList.remove('active'));
-                sourceButtons.forEach(btn => btn.classList.remove('active'));
-
-                if (searchTerm === '') {
-                    sections.forEach(section => {
-                        section.style.display = 'block';
-                        const cards = section.querySelectorAll('.headline-card');
-                        cards.forEach(card => card.style.display = 'block');
-                    });
-                    document.querySelector('.category-btn').classList.add('active');
-                    document.querySelector('.filter-btn').classList.add('active');
-                    return;
-                }
-
-                sections.forEach(section => {
-                    const cards = section.querySelectorAll('.headline-card');
-                    let hasVisibleCard = false;
-
-                    cards.forEach(card => {
-                        const title = card.querySelector('.headline-title').textContent.toLowerCase();
-                        const description = card.querySelector('.headline-description');
-                        const descText = description ? description.textContent.toLowerCase() : '';
-
-                        if (title.includes(searchTerm) || descText.includes(searchTerm)) {
-                            card.style.display = 'block';
-                            hasVisibleCard = true;
-                        } else {
-                            card.style.display = 'none';
-                        }
-                    });
-
-                    section.style.display = hasVisibleCard ? 'block' : 'none';
-                });
-            }
+    """)
 
-            // Scroll to top button
-            window.onscroll = function() {
-                if (document.body.scrollTop > 400 || document.documentElement.scrollTop > 400) {
-                    if (!document.getElementById('scrollTopBtn')) {
-                        const btn = document.createElement('button');
-                        btn.id = 'scrollTopBtn';
-                        btn.innerHTML = '↑';
-                        btn.style.cssText = `
-                            position: fixed;
-                            bottom: 30px;
-                            right: 30px;
-                            background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-                            color: white;
-                            border: none;
-                            border-radius: 50%;
-                            width: 55px;
-                            height: 55px;
-                            font-size: 26px;
-                            cursor: pointer;
-                            box-shadow: 0 5px 20px rgba(0,0,0,0.4);
-                            z-index: 1000;
-                            transition: all 0.3s ease;
-                        `;
-                        btn.onclick = function() {
-                            window.scrollTo({ top: 0, behavior: 'smooth' });
-                        };
-                        btn.onmouseover = function() {
-                            this.style.transform = 'scale(1.15)';
-                        };
-                        btn.onmouseout = function() {
-                            this.style.transform = 'scale(1)';
-                        };
-                        document.body.appendChild(btn);
-                    }
-                } else {
-                    const btn = document.getElementById('scrollTopBtn');
-                    if (btn) btn.remove();
-                }
-            };
-
-            
-            setInterval(() => { 
-                const now = new Date(); 
-                const hours = now.getHours(); 
-                const minutes = now.getMinutes(); 
-                // If it's exactly 7:00 AM, reload the page 
-                if (hours === 7 && minutes === 0) { 
-                location.reload();
-                } 
-            }, 60000);
-           
-        </script>
+    parts.append(f"""
+        <script src="{asset_urls['js']}" defer></script>
     </body>
     </html>
+    """)
+
+    page = ''.join(parts)
+    RENDER_SECONDS.observe(time.perf_counter() - render_start)
+    return page
+
+# ---------------- Live Updates ----------------
+# Open dashboards subscribe to /events (Server-Sent Events). Whenever a new
+# headline index is published, the headlines it adds are rendered into card
+# markup and encoded once as an event in a short shared history. Every
+# connection is a generator holding a cursor into that history and parked
+# on one shared Condition, so an idle subscriber costs a blocked wait and
+# each event costs the same pre-encoded bytes written to every socket.
+# Clients resume from the page's generation (or Last-Event-ID); a client
+# further behind than the history is told to reload instead.
+SSE_HISTORY = 64  # events kept for reconnecting clients
+SSE_KEEPALIVE_SECONDS = 15
+SSE_RETRY_MS = 5000
+
+class EventBroadcaster:
+    """Shared, bounded log of pre-encoded events that every /events stream reads from"""
+
+    def __init__(self, history=SSE_HISTORY):
+        self._events = deque(maxlen=history)  # (seq, generation, encoded)
+        self._seq = 0
+        # Oldest generation a client can resume from without missing events
+        self._floor = None
+        self._condition = threading.Condition()
+        self.subscribers = 0
+        self.events_published = 0
+
+    def note_generation(self, generation):
+        """Record that a generation went live (with or without an event)"""
+        with self._condition:
+            if self._floor is None:
+                self._floor = int(generation)
+
+    def publish(self, generation, encoded):
+        with self._condition:
+            if len(self._events) == self._events.maxlen:
+                self._floor = self._events[0][1]
+            self._seq += 1
+            self._events.append((self._seq, int(generation), encoded))
+            self.events_published += 1
+            SSE_EVENTS.inc()
+            self._condition.notify_all()
+
+    def subscribe(self):
+        with self._condition:
+            self.subscribers += 1
+            SSE_SUBSCRIBERS.set(self.subscribers)
+
+    def unsubscribe(self):
+        with self._condition:
+            self.subscribers -= 1
+            SSE_SUBSCRIBERS.set(self.subscribers)
+
+    def cursor_for(self, since):
+        """Cursor that replays every event after generation since, or None if some are gone"""
+        with self._condition:
+            if since is None:
+                return self._seq
+            if self._floor is None or since < self._floor:
+                return None
+            for seq, generation, _ in self._events:
+                if generation > since:
+                    return seq - 1
+            return self._seq
+
+    def wait(self, cursor, timeout):
+        """Events after cursor (waiting up to timeout for one) and the new cursor
+
+        Returns (None, cursor) if the history has moved past cursor.
+        """
+        with self._condition:
+            if self._seq == cursor:
+                self._condition.wait(timeout)
+            if self._events and self._events[0][0] > cursor + 1:
+                return None, cursor
+            return [encoded for seq, _, encoded in self._events if seq > cursor], self._seq
+
+event_broadcaster = EventBroadcaster()
+
+def encode_sse(event, data, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event}')
+    lines.append(f'data: {data}')
+    return ('\n'.join(lines) + '\n\n').encode('utf-8')
+
+SSE_RELOAD_EVENT = encode_sse('reload', '{}')
+
+def announce_new_headlines(previous, index):
+    """Broadcast the headlines index has that previous did not, as card markup"""
+    event_broadcaster.note_generation(index.generation)
+    if previous is None:
+        return
+    known = {HeadlineStore.headline_key(headline) for headline in previous.headlines}
+    added = [headline for headline in index.headlines if HeadlineStore.headline_key(headline) not in known]
+    if not added:
+        return
+
+    items = []
+    sections = {}
+    categories = {}
+    for headline in added:
+        source = headline['source']
+        headline_categories = source_categories(source)
+        card_html, search_text = render_headline_card(headline, '')
+        items.append({'source': source, 'categories': headline_categories, 'card': card_html, 'text': search_text,
+                      'published_at': int(headline.get('published_at') or index.generated_at)})
+        if source not in sections:
+            sections[source] = SOURCE_SECTION_TEMPLATE.format(source=source, initial=source[0], count=0) + SOURCE_SECTION_END
+        for category in headline_categories:
+            if category not in categories:
+                categories[category] = CATEGORY_SECTION_TEMPLATE.format(
+                    category=category, icon=CATEGORY_ICONS.get(category, '📊'),
+                ) + CATEGORY_SECTION_END
+
+    payload = json.dumps({
+        'generation': index.generation,
+        'headlines': items,
+        'sections': sections,
+        'categories': categories,
+        'order': list(CATEGORIES),
+    }, ensure_ascii=False, separators=(',', ':'))
+    event_broadcaster.publish(index.generation, encode_sse('headlines', payload, index.generation))
+    print(f"  📡 Pushed {len(added)} new headlines to {event_broadcaster.subscribers} open dashboards")
+
+# Pre-compressed variants of index.html written next to it at maximum
+# compression, in order of preference; "/" picks one by Accept-Encoding so no
+# compression happens per request. Partial publishes mid-cycle are replaced
+# within seconds, and the scheduler's small batches arrive every few
+# minutes, so both only get a quick gzip at this level. The maximum-quality
+# variants are built after a cycle that fetched every source, or after any
+# cycle once MAX_COMPRESSION_INTERVAL_SECONDS have passed since they last were.
+PARTIAL_GZIP_LEVEL = 1
+MAX_COMPRESSION_INTERVAL_SECONDS = float(os.environ.get("MAX_COMPRESSION_INTERVAL_SECONDS", 30 * 60))
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+PAGE_ENCODINGS = [('gzip', '.gz')]
+if brotli is not None:
+    PAGE_ENCODINGS.insert(0, ('br', '.br'))
+
+def compress_page(page_bytes, encoding, partial=False):
+    if encoding == 'br':
+        return brotli.compress(page_bytes, quality=11)
+    level = PARTIAL_GZIP_LEVEL if partial else 9
+    return gzip.compress(page_bytes, compresslevel=level, mtime=0)
+
+def _write_bytes_atomically(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+class PageGeneration:
+    """One published dashboard: its page bytes and pre-compressed variants, held in memory"""
+
+    def __init__(self, variants, generated_at, path=None):
+        self.variants = variants
+        self.generated_at = generated_at
+        self.path = path
+        self.etag = hashlib.sha256(variants['identity']).hexdigest()[:16]
+
+    def pick_encoding(self, accept_encodings):
+        for encoding, _ in PAGE_ENCODINGS:
+            if encoding in self.variants and accept_encodings[encoding] > 0:
+                return encoding
+        return 'identity'
+
+# Generations shared with the other gunicorn workers: per-etag page files plus
+# a manifest naming the current one (see Worker Coordination below)
+PUBLISHED_DIR = os.environ.get(
+    "PUBLISHED_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'published'),
+)
+PUBLISHED_MANIFEST_PATH = os.path.join(PUBLISHED_DIR, 'current.json')
+PUBLISHED_METRICS_PATH = os.path.join(PUBLISHED_DIR, 'metrics.prom')
+
+# The generation "/" serves; replaced with a single reference swap, so a
+# request sees either the old page or the new one, never a partial write.
+current_page = None
+
+def write_index_html(variants):
+    """Atomically write the page and its variants to frontend/ and return the page's path
+
+    Variants the caller did not provide are removed, so an older page can
+    never be served to clients that accept compression.
     """
+    # Define the output directory and file, anchored to this script's
+    # location so the written file always matches Flask's static_folder
+    # regardless of the process's current working directory
+    output_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'frontend')
+    output_file_path = os.path.join(output_dir, 'index.html')
+
+    # Create the output directory if it doesn't exist
+    os.makedirs(output_dir, exist_ok=True)
+    write_dashboard_assets(output_dir)
+
+    for encoding, suffix in PAGE_ENCODINGS:
+        if encoding in variants:
+            _write_bytes_atomically(output_file_path + suffix, variants[encoding])
+        else:
+            try:
+                os.remove(output_file_path + suffix)
+            except FileNotFoundError:
+                pass
+
+    # Save to file (temp file + rename, so readers never see a partial page)
+    _write_bytes_atomically(output_file_path, variants['identity'])
+    return output_file_path
+
+def write_published_generation(page):
+    """Share a generation with the other workers: immutable per-etag files, then the manifest"""
+    os.makedirs(PUBLISHED_DIR, exist_ok=True)
+    for encoding, data in page.variants.items():
+        _write_bytes_atomically(os.path.join(PUBLISHED_DIR, f'{page.etag}.{encoding}'), data)
+    manifest = {
+        'etag': page.etag,
+        'generated_at': page.generated_at,
+        'encodings': sorted(page.variants),
+    }
+    previous = read_published_manifest()
+    _write_bytes_atomically(PUBLISHED_MANIFEST_PATH, json.dumps(manifest).encode('utf-8'))
 
-    return html_content
-def main():
+    # Keep the current and previous generation (a follower may be mid-read)
+    keep = {page.etag, previous['etag'] if previous else None}
+    for name in os.listdir(PUBLISHED_DIR):
+        if name.split('.')[0] not in keep and name not in _PUBLISHED_FIXED_FILES:
+            try:
+                os.remove(os.path.join(PUBLISHED_DIR, name))
+            except OSError:
+                pass
+
+_PUBLISHED_FIXED_FILES = {os.path.basename(PUBLISHED_MANIFEST_PATH), os.path.basename(PUBLISHED_METRICS_PATH)}
+
+def read_published_manifest():
+    try:
+        with open(PUBLISHED_MANIFEST_PATH, 'rb') as f:
+            return json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+def load_published_generation(manifest):
+    """Read the generation a manifest points to back into a PageGeneration"""
+    variants = {}
+    for encoding in manifest['encodings']:
+        with open(os.path.join(PUBLISHED_DIR, f"{manifest['etag']}.{encoding}"), 'rb') as f:
+            variants[encoding] = f.read()
+    return PageGeneration(variants, manifest['generated_at'])
+
+# When this process last built the maximum-quality variants
+max_compressed_at = 0.0
+
+def publish_page(html_content, generated_at, compress=True, share=True, partial=False):
+    """Compress and swap in a new page generation; return it
+
+    With share=True (the scraper leader) the page is also written to
+    frontend/ and to the published directory for the other workers.
+    A partial page (a cycle in progress or a small batch) only gets a quick gzip.
+    """
+    global current_page, max_compressed_at
+    page_bytes = html_content.encode('utf-8')
+    variants = {'identity': page_bytes}
+    if compress:
+        for encoding, _ in PAGE_ENCODINGS:
+            if partial and encoding != 'gzip':
+                continue
+            start = time.perf_counter()
+            variants[encoding] = off_hub(compress_page, page_bytes, encoding, partial)
+            print(f"  {encoding}: {len(page_bytes) // 1024} KB -> {len(variants[encoding]) // 1024} KB "
+                  f"in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+    if compress and not partial:
+        max_compressed_at = time.time()
+    page = PageGeneration(variants, generated_at)
+    for encoding, data in variants.items():
+        PAGE_BYTES.set(len(data), encoding=encoding)
+    LAST_PUBLISH.set(generated_at)
+    if share:
+        page.path = write_index_html(variants)
+        write_published_generation(page)
+        # For /metrics on the workers that do not scrape
+        _write_bytes_atomically(PUBLISHED_METRICS_PATH, render_metrics('pipeline').encode('utf-8'))
+    current_page = page
+    return page
+
+def render_warm_start_snapshot():
+    """Render the last saved snapshot as a stale page; return True if one was served"""
+    start = time.perf_counter()
+    snapshot = load_snapshot()
+    if snapshot is None:
+        return False
+    headlines, generated_at, _ = snapshot
+    # The page is not written to frontend/ (see below), but the CSS/JS it
+    # links must be there on a fresh checkout or after they changed
+    write_dashboard_assets(app.static_folder)
+    # Kept in this process only and uncompressed, so boot stays in milliseconds
+    # and a restarting worker never overwrites the leader's fresh page
+    publish_page(generate_html(headlines, generated_at, stale=True), generated_at, compress=False, share=False)
+    publish_headline_index(headlines, generated_at, stale=True)
+    print(f"✓ Warm start: serving {len(headlines)} saved headlines from "
+          f"{datetime.fromtimestamp(generated_at):%Y-%m-%d %H:%M} "
+          f"(rendered in {(time.perf_counter() - start) * 1000:.0f}ms)")
+    return True
+
+def main(aggregator=None, sources=None):
     """Main function to run the financial news aggregator"""
     print("\n" + "="*70)
     print(" " * 12 + "FINANCIAL NEWS AGGREGATOR")
     print(" " * 15 + "40+ Premium Sources")
     print("="*70 + "\n")
 
-    # Create aggregator instance
-    aggregator = FinancialNewsAggregator()
-
-    # Fetch all news
-    headlines = aggregator.fetch_all_news()
+    # Create aggregator instance (the background loop passes its own so
+    # per-feed ETag/Last-Modified validators survive between cycles)
+    if aggregator is None:
+        aggregator = FinancialNewsAggregator()
+
+    def publish_progress(partial_headlines):
+        # Until this process has finished a cycle, part of the page may
+        # still be warm-start snapshot data: keep it marked stale
+        generated_at = time.time()
+        stale = aggregator.cycles_completed == 0
+        html_content = off_hub(generate_html, partial_headlines, generated_at, stale)
+        write_snapshot(partial_headlines, generated_at, fetched_at=aggregator.result_times())
+        publish_page(html_content, generated_at, partial=True)
+        publish_headline_index(partial_headlines, generated_at, stale)
+        print(f"  ↗ Published {len(partial_headlines)} headlines so far")
+
+    # Fetch all news (or just the sources the scheduler says are due),
+    # publishing as results come in
+    headlines = aggregator.fetch_all_news(sources, on_progress=publish_progress)
 
     if headlines:
+        # Persist the cycle, then render from the store so the page reflects
+        # exactly what was recorded (first occurrence wins on shared links)
+        off_hub(headline_store.record_cycle, headlines)
+        headlines = off_hub(headline_store.current_headlines)
+        indexed = search_index.sync(headline_store)
+        print(f"Search index: {indexed} headlines (re)indexed, {len(search_index)} total")
+
         # Generate HTML
         print("Generating HTML page...")
-        html_content = generate_html(headlines)
-        # Define the output directory and file, anchored to this script's
-        # location so the written file always matches Flask's static_folder
-        # regardless of the process's current working directory
-        output_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'frontend')
-        output_file_path = os.path.join(output_dir, 'index.html')
-
-        # Create the output directory if it doesn't exist
-        os.makedirs(output_dir, exist_ok=True)
-
-        # Save to file
-        with open(output_file_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        generated_at = time.time()
+        html_content = off_hub(generate_html, headlines, generated_at)
+        # The snapshot goes first: followers rebuild their API index from it
+        # as soon as the published manifest changes
+        write_snapshot(headlines, generated_at, fetched_at=aggregator.result_times())
+        full_cycle = sources is None or set(sources) >= set(aggregator.source_names())
+        quick = not full_cycle and time.time() - max_compressed_at < MAX_COMPRESSION_INTERVAL_SECONDS
+        output_file_path = publish_page(html_content, generated_at, partial=quick).path
+        publish_headline_index(headlines, generated_at)
 
         print(f"\n✓ Success! HTML file generated: {output_file_path}")
         print(f"✓ Total unique headlines: {len(headlines)}")
@@ -1362,6 +3567,216 @@ def main():
         print("  or the availability of financial news sources.\n")
 
     
+# ---------------- Refresh Scheduling ----------------
+# Each source is refetched on its own timer rather than all of them every
+# REFRESH_INTERVAL_SECONDS. The scheduler keeps a smoothed estimate of each
+# source's new-item rate and splits a fixed daily request budget (by
+# default exactly what the old fixed cadence spent) across sources in
+# proportion to the square root of that rate, which minimises average
+# staleness for a given number of fetches. Intervals are clamped to
+# [REFRESH_MIN_SECONDS, REFRESH_MAX_SECONDS], stretched while a source's
+# exchange is closed, and jittered so sources do not fire in lockstep.
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:
+    ZoneInfo = None
+
+REFRESH_INTERVAL_SECONDS = 4 * 60 * 60  # the old fixed cadence; sets the default budget
+REFRESH_DAILY_REQUESTS = float(os.environ.get("REFRESH_DAILY_REQUESTS", 0))  # 0: same as the fixed cadence
+REFRESH_MIN_SECONDS = float(os.environ.get("REFRESH_MIN_SECONDS", 5 * 60))
+REFRESH_MAX_SECONDS = float(os.environ.get("REFRESH_MAX_SECONDS", 12 * 60 * 60))
+REFRESH_PROBE_SECONDS = 60 * 60  # until a source has a rate estimate
+# A source's retained result leaves the page after this many of its refresh
+# intervals pass without a fresh one (see FinancialNewsAggregator)
+RESULT_MAX_AGE_INTERVALS = float(os.environ.get("RESULT_MAX_AGE_INTERVALS", 3))
+REFRESH_JITTER = 0.1  # ± fraction of the interval
+REFRESH_BATCH_SECONDS = 60  # sources due this close together share a cycle
+REFRESH_OFF_HOURS_FACTOR = 3
+RATE_SMOOTHING = 0.3
+SEEN_KEYS_PER_SOURCE = 500
+
+# Regular trading sessions (exchange holidays are not modelled)
+MARKET_HOURS = {
+    'NYSE': ('America/New_York', (9, 30), (16, 0)),
+    'NSE': ('Asia/Kolkata', (9, 15), (15, 30)),
+}
+
+def source_market(source):
+    """Exchange whose hours drive a source's news flow; None for round-the-clock crypto"""
+    categories = source_categories(source)
+    if 'Indian Markets' in categories:
+        return 'NSE'
+    if 'Crypto & Fintech' in categories:
+        return None
+    return 'NYSE'
+
+def market_open_fraction(market):
+    """Fraction of the week market is in session (1.0 for round-the-clock sources)"""
+    if market is None or ZoneInfo is None:
+        return 1.0
+    _, (open_hour, open_minute), (close_hour, close_minute) = MARKET_HOURS[market]
+    session_minutes = (close_hour * 60 + close_minute) - (open_hour * 60 + open_minute)
+    return 5 * session_minutes / (7 * 24 * 60)
+
+def market_opens_in(market, now=None):
+    """Seconds until market's next session opens; 0 while it is open (or unknown)"""
+    if market is None or ZoneInfo is None:
+        return 0.0
+    now = time.time() if now is None else now
+    zone_name, (open_hour, open_minute), (close_hour, close_minute) = MARKET_HOURS[market]
+    zone = ZoneInfo(zone_name)
+    today = datetime.fromtimestamp(now, zone).date()
+    for days_ahead in range(8):
+        day = today + timedelta(days=days_ahead)
+        if day.weekday() >= 5:
+            continue
+        closes = datetime(day.year, day.month, day.day, close_hour, close_minute, tzinfo=zone).timestamp()
+        if closes <= now:
+            continue
+        opens = datetime(day.year, day.month, day.day, open_hour, open_minute, tzinfo=zone).timestamp()
+        return max(0.0, opens - now)
+    return 0.0
+
+class RefreshScheduler:
+    """Per-source refresh deadlines in a priority queue, adapted to each source's new-item rate"""
+
+    def __init__(self, sources, daily_requests=REFRESH_DAILY_REQUESTS,
+                 min_interval=REFRESH_MIN_SECONDS, max_interval=REFRESH_MAX_SECONDS,
+                 jitter=REFRESH_JITTER, now=None):
+        now = time.time() if now is None else now
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.jitter = jitter
+        self.daily_requests = daily_requests or len(sources) * 86400 / REFRESH_INTERVAL_SECONDS
+        self.sources = {
+            name: {
+                'market': source_market(name),
+                'rate': None,  # new items per second, smoothed
+                'interval': REFRESH_PROBE_SECONDS,
+                'last_fetch': None,
+                'seen': {},  # insertion-ordered set of headline keys
+                'due': now,
+            }
+            for name in sources
+        }
+        # The cost model is approximate (stretches are cut short at the open,
+        # floor/ceiling clamps), so once a week (news flow follows the weekly
+        # market calendar) the budget is corrected by what was actually
+        # spent. The first day, spent probing every source, is skipped.
+        self._budget_scale = 1.0
+        self._window_start = now + 86400
+        self._window_fetches = 0
+        # Everything is due at start-up: the first cycle fetches every source
+        self._queue = [(now, name) for name in sources]
+        heapq.heapify(self._queue)
+
+    def next_due(self):
+        return self._queue[0][0] if self._queue else time.time() + self.max_interval
+
+    def pop_due(self, now=None, window=REFRESH_BATCH_SECONDS):
+        """Remove and return the sources due by now + window, soonest first"""
+        now = time.time() if now is None else now
+        due = []
+        while self._queue and self._queue[0][0] <= now + window:
+            _, name = heapq.heappop(self._queue)
+            due.append(name)
+        return due
+
+    def observe(self, name, headlines, now=None):
+        """Record a fetch of name, update its rate estimate and schedule its next one"""
+        now = time.time() if now is None else now
+        state = self.sources[name]
+        if now >= self._window_start:
+            self._window_fetches += 1
+            elapsed = now - self._window_start
+            if elapsed >= 7 * 86400:
+                spent = self._window_fetches * 86400 / elapsed
+                self._budget_scale = min(max(self._budget_scale * self.daily_requests / spent, 0.25), 4.0)
+                self._window_start, self._window_fetches = now, 0
+
+        # An empty result is a failure (or an outage), not evidence of a
+        # quiet source: keep the old estimate and measure across the gap
+        if headlines:
+            seen = state['seen']
+            new_items = 0
+            for headline in headlines:
+                key = HeadlineStore.headline_key(headline)
+                if key not in seen:
+                    new_items += 1
+                    seen[key] = None
+            while len(seen) > SEEN_KEYS_PER_SOURCE:
+                del seen[next(iter(seen))]
+
+            # The first fetch only seeds the seen set; everything in it is "new"
+            if state['last_fetch'] is not None:
+                sample = new_items / max(now - state['last_fetch'], 1.0)
+                if state['rate'] is None:
+                    state['rate'] = sample
+                elif new_items == len(headlines):
+                    # Nothing overlapped the last fetch, so items were probably
+                    # missed off the end of the feed: the sample is a floor
+                    state['rate'] = max(sample, state['rate'])
+                else:
+                    state['rate'] = RATE_SMOOTHING * sample + (1 - RATE_SMOOTHING) * state['rate']
+            state['last_fetch'] = now
+            self._allocate()
+
+        interval = self.next_interval(name, now)
+        state['due'] = now + interval * (1 + random.uniform(-self.jitter, self.jitter))
+        heapq.heappush(self._queue, (state['due'], name))
+        return interval
+
+    def retry(self, name, delay=REFRESH_MIN_SECONDS, now=None):
+        """Reschedule a source that was due but never fetched, without touching its estimate"""
+        now = time.time() if now is None else now
+        self.sources[name]['due'] = now + delay
+        heapq.heappush(self._queue, (now + delay, name))
+
+    def _allocate(self):
+        """Split the daily budget into base intervals, ∝ sqrt(cost / rate)
+
+        A source's cost is the average fetches per base interval once its
+        off-hours stretching is counted, so a budget spent on in-session
+        fetching is not left unused while its market is closed.
+        """
+        budget = self.daily_requests * self._budget_scale / 86400  # fetches per second
+        weights = {}
+        for name, state in self.sources.items():
+            open_fraction = market_open_fraction(state['market'])
+            cost = open_fraction + (1 - open_fraction) / REFRESH_OFF_HOURS_FACTOR
+            if state['rate'] is None:
+                budget -= cost / REFRESH_PROBE_SECONDS
+            elif state['rate'] <= 0:
+                state['interval'] = self.max_interval
+                budget -= cost / self.max_interval
+            else:
+                weights[name] = (math.sqrt(state['rate'] / cost), math.sqrt(state['rate'] * cost))
+
+        total = sum(weight[1] for weight in weights.values())
+        for name, (weight, _) in weights.items():
+            interval = total / (budget * weight) if budget > 0 else self.max_interval
+            self.sources[name]['interval'] = min(max(interval, self.min_interval), self.max_interval)
+
+    def next_interval(self, name, now=None):
+        """Base interval for name, stretched (up to the next open) while its market is closed"""
+        state = self.sources[name]
+        interval = state['interval']
+        opens_in = market_opens_in(state['market'], now)
+        if opens_in > 0:
+            interval = min(interval * REFRESH_OFF_HOURS_FACTOR, max(opens_in, interval))
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def summary(self, count=5):
+        """One line naming the next few sources due"""
+        now = time.time()
+        upcoming = heapq.nsmallest(count, self._queue)
+        parts = []
+        for due, name in upcoming:
+            rate = self.sources[name]['rate']
+            rate_text = f"{rate * 3600:.1f}/h" if rate is not None else "probing"
+            parts.append(f"{name} in {max(0, due - now) / 60:.0f}m ({rate_text})")
+        return "⏱ Next refreshes: " + ", ".join(parts)
+
 # ---------------- Flask Setup ----------------
 # Tell Flask that "frontend" is the static folder
 app = Flask(__name__, static_folder="frontend", static_url_path="")
@@ -1381,16 +3796,122 @@ LOADING_PAGE = """
 </html>
 """
 
-REFRESH_INTERVAL_SECONDS = 4 * 60 * 60  # re-scrape and regenerate every 4 hours
 
 def _generate_news_loop():
+    # Load the stored history into the search index before the first scrape
+    try:
+        search_index.sync(headline_store)
+    except Exception:
+        print("✗ Loading the search index from the store failed:", file=sys.stderr)
+        traceback.print_exc()
+
+    aggregator = FinancialNewsAggregator()
+    # Progressive publishes during the first cycle build on the saved
+    # headlines instead of replacing them with only the fastest sources
+    snapshot = load_snapshot()
+    if snapshot is not None:
+        aggregator.seed_results(snapshot[0], snapshot[2])
+    scheduler = RefreshScheduler(aggregator.source_names())
     while True:
+        due = scheduler.pop_due()
         try:
-            main()
+            main(aggregator, due)
         except Exception:
             print("✗ Background news generation failed:", file=sys.stderr)
             traceback.print_exc()
-        time.sleep(REFRESH_INTERVAL_SECONDS)
+        for source_name in due:
+            if aggregator.missed_deadline.get(source_name) == 'not started':
+                scheduler.retry(source_name)
+            else:
+                interval = scheduler.observe(source_name, aggregator.last_fetched.get(source_name, []))
+                aggregator.set_refresh_interval(source_name, interval)
+        print(scheduler.summary())
+        time.sleep(max(0.0, scheduler.next_due() - time.time()))
+
+# ---------------- Worker Coordination ----------------
+# Under gunicorn every worker imports this module. Exactly one process (the
+# holder of an exclusive flock on SCRAPER_LOCK_PATH) scrapes; the others poll
+# the published manifest and load each new generation the leader writes. If
+# the leader exits, the OS releases its lock and the next follower to poll
+# takes over.
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+SCRAPER_LOCK_PATH = os.environ.get("SCRAPER_LOCK_PATH", os.path.join(_DATA_DIR, 'scraper.lock'))
+FOLLOWER_POLL_SECONDS = float(os.environ.get("FOLLOWER_POLL_SECONDS", 5))
+
+class ScraperLeadership:
+    """Non-blocking, process-lifetime exclusive lock deciding which worker scrapes"""
+
+    def __init__(self, path=SCRAPER_LOCK_PATH):
+        self.path = path
+        self._file = None
+
+    def try_acquire(self):
+        if self._file is not None:
+            return True
+        if fcntl is None:
+            # No flock (Windows): assume a single local process
+            self._file = True
+            return True
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        lock_file = open(self.path, 'a+')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(os.getpid()))
+        lock_file.flush()
+        # Kept open for the life of the process; closing it releases the lock
+        self._file = lock_file
+        return True
+
+def follow_published_generation():
+    """Load the leader's newest generation if it is newer than ours; return True if loaded"""
+    global current_page
+    manifest = read_published_manifest()
+    if manifest is None:
+        return False
+    page = current_page
+    if page is not None and (page.etag == manifest['etag'] or page.generated_at > manifest['generated_at']):
+        return False
+
+    try:
+        new_page = load_published_generation(manifest)
+    except OSError:
+        # The leader replaced it between the manifest read and ours; next poll
+        return False
+    snapshot = load_snapshot()
+    if snapshot is not None and snapshot[1] == manifest['generated_at']:
+        publish_headline_index(snapshot[0], snapshot[1])
+    search_index.sync(headline_store)
+    current_page = new_page
+    print(f"✓ Worker {os.getpid()} loaded generation {new_page.etag} from the scraper leader")
+    return True
+
+# Whether this process scrapes; decides where /metrics reads pipeline metrics
+is_scraper_leader = False
+
+def _coordinate_workers():
+    global is_scraper_leader
+    leadership = ScraperLeadership()
+    while True:
+        try:
+            if leadership.try_acquire():
+                is_scraper_leader = True
+                print(f"✓ Worker {os.getpid()} is the scraper leader")
+                _generate_news_loop()
+            follow_published_generation()
+        except Exception:
+            print("✗ Worker coordination failed:", file=sys.stderr)
+            traceback.print_exc()
+        time.sleep(FOLLOWER_POLL_SECONDS)
 
 # Generate the page in a background thread so the server can bind to the
 # port immediately (Render's health check would otherwise time out while
@@ -1399,14 +3920,205 @@ def _generate_news_loop():
 # Errors are caught and logged per cycle rather than left to die silently,
 # which would otherwise leave the loading page (or stale news) showing
 # forever with no visible cause.
-threading.Thread(target=_generate_news_loop, daemon=True).start()
+# Under gevent the thread is a greenlet and its CPU-bound steps run off the
+# hub (see Hub Offloading).
+# Set BACKGROUND_REFRESH=0 to import the module (e.g. from the benchmarks)
+# without starting the scrape loop.
+if os.environ.get("BACKGROUND_REFRESH", "1") != "0":
+    # Render the previous cycle's snapshot synchronously first: it takes
+    # milliseconds and means the very first request already has headlines.
+    try:
+        render_warm_start_snapshot()
+    except Exception:
+        print("✗ Warm start from snapshot failed:", file=sys.stderr)
+        traceback.print_exc()
+    threading.Thread(target=_coordinate_workers, daemon=True).start()
 
 @app.route("/")
 def serve_index():
+    page = current_page
+    if page is not None:
+        # Served straight from memory: no disk access and no per-request copy
+        encoding = page.pick_encoding(request.accept_encodings)
+        response = Response(page.variants[encoding], mimetype='text/html')
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        response.set_etag(f'{page.etag}-{encoding}')
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+    # Fallback: a page written to disk by an earlier run of this process
     index_path = os.path.join(app.static_folder, "index.html")
     if not os.path.exists(index_path):
         return LOADING_PAGE
-    return app.send_static_file("index.html")
+
+    for encoding, suffix in PAGE_ENCODINGS:
+        if request.accept_encodings[encoding] > 0 and os.path.exists(index_path + suffix):
+            response = app.send_static_file("index.html" + suffix)
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = app.send_static_file("index.html")
+    response.mimetype = 'text/html'
+    response.vary.add('Accept-Encoding')
+    return response
+
+@app.after_request
+def _cache_static_assets(response):
+    # Asset file names change with their content, so they can be cached forever
+    if request.path.startswith('/static/') and response.status_code == 200:
+        response.headers['Cache-Control'] = f'public, max-age={STATIC_ASSET_MAX_AGE}, immutable'
+    return response
+
+def _json_error(status, message, **headers):
+    body = json.dumps({'error': message})
+    return Response(body, status=status, mimetype='application/json', headers=headers)
+
+def parse_timestamp(value):
+    """UTC epoch seconds from epoch seconds or an ISO 8601 time (UTC if no offset); ValueError otherwise"""
+    try:
+        timestamp = float(value)
+    except ValueError:
+        moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        timestamp = moment.timestamp()
+    if not math.isfinite(timestamp):
+        raise ValueError('not a finite time')
+    return timestamp
+
+API_ORDERS = ('page', 'newest')
+
+@app.route("/api/headlines")
+def api_headlines():
+    """Paginated headlines, filtered by ?category=, ?source= and ?since= or ?minutes="""
+    index = current_headline_index
+    if index is None:
+        return _json_error(503, 'headlines are still being generated', **{'Retry-After': '5'})
+
+    category = request.args.get('category') or None
+    source = request.args.get('source') or None
+    if category is not None and category not in CATEGORIES:
+        return _json_error(400, f"unknown category; expected one of: {', '.join(CATEGORIES)}")
+    try:
+        limit = int(request.args.get('limit', API_DEFAULT_LIMIT))
+    except ValueError:
+        return _json_error(400, 'limit must be an integer')
+    limit = max(1, min(limit, API_MAX_LIMIT))
+
+    order = request.args.get('order') or 'page'
+    if order not in API_ORDERS:
+        return _json_error(400, f"unknown order; expected one of: {', '.join(API_ORDERS)}")
+    since = None
+    if request.args.get('since') and request.args.get('minutes'):
+        return _json_error(400, 'pass since or minutes, not both')
+    if request.args.get('since'):
+        try:
+            since = parse_timestamp(request.args['since'])
+        except ValueError:
+            return _json_error(400, 'since must be epoch seconds or an ISO 8601 time')
+    elif request.args.get('minutes'):
+        try:
+            minutes = float(request.args['minutes'])
+        except ValueError:
+            minutes = -1
+        if not 0 < minutes < math.inf:
+            return _json_error(400, 'minutes must be a positive number')
+        since = time.time() - minutes * 60
+
+    cursor = request.args.get('cursor') or None
+    try:
+        body, has_more = index.page_json(category, source, limit, cursor, since, order)
+    except ValueError as e:
+        return _json_error(400, str(e))
+    # Paged responses must not be replayed by shared caches after the next
+    # generation moves the pages along
+    cache_control = 'no-cache' if cursor or has_more else 'public, max-age=60'
+    return Response(body, mimetype='application/json', headers={'Cache-Control': cache_control})
+
+@app.route("/api/search")
+def api_search():
+    """Ranked full-text search over every stored headline: ?q=&limit=&cursor="""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return _json_error(400, 'q is required')
+    try:
+        limit = int(request.args.get('limit', 20))
+        cursor = request.args.get('cursor')
+        offset = int(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))) if cursor else 0
+    except ValueError:
+        return _json_error(400, 'limit and cursor must come from a previous response')
+    limit = max(1, min(limit, API_MAX_LIMIT))
+    offset = max(0, offset)
+
+    start = time.perf_counter()
+    total, page = search_index.search(query, limit, offset)
+    next_offset = offset + len(page)
+    next_cursor = None
+    if next_offset < total:
+        next_cursor = base64.urlsafe_b64encode(str(next_offset).encode()).decode().rstrip('=')
+    items = []
+    for score, headline in page:
+        item = dict(headline)
+        item['score'] = round(score, 4)
+        items.append(item)
+    body = {
+        'query': query,
+        'total': total,
+        'next_cursor': next_cursor,
+        'took_ms': round((time.perf_counter() - start) * 1000, 3),
+        'items': items,
+    }
+    return Response(json.dumps(body, ensure_ascii=False), mimetype='application/json')
+
+@app.route("/metrics")
+def metrics():
+    """Prometheus text exposition: pipeline metrics plus this worker's own"""
+    background = os.environ.get("BACKGROUND_REFRESH", "1") != "0"
+    if is_scraper_leader or not background:
+        body = render_metrics()
+    else:
+        # The leader's pipeline metrics as of its last publish
+        try:
+            with open(PUBLISHED_METRICS_PATH, 'r', encoding='utf-8') as f:
+                pipeline = f.read()
+        except OSError:
+            pipeline = ''
+        body = pipeline + render_metrics('process')
+    return Response(body, mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route("/events")
+def events():
+    """Server-Sent Events stream of newly published headlines, resumable via ?since= or Last-Event-ID"""
+    since = request.headers.get('Last-Event-ID') or request.args.get('since')
+    try:
+        since = int(since) if since else None
+    except ValueError:
+        since = -1  # unknown generation: the client must reload
+
+    def stream():
+        cursor = event_broadcaster.cursor_for(since)
+        event_broadcaster.subscribe()
+        try:
+            yield f'retry: {SSE_RETRY_MS}\n\n'.encode()
+            while cursor is not None:
+                pending, cursor = event_broadcaster.wait(cursor, SSE_KEEPALIVE_SECONDS)
+                if pending is None:
+                    break
+                if not pending:
+                    # Keeps proxies from timing out an idle connection
+                    yield b': keepalive\n\n'
+                for encoded in pending:
+                    yield encoded
+            yield SSE_RELOAD_EVENT
+        finally:
+            event_broadcaster.unsubscribe()
+
+    response = Response(stream(), mimetype='text/event-stream')
+    response.cache_control.no_cache = True
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
 
 if __name__ == "__main__":
     # Local development: run Flask directly